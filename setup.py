@@ -49,6 +49,7 @@ setup(
     url='https://github.com/xk0dex/empathy',
     packages=find_packages(),
     include_package_data=True,
+    package_data={'src.analysis': ['pattern_packs/*.json']},
     install_requires=get_requirements(),
     python_requires='>=3.8',
     classifiers=[
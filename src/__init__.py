@@ -10,12 +10,20 @@ Repositorio: https://github.com/xk0dex/empathy
 © 2025 xk0dex. All rights reserved.
 """
 
+import importlib
+
 from .__version__ import __version__, get_version_info, print_version_info, print_banner, CREATOR, __author__, __github__
-from .main import EmpathyAnalyzer
-from .analysis.sentiment_analyzer import SentimentAnalyzer
-from .analysis.collaboration_analyzer import CollaborationAnalyzer
-from .data_collection.github_collector import GitHubCollector
-from .visualization.dashboard import Dashboard
+
+# Clases principales, importadas la primera vez que se usan: importar el
+# paquete (p. ej. para 'empathy --help' o __version__) no carga NumPy,
+# PyGithub, networkx ni Flask
+_LAZY_EXPORTS = {
+    'EmpathyAnalyzer': '.main',
+    'SentimentAnalyzer': '.analysis.sentiment_analyzer',
+    'CollaborationAnalyzer': '.analysis.collaboration_analyzer',
+    'GitHubCollector': '.data_collection.github_collector',
+    'Dashboard': '.visualization.dashboard',
+}
 
 __author__ = "xk0dex"
 __email__ = "xk0dex@github.com"
@@ -49,4 +57,17 @@ def get_author_info():
         'github': __github_profile__,
         'repository': __repository__,
         'email': __email__
-    }
\ No newline at end of file
+    }
+
+def __getattr__(name):
+    """Importa bajo demanda las clases de _LAZY_EXPORTS."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -0,0 +1,62 @@
+"""
+Flujo de actividad de un repositorio para el análisis incremental.
+
+Los recopiladores producen la actividad como tuplas (tipo, dato) a medida que
+llegan las páginas de la API (ver GitHubCollector.stream_repository_data).
+Los analizadores la consumen elemento a elemento con la misma interfaz:
+
+- start_stream(): prepara un nuevo análisis
+- consume(kind, item): procesa un elemento del flujo
+- finish_stream(): calcula y devuelve los resultados
+
+Así la recopilación y el análisis se solapan y ningún analizador necesita
+la historia completa en memoria.
+"""
+
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
+
+# Tipos de elemento del flujo de actividad
+REPOSITORY_INFO = 'repository_info'
+COMMIT = 'commit'
+PULL_REQUEST = 'pull_request'
+
+
+def iter_activity(raw_data: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """
+    Convierte un dataset ya recopilado en un flujo de actividad.
+    
+    Args:
+        raw_data: Datos con las listas 'commits' y 'pull_requests'
+    
+    Yields:
+        Tuplas (tipo, dato) en el mismo orden que produce el recopilador
+    """
+    if raw_data.get('repository_info'):
+        yield REPOSITORY_INFO, raw_data['repository_info']
+    
+    for commit in raw_data.get('commits', []):
+        yield COMMIT, commit
+    
+    for pr in raw_data.get('pull_requests', []):
+        yield PULL_REQUEST, pr
+
+
+def analyze_activity(activity: Iterable[Tuple[str, Any]], analyzers: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Reparte cada elemento del flujo entre varios analizadores en una sola pasada.
+    
+    Args:
+        activity: Flujo de tuplas (tipo, dato)
+        analyzers: Analizadores con start_stream/consume/finish_stream
+    
+    Returns:
+        Los resultados de cada analizador, en el mismo orden
+    """
+    for analyzer in analyzers:
+        analyzer.start_stream()
+    
+    for kind, item in activity:
+        for analyzer in analyzers:
+            analyzer.consume(kind, item)
+    
+    return [analyzer.finish_stream() for analyzer in analyzers]
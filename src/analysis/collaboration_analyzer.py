@@ -8,15 +8,31 @@ Este módulo analiza patrones de colaboración y detecta:
 - Patrones de interacción entre miembros del equipo
 """
 
+import math
+import heapq
 import logging
-from typing import Dict, List, Any, Set, Tuple
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
 from dataclasses import dataclass
 from collections import defaultdict, Counter
-from datetime import datetime, timedelta
-import networkx as nx
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from .activity_stream import COMMIT, PULL_REQUEST, iter_activity
+from .collaboration_graph import CollaborationGraph
+from .ownership_matrix import OwnershipMatrix
+from .ownership_tree import OwnershipTree
+from .epoch_time import SECONDS_PER_DAY, epoch_day, to_epoch_seconds
 
 logger = logging.getLogger(__name__)
 
+# Review o comentario de un PR: (fecha en segundos desde epoch o NaN, autor)
+Interaction = Tuple[float, str]
+
+# Contribuciones de un commit o PR: (fecha en segundos desde epoch o NaN,
+# autor, archivos o reviews, comentarios)
+ActivityRecord = Tuple[float, str, Tuple[Any, ...], Tuple[Interaction, ...]]
+
 
 @dataclass
 class CollaborationMetrics:
@@ -46,37 +62,164 @@ class CollaborationAnalyzer:
     Analizador de patrones de colaboración en equipos de desarrollo.
     """
     
-    def __init__(self):
-        """Inicializa el analizador de colaboración."""
-        self.collaboration_graph = nx.Graph()
-        self.file_ownership = defaultdict(Counter)
-        self.member_metrics = {}
+    # Campos de los datos recopilados que usa el análisis (ver
+    # data_collection.models.COLLECTABLE_FIELDS); el texto de comentarios y
+    # reviews no se necesita, solo sus autores
+    REQUIRED_FIELDS = frozenset({
+        'commit.author',
+        'commit.files_changed',
+        'commit.timestamp',
+        'pull_request.author',
+        'pull_request.comments',
+        'pull_request.reviews',
+    })
+    
+    # Fracción de las contribuciones a un archivo a partir de la cual su
+    # autor principal forma un silo, y nivel de riesgo según esa fracción
+    SILO_THRESHOLD = 0.8
+    SILO_RISK_LEVELS = (('critical', 0.95), ('high', 0.9), ('medium', 0.85))
+    
+    # Ventanas (en días hasta la fecha de referencia) de time_windows
+    TIME_WINDOWS = (7, 30, 90)
+    
+    def __init__(self, window_days: Optional[int] = None, half_life_days: Optional[float] = None):
+        """
+        Inicializa el analizador de colaboración.
         
+        Args:
+            window_days: Ventana deslizante en días: la actividad más antigua
+                se descuenta del estado al calcular los resultados (None =
+                sin caducidad)
+            half_life_days: Semivida en días de una vista adicional en
+                time_windows con toda la actividad ponderada por antigüedad
+                (None = sin esa vista)
+        """
+        self.window_days = window_days
+        self.half_life_days = half_life_days
+        
+        # Grafo sobre matriz dispersa; networkx solo se usa para exportarlo
+        # (collaboration_graph.to_networkx())
+        self.collaboration_graph = CollaborationGraph()
+        self.file_ownership = OwnershipMatrix()
+        self.member_metrics: Dict[str, Dict[str, Any]] = {}
+        
+        # Ownership agregado por directorio, recalculado al terminar cada análisis
+        self.ownership_tree: Optional[OwnershipTree] = None
+        
+        # Contribuciones de cada commit (por SHA) y PR (por número), para
+        # descontarlas si el PR se actualiza o la actividad caduca, y cola de
+        # caducidad por fecha (una entrada por cada fecha de reviews y
+        # comentarios de un PR)
+        self._commits: Dict[Any, ActivityRecord] = {}
+        self._pull_requests: Dict[Any, ActivityRecord] = {}
+        self._expiry: List[Tuple[float, int, str, Any]] = []
+        self._sequence = 0
+        
+        # Resultados derivados que solo se recalculan si cambian sus datos
+        self._dirty_members: Set[str] = set()
+        self._member_cache: Dict[str, Tuple[List[str], CollaborationMetrics]] = {}
+        self._tree_version = -1
+    
     def analyze(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analiza patrones de colaboración en los datos del repositorio.
         
         Args:
             raw_data: Datos recopilados del repositorio
-            
+        
+        Returns:
+            Resultados del análisis de colaboración
+        """
+        return self.analyze_stream(iter_activity(raw_data))
+    
+    def analyze_collaboration_patterns(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Método alias para analyze() usado por el orquestador principal."""
+        return self.analyze(raw_data)
+    
+    def analyze_stream(self, activity: Iterable[Tuple[str, Any]]) -> Dict[str, Any]:
+        """
+        Analiza la colaboración de un flujo de actividad a medida que llega.
+        
+        Args:
+            activity: Tuplas (tipo, dato) del recopilador
+        
         Returns:
             Resultados del análisis de colaboración
         """
+        self.start_stream()
+        for kind, item in activity:
+            self.consume(kind, item)
+        return self.finish_stream()
+    
+    def update(self, new_commits: Iterable[Any] = (), new_prs: Iterable[Any] = (),
+               now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Incorpora actividad nueva al estado actual sin reiniciarlo.
+        
+        Los commits ya vistos (mismo SHA) se ignoran y un PR ya visto (mismo
+        número) reemplaza a su versión anterior. Con window_days, la
+        actividad anterior a now - window_days se descuenta. Solo se
+        recalculan las métricas de los miembros y archivos afectados.
+        
+        Args:
+            new_commits: Commits nuevos (CommitData o diccionarios)
+            new_prs: Pull requests nuevos o actualizados
+            now: Fecha de referencia de la ventana (por defecto, ahora)
+        
+        Returns:
+            Resultados del análisis con el estado actualizado
+        """
+        for commit in new_commits:
+            self._analyze_commit(commit)
+        for pr in new_prs:
+            self._analyze_pull_request(pr)
+        
+        return self.finish_stream(now)
+    
+    def start_stream(self):
+        """Prepara un nuevo análisis incremental."""
         logger.info("🤝 Iniciando análisis de colaboración...")
         
         # Limpiar estado previo
         self._reset_state()
+    
+    def consume(self, kind: str, item: Any):
+        """
+        Incorpora un elemento del flujo de actividad al estado del análisis.
         
-        # Analizar commits y PRs
-        self._analyze_commits(raw_data.get('commits', []))
-        self._analyze_pull_requests(raw_data.get('pull_requests', []))
+        Solo se acumulan contadores, ownership y el grafo; el commit o PR
+        original puede liberarse en cuanto se procesa.
+        """
+        if kind == COMMIT:
+            self._analyze_commit(item)
+        elif kind == PULL_REQUEST:
+            self._analyze_pull_request(item)
+    
+    def finish_stream(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Calcula los resultados con la actividad consumida.
+        
+        Args:
+            now: Fecha de referencia de la ventana deslizante y de
+                time_windows (por defecto, ahora)
+        """
+        now = now or datetime.now(timezone.utc)
+        if self.window_days is not None:
+            self._expire(now)
+        
+        # El árbol de directorios solo se reconstruye si cambió el ownership
+        if self._tree_version != self.file_ownership.version:
+            self.ownership_tree = OwnershipTree(self.file_ownership)
+            self._tree_version = self.file_ownership.version
         
         # Calcular métricas
-        results = {
+        results: Dict[str, Any] = {
             'member_metrics': self._calculate_member_metrics(),
             'knowledge_silos': self._detect_knowledge_silos(),
+            'directory_ownership': self.ownership_tree.to_list(max_depth=None),
             'collaboration_network': self._analyze_collaboration_network(),
             'team_health_metrics': self._calculate_team_health_metrics(),
+            'time_windows': self.time_windows(now=now),
             'collaboration_score': 0.0,
             'knowledge_distribution_score': 0.0,
             'knowledge_silos_detected': False
@@ -90,138 +233,333 @@ class CollaborationAnalyzer:
         logger.info("✅ Análisis de colaboración completado")
         return results
     
+    def time_windows(self, windows: Optional[Iterable[int]] = None, half_life_days: Optional[float] = None,
+                     now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Métricas de colaboración y ownership de las últimas ventanas de días.
+        
+        Cada vista suma las matrices diarias del grafo y del ownership de
+        sus días, sin rehacer el análisis. La actividad sin fecha no entra
+        en ninguna vista.
+        
+        Args:
+            windows: Días de cada ventana, hasta el día de now incluido (por
+                defecto, TIME_WINDOWS)
+            half_life_days: Semivida de una vista adicional con toda la
+                actividad, cada día con peso 0.5 ** (antigüedad / semivida)
+                (por defecto, la del analizador)
+            now: Fecha de referencia (por defecto, ahora)
+        
+        Returns:
+            Métricas por vista: '7d', '30d'... y 'half_life_<semivida>d'
+        """
+        end_day = epoch_day(to_epoch_seconds(now or datetime.now(timezone.utc)))
+        half_life_days = half_life_days if half_life_days is not None else self.half_life_days
+        
+        # Vistas: (etiqueta, días de la ventana o None, semivida o None)
+        views: List[Tuple[str, Optional[int], Optional[float]]] = [
+            (f"{days}d", days, None) for days in (windows if windows is not None else self.TIME_WINDOWS)
+        ]
+        if half_life_days is not None:
+            views.append((f"half_life_{half_life_days:g}d", None, half_life_days))
+        
+        return {
+            label: dict(self._window_metrics(self.collaboration_graph.window(end_day, days, half_life),
+                                             self.file_ownership.window(end_day, days, half_life)),
+                        days=days, half_life_days=half_life)
+            for label, days, half_life in views
+        }
+    
+    def _window_metrics(self, graph: CollaborationGraph, ownership: OwnershipMatrix) -> Dict[str, Any]:
+        """Resumen de la colaboración y el ownership de una vista temporal."""
+        authors = ownership.authors.names
+        committers = {authors[index] for index in np.unique(ownership.matrix().indices).tolist()}
+        
+        weighted_centrality = graph.weighted_degree_centrality()
+        weighted_central_members = sorted(weighted_centrality.items(), key=lambda x: x[1], reverse=True)[:3]
+        silos = self._detect_knowledge_silos(ownership)
+        
+        return {
+            'active_members': len(committers | set(graph.nodes())),
+            'collaboration_edges': graph.number_of_edges(),
+            'network_density': round(graph.density(), 3),
+            'weighted_central_members': [(member, round(score, 3)) for member, score in weighted_central_members],
+            'files_touched': len(ownership),
+            'knowledge_distribution': self._evaluate_knowledge_distribution(ownership),
+            'knowledge_silos': len(silos),
+            'critical_silos': sum(1 for silo in silos if silo.risk_level == 'critical')
+        }
+    
     def _reset_state(self):
         """Limpia el estado del analizador para un nuevo análisis."""
         self.collaboration_graph.clear()
         self.file_ownership.clear()
         self.member_metrics.clear()
+        self.ownership_tree = None
+        self._commits.clear()
+        self._pull_requests.clear()
+        self._expiry.clear()
+        self._dirty_members.clear()
+        self._member_cache.clear()
+        self._tree_version = -1
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Estado serializable en JSON (contribuciones de cada commit y PR),
+        para seguir actualizándolo en otra ejecución con update().
+        """
+        def date(timestamp: float) -> Optional[float]:
+            return None if math.isnan(timestamp) else timestamp
+        
+        def records(activity: Dict[Any, ActivityRecord], dated: bool) -> List[List[Any]]:
+            return [[key if not isinstance(key, tuple) else None, date(timestamp), author,
+                     [[date(item[0]), item[1]] if dated else item for item in first],
+                     [[date(item[0]), item[1]] for item in second]]
+                    for key, (timestamp, author, first, second) in activity.items()]
+        
+        return {
+            'window_days': self.window_days,
+            'half_life_days': self.half_life_days,
+            'commits': records(self._commits, False),
+            'pull_requests': records(self._pull_requests, True)
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CollaborationAnalyzer':
+        """Reconstruye un analizador guardado con to_dict()."""
+        analyzer = cls(window_days=data.get('window_days'), half_life_days=data.get('half_life_days'))
+        for key, timestamp, author, files, _ in data.get('commits', []):
+            analyzer._add_record(analyzer._commits, COMMIT, key, (
+                math.nan if timestamp is None else timestamp, author, tuple(files), ()))
+        for key, timestamp, author, reviews, comments in data.get('pull_requests', []):
+            analyzer._add_record(analyzer._pull_requests, PULL_REQUEST, key, (
+                math.nan if timestamp is None else timestamp, author,
+                tuple((math.nan if date is None else date, reviewer) for date, reviewer in reviews),
+                tuple((math.nan if date is None else date, commenter) for date, commenter in comments)))
+        return analyzer
     
     def _analyze_commits(self, commits: List[Any]):
         """Analiza commits para extraer patrones de colaboración."""
         for commit in commits:
-            author = getattr(commit, 'author', None) or commit.get('author', 'Unknown')
-            files = getattr(commit, 'files_changed', None) or commit.get('files_changed', [])
-            
-            if author == 'Unknown':
-                continue
-                
-            # Registrar ownership de archivos
-            for file_path in files:
-                self.file_ownership[file_path][author] += 1
-            
-            # Inicializar métricas del miembro si no existe
-            if author not in self.member_metrics:
-                self.member_metrics[author] = {
-                    'commits': 0,
-                    'files_touched': set(),
-                    'prs_created': 0,
-                    'reviews_given': 0,
-                    'reviews_received': 0,
-                    'collaborators': set()
-                }
-            
-            # Actualizar métricas
-            self.member_metrics[author]['commits'] += 1
-            self.member_metrics[author]['files_touched'].update(files)
+            self._analyze_commit(commit)
+    
+    def _analyze_commit(self, commit: Any):
+        """Registra el ownership y la actividad de un commit."""
+        author = commit.author if hasattr(commit, 'author') else commit.get('author', 'Unknown')
+        files = commit.files_changed if hasattr(commit, 'files_changed') else commit.get('files_changed', [])
+        sha = commit.sha if hasattr(commit, 'sha') else commit.get('sha')
+        timestamp = commit.timestamp if hasattr(commit, 'timestamp') else commit.get('timestamp')
+        
+        if author == 'Unknown':
+            return
+        
+        # Un commit ya registrado no vuelve a contar
+        if sha is not None and sha in self._commits:
+            return
+        
+        self._add_record(self._commits, COMMIT, sha, (to_epoch_seconds(timestamp), author, tuple(files), ()))
     
     def _analyze_pull_requests(self, pull_requests: List[Any]):
         """Analiza pull requests para detectar colaboración."""
         for pr in pull_requests:
-            author = getattr(pr, 'author', None) or pr.get('author', 'Unknown')
-            
-            if author == 'Unknown':
-                continue
-            
-            # Inicializar métricas si no existe
-            if author not in self.member_metrics:
-                self.member_metrics[author] = {
-                    'commits': 0,
-                    'files_touched': set(),
-                    'prs_created': 0,
-                    'reviews_given': 0,
-                    'reviews_received': 0,
-                    'collaborators': set()
-                }
-            
-            self.member_metrics[author]['prs_created'] += 1
-            
-            # Analizar reviews (colaboración)
-            reviews = getattr(pr, 'reviews', None) or pr.get('reviews', [])
-            reviewers = set()
-            
-            for review in reviews:
-                reviewer = review.get('author', 'Unknown')
-                if reviewer != 'Unknown' and reviewer != author:
-                    reviewers.add(reviewer)
-                    
-                    # Inicializar métricas del reviewer si no existe
-                    if reviewer not in self.member_metrics:
-                        self.member_metrics[reviewer] = {
-                            'commits': 0,
-                            'files_touched': set(),
-                            'prs_created': 0,
-                            'reviews_given': 0,
-                            'reviews_received': 0,
-                            'collaborators': set()
-                        }
-                    
-                    self.member_metrics[reviewer]['reviews_given'] += 1
-                    self.member_metrics[author]['reviews_received'] += 1
-                    
-                    # Registrar colaboración mutua
-                    self.member_metrics[author]['collaborators'].add(reviewer)
-                    self.member_metrics[reviewer]['collaborators'].add(author)
-                    
-                    # Añadir edge al grafo de colaboración
-                    if self.collaboration_graph.has_edge(author, reviewer):
-                        self.collaboration_graph[author][reviewer]['weight'] += 1
-                    else:
-                        self.collaboration_graph.add_edge(author, reviewer, weight=1)
+            self._analyze_pull_request(pr)
+    
+    def _analyze_pull_request(self, pr: Any):
+        """Registra las reviews y comentarios de un PR como colaboración."""
+        author = pr.author if hasattr(pr, 'author') else pr.get('author', 'Unknown')
+        number = pr.number if hasattr(pr, 'number') else pr.get('number')
+        
+        if author == 'Unknown':
+            return
+        
+        # Fecha de la última actividad del PR (el PR caduca cuando caducan
+        # ella y todas sus reviews y comentarios)
+        if hasattr(pr, 'created_at'):
+            timestamp = pr.updated_at or pr.created_at
+        else:
+            timestamp = pr.get('updated_at') or pr.get('created_at')
+        timestamp = to_epoch_seconds(timestamp)
+        
+        # Reviews (una colaboración por review) y comentaristas distintos de
+        # cada día, cada uno con su propia fecha
+        reviews = pr.reviews if hasattr(pr, 'reviews') else pr.get('reviews', [])
+        reviews = _interactions(reviews, 'submitted_at', author, timestamp)
+        
+        comments = pr.comments if hasattr(pr, 'comments') else pr.get('comments', [])
+        daily_commenters: Dict[Tuple[Optional[int], str], Interaction] = {}
+        for date, commenter in _interactions(comments, 'created_at', author, timestamp):
+            daily_commenters.setdefault((epoch_day(date), commenter), (date, commenter))
+        comments = tuple(daily_commenters.values())
+        
+        # Un PR actualizado reemplaza a su versión anterior
+        if number is not None and number in self._pull_requests:
+            self._apply_pull_request(self._pull_requests.pop(number), -1)
+        
+        self._add_record(self._pull_requests, PULL_REQUEST, number, (timestamp, author, reviews, comments))
+    
+    def _add_record(self, activity: Dict[Any, ActivityRecord], kind: str, key: Any, record: ActivityRecord):
+        """Guarda las contribuciones de un commit o PR, las aplica y programa su caducidad."""
+        self._sequence += 1
+        if key is None:
+            key = (kind, self._sequence)  # Sin SHA o número: nunca se reemplaza
+        activity[key] = record
+        
+        if kind == COMMIT:
+            self._apply_commit(record, 1)
+        else:
+            self._apply_pull_request(record, 1)
+        
+        dates = {record[0]}
+        if kind == PULL_REQUEST:
+            dates.update(date for date, _ in record[2] + record[3])
+        for date in dates:
+            if not math.isnan(date):
+                heapq.heappush(self._expiry, (date, self._sequence, kind, key))
+    
+    def _expire(self, now: datetime):
+        """Descuenta la actividad anterior a now - window_days."""
+        cutoff = to_epoch_seconds(now) - self.window_days * SECONDS_PER_DAY
+        expired = 0
+        
+        while self._expiry and self._expiry[0][0] < cutoff:
+            _, _, kind, key = heapq.heappop(self._expiry)
+            if kind == COMMIT:
+                record = self._commits.pop(key, None)
+                if record is not None:
+                    self._apply_commit(record, -1)
+                    expired += 1
+            elif key in self._pull_requests:
+                expired += self._expire_pull_request(key, cutoff)
+        
+        if expired:
+            logger.debug(f"⏳ {expired} commits, reviews y comentarios fuera de la ventana de "
+                         f"{self.window_days} días")
+    
+    def _expire_pull_request(self, key: Any, cutoff: float) -> int:
+        """
+        Descuenta las reviews y comentarios de un PR anteriores a cutoff, y
+        el PR entero si tampoco le queda actividad posterior.
+        
+        Returns:
+            Número de reviews y comentarios descontados
+        """
+        timestamp, author, reviews, comments = self._pull_requests[key]
+        expired_reviews = tuple(review for review in reviews if review[0] < cutoff)
+        expired_comments = tuple(comment for comment in comments if comment[0] < cutoff)
+        kept = (timestamp, author, tuple(review for review in reviews if not review[0] < cutoff),
+                tuple(comment for comment in comments if not comment[0] < cutoff))
+        
+        if timestamp < cutoff and not (kept[2] or kept[3]):
+            del self._pull_requests[key]
+            self._member(author)['prs_created'] -= 1
+        else:
+            self._pull_requests[key] = kept
+        
+        self._apply_interactions(author, expired_reviews, expired_comments, -1)
+        return len(expired_reviews) + len(expired_comments)
+    
+    def _apply_commit(self, record: ActivityRecord, sign: int):
+        """Suma (sign=1) o resta (sign=-1) las contribuciones de un commit."""
+        timestamp, author, files, _ = record
+        
+        # Registrar ownership de archivos (también en la matriz de su día)
+        self.file_ownership.add(author, files, sign, epoch_day(timestamp))
+        
+        # Actualizar métricas
+        data = self._member(author)
+        data['commits'] += sign
+        for file_path in files:
+            _adjust(data['files_touched'], file_path, sign)
+        
+        self._release_member(author)
+    
+    def _apply_pull_request(self, record: ActivityRecord, sign: int):
+        """Suma (sign=1) o resta (sign=-1) las reviews y comentarios de un PR."""
+        _, author, reviews, comments = record
+        
+        self._member(author)['prs_created'] += sign
+        self._apply_interactions(author, reviews, comments, sign)
+    
+    def _apply_interactions(self, author: str, reviews: Tuple[Interaction, ...], comments: Tuple[Interaction, ...],
+                            sign: int):
+        """Suma (sign=1) o resta (sign=-1) reviews y comentarios al PR de author."""
+        self._member(author)
+        
+        # Analizar reviews (colaboración), en la matriz del día de cada una
+        for date, reviewer in reviews:
+            self._member(reviewer)['reviews_given'] += sign
+            self.member_metrics[author]['reviews_received'] += sign
             
-            # Analizar comentarios para detectar más colaboración
-            comments = getattr(pr, 'comments', None) or pr.get('comments', [])
-            commenters = set()
+            # Registrar colaboración mutua
+            _adjust(self.member_metrics[author]['collaborators'], reviewer, sign)
+            _adjust(self.member_metrics[reviewer]['collaborators'], author, sign)
             
-            for comment in comments:
-                commenter = comment.get('author', 'Unknown')
-                if commenter != 'Unknown' and commenter != author:
-                    commenters.add(commenter)
+            # Añadir edge al grafo de colaboración
+            self.collaboration_graph.add_interaction(author, reviewer, 1.0 * sign, epoch_day(date))
+        
+        # Registrar colaboración a través de comentarios
+        for date, commenter in comments:
+            self._member(commenter)
+            _adjust(self.member_metrics[author]['collaborators'], commenter, sign)
+            _adjust(self.member_metrics[commenter]['collaborators'], author, sign)
             
-            # Registrar colaboración a través de comentarios
-            for commenter in commenters:
-                if commenter not in self.member_metrics:
-                    self.member_metrics[commenter] = {
-                        'commits': 0,
-                        'files_touched': set(),
-                        'prs_created': 0,
-                        'reviews_given': 0,
-                        'reviews_received': 0,
-                        'collaborators': set()
-                    }
-                
-                self.member_metrics[author]['collaborators'].add(commenter)
-                self.member_metrics[commenter]['collaborators'].add(author)
-                
-                # Añadir edge más ligero para comentarios
-                if self.collaboration_graph.has_edge(author, commenter):
-                    self.collaboration_graph[author][commenter]['weight'] += 0.5
-                else:
-                    self.collaboration_graph.add_edge(author, commenter, weight=0.5)
+            # Añadir edge más ligero para comentarios
+            self.collaboration_graph.add_interaction(author, commenter, 0.5 * sign, epoch_day(date))
+        
+        for member in (author,) + tuple(member for _, member in reviews + comments):
+            self._release_member(member)
+    
+    def _member(self, member: str) -> Dict[str, Any]:
+        """Métricas acumuladas de un miembro (se crean si no existen), marcadas como modificadas."""
+        self._dirty_members.add(member)
+        data = self.member_metrics.get(member)
+        if data is None:
+            # Archivos y colaboradores con su número de apariciones, para
+            # poder descontarlos
+            data = self.member_metrics[member] = {
+                'commits': 0,
+                'files_touched': Counter(),
+                'prs_created': 0,
+                'reviews_given': 0,
+                'reviews_received': 0,
+                'collaborators': Counter()
+            }
+        return data
+    
+    def _release_member(self, member: str):
+        """Elimina a un miembro al que ya no le queda actividad."""
+        data = self.member_metrics.get(member)
+        if data and not (data['commits'] or data['prs_created'] or data['reviews_given']
+                         or data['reviews_received'] or data['collaborators']):
+            del self.member_metrics[member]
     
     def _calculate_member_metrics(self) -> List[CollaborationMetrics]:
         """Calcula métricas detalladas para cada miembro del equipo."""
         metrics_list = []
+        owned_directories: Dict[str, List[str]] = self.ownership_tree.owned_areas() if self.ownership_tree else {}
+        
+        # Olvidar las métricas de los miembros que ya no tienen actividad
+        for member in self._member_cache.keys() - self.member_metrics.keys():
+            del self._member_cache[member]
         
         for member, data in self.member_metrics.items():
+            # Sin cambios en su actividad ni en sus directorios: métricas guardadas
+            cached = self._member_cache.get(member)
+            if (cached is not None and member not in self._dirty_members
+                    and cached[0] == owned_directories.get(member, [])):
+                metrics_list.append(cached[1])
+                continue
+            
             # Calcular score de colaboración individual
             collaboration_score = self._calculate_individual_collaboration_score(member, data)
             
-            # Determinar áreas de conocimiento basadas en archivos más tocados
-            knowledge_areas = self._identify_knowledge_areas(data['files_touched'])
+            # Determinar áreas de conocimiento: archivos más tocados y directorios propios
+            knowledge_areas = self._identify_knowledge_areas(data['files_touched'],
+                                                             owned_directories.get(member, []))
             
             metrics = CollaborationMetrics(
                 member=member,
-                files_touched=data['files_touched'],
+                files_touched=set(data['files_touched']),
                 commits_count=data['commits'],
                 pr_count=data['prs_created'],
                 reviews_given=data['reviews_given'],
@@ -231,7 +569,9 @@ class CollaborationAnalyzer:
             )
             
             metrics_list.append(metrics)
+            self._member_cache[member] = (owned_directories.get(member, []), metrics)
         
+        self._dirty_members.clear()
         return sorted(metrics_list, key=lambda x: x.collaboration_score, reverse=True)
     
     def _calculate_individual_collaboration_score(self, member: str, data: Dict[str, Any]) -> float:
@@ -246,25 +586,27 @@ class CollaborationAnalyzer:
         
         return round(score, 3)
     
-    def _identify_knowledge_areas(self, files_touched: Set[str]) -> List[str]:
-        """Identifica áreas de conocimiento basadas en archivos tocados."""
+    def _identify_knowledge_areas(self, files_touched: Set[str], owned_directories: List[str]) -> List[str]:
+        """
+        Identifica áreas de conocimiento basadas en archivos tocados.
+        
+        Args:
+            files_touched: Archivos modificados por el miembro
+            owned_directories: Directorios (de cualquier nivel) de los que es
+                el autor principal, de más a menos contribuciones (ver
+                OwnershipTree.owned_areas)
+        """
         if not files_touched:
             return []
         
-        # Agrupar por extensiones y directorios
-        extensions = Counter()
-        directories = Counter()
+        # Agrupar por extensiones
+        extensions: Counter = Counter()
         
         for file_path in files_touched:
             # Extensión
             if '.' in file_path:
                 ext = file_path.split('.')[-1].lower()
                 extensions[ext] += 1
-            
-            # Directorio principal
-            parts = file_path.split('/')
-            if len(parts) > 1:
-                directories[parts[0]] += 1
         
         # Identificar áreas principales
         knowledge_areas = []
@@ -274,130 +616,112 @@ class CollaborationAnalyzer:
             if count >= 2:  # Al menos 2 archivos
                 knowledge_areas.append(f"{ext} development")
         
-        # Top directorios
-        for dir_name, count in directories.most_common(2):
-            if count >= 3:  # Al menos 3 archivos
-                knowledge_areas.append(f"{dir_name} module")
+        # Top directorios propios (con al menos 3 archivos)
+        for dir_name in owned_directories[:2]:
+            knowledge_areas.append(f"{dir_name} module")
         
         return knowledge_areas[:3]  # Máximo 3 áreas
     
-    def _detect_knowledge_silos(self) -> List[KnowledgeSilo]:
-        """Detecta silos de conocimiento en el código."""
-        silos = []
+    def _detect_knowledge_silos(self, ownership: Optional[OwnershipMatrix] = None) -> List[KnowledgeSilo]:
+        """
+        Detecta silos de conocimiento en el código.
         
-        for file_path, ownership_counter in self.file_ownership.items():
-            if not ownership_counter:
-                continue
-            
-            total_contributions = sum(ownership_counter.values())
-            most_common = ownership_counter.most_common()
-            
-            if len(most_common) == 0:
-                continue
-            
-            primary_owner, primary_count = most_common[0]
-            ownership_percentage = primary_count / total_contributions
-            
-            # Determinar si es un silo (threshold configurables)
-            if ownership_percentage >= 0.8:  # 80% o más del código
-                risk_level = self._determine_silo_risk_level(ownership_percentage, total_contributions)
-                
-                # Obtener colaboradores secundarios
-                collaborators = [owner for owner, count in most_common[1:] if count > 0]
-                
-                silo = KnowledgeSilo(
-                    files=[file_path],
-                    primary_owner=primary_owner,
-                    ownership_percentage=ownership_percentage,
-                    risk_level=risk_level,
-                    collaborators=collaborators
-                )
-                
-                silos.append(silo)
-        
-        # Agrupar silos por owner para detectar patrones más grandes
-        grouped_silos = self._group_silos_by_owner(silos)
-        
-        return grouped_silos
-    
-    def _determine_silo_risk_level(self, ownership_percentage: float, total_contributions: int) -> str:
-        """Determina el nivel de riesgo de un silo de conocimiento."""
-        if ownership_percentage >= 0.95:
-            return 'critical'
-        elif ownership_percentage >= 0.9:
-            return 'high'
-        elif ownership_percentage >= 0.85:
-            return 'medium'
-        else:
-            return 'low'
-    
-    def _group_silos_by_owner(self, silos: List[KnowledgeSilo]) -> List[KnowledgeSilo]:
-        """Agrupa silos por owner para detectar patrones más grandes."""
-        owner_silos = defaultdict(list)
-        
-        for silo in silos:
-            owner_silos[silo.primary_owner].append(silo)
-        
-        grouped_silos = []
-        
-        for owner, owner_silo_list in owner_silos.items():
-            if len(owner_silo_list) > 1:
-                # Combinar múltiples silos del mismo owner
-                all_files = []
-                all_collaborators = set()
-                total_ownership = 0
-                
-                for silo in owner_silo_list:
-                    all_files.extend(silo.files)
-                    all_collaborators.update(silo.collaborators)
-                    total_ownership += silo.ownership_percentage
-                
-                avg_ownership = total_ownership / len(owner_silo_list)
-                risk_level = self._determine_silo_risk_level(avg_ownership, len(all_files))
-                
-                grouped_silo = KnowledgeSilo(
-                    files=all_files,
-                    primary_owner=owner,
-                    ownership_percentage=avg_ownership,
-                    risk_level=risk_level,
-                    collaborators=list(all_collaborators)
-                )
-                
-                grouped_silos.append(grouped_silo)
-            else:
-                grouped_silos.extend(owner_silo_list)
-        
-        return sorted(grouped_silos, key=lambda x: x.ownership_percentage, reverse=True)
+        Un archivo es un silo si su autor principal tiene al menos
+        SILO_THRESHOLD de las contribuciones; los silos del mismo autor se
+        agrupan. Totales, autores principales y porcentajes salen de
+        reducciones por columna de la matriz de ownership (por defecto, la
+        de toda la actividad; o la de una ventana temporal).
+        """
+        if ownership is None:
+            ownership = self.file_ownership
+        stats = ownership.stats()
+        is_silo = stats.shares >= self.SILO_THRESHOLD
+        if not is_silo.any():
+            return []
+        
+        files, owners, shares = stats.files[is_silo], stats.owners[is_silo], stats.shares[is_silo]
+        
+        # Autores principales en orden de aparición y sus silos agrupados
+        group_owners, first_positions = np.unique(owners, return_index=True)
+        group_owners = group_owners[np.argsort(first_positions)]
+        group_of = np.empty(len(ownership.authors), dtype=np.int64)
+        group_of[group_owners] = np.arange(len(group_owners))
+        groups = group_of[owners]
+        
+        group_sizes = np.bincount(groups, minlength=len(group_owners))
+        group_shares = np.bincount(groups, weights=shares, minlength=len(group_owners)) / group_sizes
+        risk_levels = self._silo_risk_levels(group_shares)
+        
+        # Colaboradores: otros autores de los archivos de cada grupo, de más
+        # a menos contribuciones
+        cells = ownership.matrix()[:, files].tocoo()
+        others = cells.row != owners[cells.col]
+        collaborator_counts: Counter = Counter()
+        for group, author, count in zip(groups[cells.col[others]].tolist(), cells.row[others].tolist(),
+                                        cells.data[others].tolist()):
+            collaborator_counts[group, author] += count
+        collaborators = defaultdict(list)
+        for (group, author), count in sorted(collaborator_counts.items(), key=lambda item: (-item[1], item[0][1])):
+            collaborators[group].append(ownership.authors.names[author])
+        
+        file_names = ownership.files.names
+        group_files = defaultdict(list)
+        for group, file_index in zip(groups.tolist(), files.tolist()):
+            group_files[group].append(file_names[file_index])
+        
+        silos = [
+            KnowledgeSilo(
+                files=group_files[group],
+                primary_owner=ownership.authors.names[owner],
+                ownership_percentage=share,
+                risk_level=risk_level,
+                collaborators=collaborators[group]
+            )
+            for group, (owner, share, risk_level) in enumerate(zip(group_owners.tolist(), group_shares.tolist(),
+                                                                   risk_levels.tolist()))
+        ]
+        
+        return sorted(silos, key=lambda x: x.ownership_percentage, reverse=True)
+    
+    def _silo_risk_levels(self, ownership_percentages: np.ndarray) -> np.ndarray:
+        """Nivel de riesgo de cada silo según su fracción de ownership (ver SILO_RISK_LEVELS)."""
+        return np.select([ownership_percentages >= threshold for _, threshold in self.SILO_RISK_LEVELS],
+                         [risk_level for risk_level, _ in self.SILO_RISK_LEVELS], 'low')
     
     def _analyze_collaboration_network(self) -> Dict[str, Any]:
         """Analiza la red de colaboración del equipo."""
-        if len(self.collaboration_graph.nodes()) == 0:
+        graph = self.collaboration_graph
+        node_count = graph.number_of_nodes()
+        
+        if node_count == 0:
             return {
                 'network_density': 0.0,
                 'central_members': [],
+                'weighted_central_members': [],
                 'isolated_members': [],
                 'clusters': [],
                 'network_health': 'poor'
             }
         
         # Calcular métricas de red
-        density = nx.density(self.collaboration_graph)
+        density = graph.density()
         
-        # Centralidad (miembros más conectados)
-        centrality = nx.degree_centrality(self.collaboration_graph)
+        # Centralidad (miembros más conectados y con más interacciones)
+        centrality = graph.degree_centrality()
         central_members = sorted(centrality.items(), key=lambda x: x[1], reverse=True)[:3]
+        weighted_centrality = graph.weighted_degree_centrality()
+        weighted_central_members = sorted(weighted_centrality.items(), key=lambda x: x[1], reverse=True)[:3]
         
         # Miembros aislados (sin colaboración)
         all_members = set(self.member_metrics.keys())
-        connected_members = set(self.collaboration_graph.nodes())
+        connected_members = set(graph.nodes())
         isolated_members = list(all_members - connected_members)
         
         # Detectar clusters de colaboración
         clusters = []
-        if len(self.collaboration_graph.nodes()) > 2:
+        if node_count > 2:
             try:
-                communities = nx.algorithms.community.greedy_modularity_communities(self.collaboration_graph)
-                clusters = [list(community) for community in communities if len(community) > 1]
+                clusters = [community for community in graph.communities() if len(community) > 1]
             except Exception as e:
                 logger.warning(f"Error detectando clusters de colaboración: {e}")
                 clusters = []
@@ -408,6 +732,7 @@ class CollaborationAnalyzer:
         return {
             'network_density': round(density, 3),
             'central_members': [(member, round(score, 3)) for member, score in central_members],
+            'weighted_central_members': [(member, round(score, 3)) for member, score in weighted_central_members],
             'isolated_members': isolated_members,
             'clusters': clusters,
             'network_health': network_health
@@ -458,24 +783,18 @@ class CollaborationAnalyzer:
             'collaboration_balance': collaboration_balance
         }
     
-    def _evaluate_knowledge_distribution(self) -> str:
+    def _evaluate_knowledge_distribution(self, ownership: Optional[OwnershipMatrix] = None) -> str:
         """Evalúa qué tan bien distribuido está el conocimiento."""
-        if not self.file_ownership:
-            return 'unknown'
+        if ownership is None:
+            ownership = self.file_ownership
         
-        # Calcular concentración de ownership
-        concentration_scores = []
-        for file_path, ownership_counter in self.file_ownership.items():
-            if ownership_counter:
-                total = sum(ownership_counter.values())
-                max_ownership = max(ownership_counter.values())
-                concentration = max_ownership / total
-                concentration_scores.append(concentration)
+        # Concentración de ownership: porcentaje del autor principal de cada archivo
+        concentration_scores = ownership.stats().shares
         
-        if not concentration_scores:
+        if not len(concentration_scores):
             return 'unknown'
         
-        avg_concentration = sum(concentration_scores) / len(concentration_scores)
+        avg_concentration = float(concentration_scores.mean())
         
         if avg_concentration <= 0.5:
             return 'excellent'
@@ -551,4 +870,26 @@ class CollaborationAnalyzer:
         
         final_score = max(0.0, base_score - silo_penalty)
         
-        return round(final_score, 3)
\ No newline at end of file
+        return round(final_score, 3)
+
+
+def _adjust(counter: Counter, key: str, delta: int):
+    """Suma delta a un contador y elimina la clave si llega a 0."""
+    value = counter[key] + delta
+    if value > 0:
+        counter[key] = value
+    else:
+        del counter[key]
+
+
+def _interactions(entries: Iterable[Dict[str, Any]], date_field: str, author: str,
+                  default: float) -> Tuple[Interaction, ...]:
+    """(fecha, autor) de las reviews o comentarios de otros miembros (sin fecha, la del PR)."""
+    interactions = []
+    for entry in entries:
+        member = entry.get('author', 'Unknown')
+        if member == 'Unknown' or member == author:
+            continue
+        date = to_epoch_seconds(entry.get(date_field))
+        interactions.append((default if math.isnan(date) else date, member))
+    return tuple(interactions)
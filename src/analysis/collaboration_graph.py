@@ -0,0 +1,231 @@
+"""
+Grafo de colaboración sobre una matriz de adyacencia dispersa.
+
+Cada miembro recibe un índice entero la primera vez que aparece y cada
+interacción (review, comentario) se guarda como un triple (fila, columna,
+peso). La matriz de adyacencia ponderada se construye de una vez con
+SciPy a partir de esos triples (los duplicados se suman) y la densidad,
+la centralidad y las comunidades se calculan sobre ella. La conversión a
+networkx solo se hace si se pide para exportar el grafo.
+
+Las interacciones con fecha se guardan además por día (DailySlices), y
+window() devuelve el grafo de una ventana temporal o con decaimiento
+sumando solo las matrices de esos días.
+"""
+
+import heapq
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .sparse_counts import IndexTable, SparseAccumulator
+from .time_slices import DailySlices
+
+logger = logging.getLogger(__name__)
+
+
+class CollaborationGraph:
+    """
+    Grafo no dirigido y ponderado de colaboración entre miembros.
+    """
+    
+    def __init__(self):
+        # Tabla de miembros e interacciones (fila < columna) como triples COO
+        self._members = IndexTable()
+        self._interactions = SparseAccumulator()
+        
+        # Las mismas interacciones separadas por día (solo las que tienen fecha)
+        self._daily = DailySlices()
+        
+        # Matriz simétrica en CSR y comunidades, recalculadas solo si hay
+        # triples nuevos
+        self._adjacency = None
+        self._communities: Dict[bool, List[List[str]]] = {}
+    
+    @property
+    def members(self) -> List[str]:
+        """Miembros por índice."""
+        return self._members.names
+    
+    def add_interaction(self, first: str, second: str, weight: float = 1.0, day: Optional[int] = None):
+        """Suma una interacción entre dos miembros distintos (del día indicado, si se conoce)."""
+        if first == second:
+            return
+        
+        i, j = self._members.index(first), self._members.index(second)
+        if i > j:
+            i, j = j, i
+        self._interactions.add(i, j, weight)
+        if day is not None:
+            self._daily.add(day, i, j, weight)
+        self._adjacency = None
+        self._communities.clear()
+    
+    def clear(self):
+        """Elimina todos los miembros e interacciones."""
+        self._members.clear()
+        self._interactions.clear()
+        self._daily.clear()
+        self._adjacency = None
+        self._communities.clear()
+    
+    def adjacency(self):
+        """Matriz de adyacencia ponderada (scipy.sparse CSR, simétrica)."""
+        if self._adjacency is None:
+            size = len(self._members)
+            upper = self._interactions.matrix((size, size))
+            self._adjacency = (upper + upper.T).tocsr()
+        return self._adjacency
+    
+    def window(self, end_day: int, days: Optional[int] = None,
+               half_life: Optional[float] = None) -> 'CollaborationGraph':
+        """
+        Grafo con las interacciones con fecha de una ventana temporal.
+        
+        Se suman las matrices diarias de los days días hasta end_day
+        (incluido) y, con half_life, cada día pesa 0.5 ** (antigüedad /
+        half_life). El grafo devuelto comparte la tabla de miembros y es de
+        solo lectura.
+        """
+        view = CollaborationGraph()
+        view._members = self._members
+        size = len(self._members)
+        upper = self._daily.window((size, size), end_day, days, half_life)
+        view._adjacency = (upper + upper.T).tocsr()
+        return view
+    
+    def nodes(self) -> List[str]:
+        """Miembros con al menos una interacción."""
+        return [self.members[i] for i in np.flatnonzero(self._degrees())]
+    
+    def number_of_nodes(self) -> int:
+        return int(np.count_nonzero(self._degrees()))
+    
+    def number_of_edges(self) -> int:
+        return self.adjacency().nnz // 2
+    
+    def density(self) -> float:
+        """Fracción de pares de miembros conectados (como networkx.density)."""
+        nodes = self.number_of_nodes()
+        if nodes < 2:
+            return 0.0
+        return self.adjacency().nnz / (nodes * (nodes - 1))
+    
+    def degree_centrality(self) -> Dict[str, float]:
+        """Colaboradores de cada miembro / (miembros - 1), como networkx.degree_centrality."""
+        return self._normalized(self._degrees())
+    
+    def weighted_degree_centrality(self) -> Dict[str, float]:
+        """Peso total de las interacciones de cada miembro / (miembros - 1)."""
+        return self._normalized(np.asarray(self.adjacency().sum(axis=1)).ravel())
+    
+    def communities(self, weighted: bool = False) -> List[List[str]]:
+        """
+        Comunidades por maximización voraz de la modularidad (Clauset-Newman-Moore).
+        
+        Se parte de un miembro por comunidad y se unen las dos comunidades
+        que más aumentan la modularidad mientras no disminuya. Los
+        incrementos se guardan por fila en diccionarios y los candidatos en
+        un heap; las entradas obsoletas se descartan al sacarlas.
+        
+        Args:
+            weighted: Usar los pesos de las interacciones (por defecto
+                cada par conectado cuenta igual, como networkx)
+        
+        Returns:
+            Comunidades de miembros, de mayor a menor tamaño
+        """
+        if weighted not in self._communities:
+            self._communities[weighted] = self._greedy_modularity(weighted)
+        return self._communities[weighted]
+    
+    def _greedy_modularity(self, weighted: bool) -> List[List[str]]:
+        upper = _upper_triangle(self.adjacency())
+        if not weighted:
+            upper.data = np.ones_like(upper.data)
+        
+        total = upper.data.sum()
+        if total == 0:
+            return [[member] for member in self.nodes()]
+        
+        # a_i: fracción de los extremos de aristas en cada comunidad
+        size = len(self.members)
+        degrees = (np.bincount(upper.row, weights=upper.data, minlength=size)
+                   + np.bincount(upper.col, weights=upper.data, minlength=size))
+        shares = degrees / (2 * total)
+        fractions = shares.tolist()
+        
+        # Incremento de modularidad al unir cada par conectado
+        gains = upper.data / total - 2 * shares[upper.row] * shares[upper.col]
+        delta: Dict[int, Dict[int, float]] = {node: {} for node in np.flatnonzero(degrees).tolist()}
+        heap = []
+        for i, j, gain in zip(upper.row.tolist(), upper.col.tolist(), gains.tolist()):
+            delta[i][j] = gain
+            delta[j][i] = gain
+            heap.append((-gain, i, j))
+        heapq.heapify(heap)
+        
+        groups = {node: [node] for node in delta}
+        while heap:
+            negative_gain, i, j = heapq.heappop(heap)
+            if negative_gain > 0:
+                break
+            if i not in groups or j not in groups or delta[i].get(j) != -negative_gain:
+                continue
+            
+            # Unir la comunidad con menos vecinos en la de más vecinos
+            if len(delta[i]) > len(delta[j]):
+                i, j = j, i
+            row_i, row_j = delta.pop(i), delta[j]
+            for k in set(row_i) | set(row_j):
+                if k == i or k == j:
+                    continue
+                if k in row_i and k in row_j:
+                    gain = row_i[k] + row_j[k]
+                elif k in row_i:
+                    gain = row_i[k] - 2 * fractions[j] * fractions[k]
+                else:
+                    gain = row_j[k] - 2 * fractions[i] * fractions[k]
+                row_j[k] = gain
+                delta[k][j] = gain
+                delta[k].pop(i, None)
+                heapq.heappush(heap, (-gain, min(j, k), max(j, k)))
+            row_j.pop(i, None)
+            fractions[j] += fractions[i]
+            groups[j].extend(groups.pop(i))
+        
+        communities = sorted((sorted(group) for group in groups.values()), key=lambda group: (-len(group), group[0]))
+        return [[self.members[node] for node in group] for group in communities]
+    
+    def to_networkx(self) -> Any:
+        """Grafo de networkx equivalente (atributo 'weight'), para exportar."""
+        # Importación diferida: networkx solo se carga al exportar
+        import networkx as nx
+        
+        graph = nx.Graph()
+        upper = _upper_triangle(self.adjacency())
+        graph.add_nodes_from(self.nodes())
+        graph.add_weighted_edges_from(
+            (self.members[i], self.members[j], weight)
+            for i, j, weight in zip(upper.row.tolist(), upper.col.tolist(), upper.data.tolist())
+        )
+        return graph
+    
+    def _degrees(self) -> np.ndarray:
+        """Número de colaboradores distintos de cada miembro."""
+        return np.diff(self.adjacency().indptr)
+    
+    def _normalized(self, values: np.ndarray) -> Dict[str, float]:
+        connected = np.flatnonzero(self._degrees())
+        if len(connected) < 2:
+            return {self.members[i]: 1.0 for i in connected}
+        scale = 1.0 / (len(connected) - 1)
+        return {self.members[i]: float(values[i]) * scale for i in connected}
+
+
+def _upper_triangle(adjacency):
+    """Aristas (i < j) de una matriz simétrica en formato COO."""
+    from scipy import sparse
+    
+    return sparse.triu(adjacency, k=1, format='coo')
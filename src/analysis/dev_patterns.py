@@ -0,0 +1,172 @@
+"""
+Ajuste del sentimiento por patrones propios de la comunicación de desarrollo.
+
+Cada categoría (p. ej. positivos en inglés, negativos en español) tiene un
+peso y una lista de expresiones regulares; el ajuste de un texto es la suma
+de peso × número de patrones de la categoría que aparecen en él.
+
+Buscar cada patrón en cada texto es caro y casi nunca hay coincidencias.
+DevPatternMatcher extrae de cada patrón los literales obligatorios con los
+que puede empezar una coincidencia (p. ej. 'terrible', 'awful' y 'horrible'
+en "(?:this\\s+is\\s+)?(?:terrible|awful|horrible)") y, por texto:
+
+1. Comprueba todos los literales con búsquedas de subcadena sobre el texto
+   en minúsculas (casefold), un prefiltro al estilo Aho-Corasick
+2. Solo ejecuta la expresión regular de los patrones con algún literal
+   presente
+
+El prefiltro no descarta nunca una coincidencia real: si un patrón
+coincide, uno de sus literales aparece en el texto.
+"""
+
+import re
+import json
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # type: ignore[attr-defined]  # Python 3.11+, sin stubs
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+# Límite del ajuste total de un texto
+MAX_ADJUSTMENT = 0.5
+
+
+class DevPatternMatcher:
+    """
+    Cuenta las coincidencias de varias categorías de patrones con un prefiltro literal.
+    """
+    
+    def __init__(self, categories: Dict[str, Tuple[float, Sequence[str]]]):
+        """
+        Compila las categorías de patrones.
+        
+        Args:
+            categories: Nombre de categoría → (peso, patrones). Los patrones
+                se buscan sin distinguir mayúsculas.
+        """
+        self.categories = {name: (weight, list(patterns)) for name, (weight, patterns) in categories.items()}
+        
+        # Patrones compilados: (categoría, regex)
+        self._patterns: List[Tuple[str, re.Pattern]] = []
+        # Literal → índices de los patrones que lo necesitan
+        self._literal_index: Dict[str, List[int]] = defaultdict(list)
+        # Patrones sin literal obligatorio: se buscan siempre
+        self._unfiltered: List[int] = []
+        
+        for name, (_, patterns) in self.categories.items():
+            for pattern in patterns:
+                index = len(self._patterns)
+                self._patterns.append((name, re.compile(pattern, re.IGNORECASE)))
+                
+                literals = required_literals(pattern)
+                if literals:
+                    for literal in literals:
+                        self._literal_index[literal].append(index)
+                else:
+                    self._unfiltered.append(index)
+        
+        self._literals = tuple(self._literal_index)
+        
+        # Huella de categorías, pesos y patrones (para invalidar cachés)
+        self.fingerprint = hashlib.sha256(json.dumps(self.categories).encode('utf-8')).hexdigest()[:16]
+    
+    def count_matches(self, text: str) -> Dict[str, int]:
+        """
+        Cuenta cuántos patrones distintos de cada categoría aparecen en el texto.
+        
+        Returns:
+            Número de patrones por categoría, solo las que tienen alguno
+        """
+        folded = text.casefold()
+        present = [literal for literal in self._literals if literal in folded]
+        if not present and not self._unfiltered:
+            return {}
+        
+        candidates = set(self._unfiltered)
+        for literal in present:
+            candidates.update(self._literal_index[literal])
+        
+        counts: Dict[str, int] = {}
+        for index in candidates:
+            name, regex = self._patterns[index]
+            if regex.search(text):
+                counts[name] = counts.get(name, 0) + 1
+        
+        return counts
+    
+    def adjustment(self, text: str) -> float:
+        """Ajuste de sentimiento del texto, limitado a ±MAX_ADJUSTMENT."""
+        counts = self.count_matches(text)
+        if not counts:
+            return 0.0
+        
+        # Mismo orden de suma que las categorías, para un resultado estable
+        adjustment = 0.0
+        for name, (weight, _) in self.categories.items():
+            if name in counts:
+                adjustment += weight * counts[name]
+        
+        return max(-MAX_ADJUSTMENT, min(MAX_ADJUSTMENT, adjustment))
+
+
+def required_literals(pattern: str) -> Optional[Set[str]]:
+    """
+    Literales de los que al menos uno aparece en toda coincidencia del patrón.
+    
+    Se saltan los elementos opcionales iniciales y se toma el literal con
+    el que empieza el primer elemento obligatorio (o cada alternativa, si es
+    una alternancia).
+    
+    Returns:
+        Los literales en minúsculas (casefold), o None si el patrón no
+        empieza por literales y no se puede prefiltrar
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return None
+    return _leading_literals(list(parsed))
+
+
+def _leading_literals(items: List[Tuple]) -> Optional[Set[str]]:
+    """Literales iniciales del primer elemento obligatorio de una secuencia."""
+    for position, (op, value) in enumerate(items):
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and value[0] == 0:
+            continue  # Opcional: la coincidencia puede no incluirlo
+        if op is sre_parse.AT:
+            continue  # Anclas sin ancho
+        return _literals_from(items[position:])
+    return None
+
+
+def _literals_from(items: List[Tuple]) -> Optional[Set[str]]:
+    """Literales con los que empieza una secuencia cuyo primer elemento es obligatorio."""
+    op, value = items[0]
+    
+    if op is sre_parse.LITERAL:
+        chars = []
+        for op, value in items:
+            if op is not sre_parse.LITERAL:
+                break
+            chars.append(chr(value))
+        return {''.join(chars).casefold()}
+    
+    if op is sre_parse.SUBPATTERN:
+        return _leading_literals(list(value[-1]))
+    
+    if op is sre_parse.BRANCH:
+        literals = set()
+        for branch in value[1]:
+            branch_literals = _leading_literals(list(branch))
+            if not branch_literals:
+                return None
+            literals |= branch_literals
+        return literals
+    
+    return None
@@ -0,0 +1,41 @@
+"""
+Fechas como segundos y días desde epoch (1970-01-01, UTC).
+
+Los análisis guardan las fechas de commits, PRs, comentarios y reviews
+como float64 (NaN si no hay fecha) y las agrupan por día.
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+SECONDS_PER_DAY = 86400
+
+
+def to_epoch_seconds(value: Any) -> float:
+    """
+    Convierte una fecha (datetime, ISO 8601 o epoch) a segundos desde epoch.
+    
+    Los datetime sin zona se consideran UTC. Devuelve NaN si no hay fecha.
+    """
+    if value is None:
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return math.nan
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return math.nan
+
+
+def epoch_day(timestamp: float) -> Optional[int]:
+    """Día (desde 1970-01-01, UTC) de una fecha en segundos desde epoch (None si es NaN)."""
+    if math.isnan(timestamp):
+        return None
+    return int(timestamp // SECONDS_PER_DAY)
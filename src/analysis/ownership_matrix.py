@@ -0,0 +1,130 @@
+"""
+Ownership de archivos como matriz dispersa autores × archivos.
+
+Cada commit suma 1 en la celda (autor, archivo) de los archivos que
+modifica (y resta 1 si se descuenta). Los totales por archivo, el autor
+principal y su porcentaje se obtienen con reducciones por columna sobre la
+matriz, sin recorrer un Counter por archivo; tras una actualización solo se
+recalculan las columnas de los archivos modificados. Las contribuciones con
+fecha se guardan además por día para obtener el ownership de una ventana
+temporal (window()).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .sparse_counts import IndexTable, SparseAccumulator, column_owners
+from .time_slices import DailySlices
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OwnershipStats:
+    """Ownership de los archivos con contribuciones (arrays alineados)."""
+    files: np.ndarray    # índice de cada archivo
+    totals: np.ndarray   # contribuciones totales
+    owners: np.ndarray   # índice del autor principal
+    shares: np.ndarray   # fracción de las contribuciones del autor principal
+
+
+class OwnershipMatrix:
+    """
+    Contribuciones de cada autor a cada archivo.
+    """
+    
+    def __init__(self):
+        self.authors = IndexTable()
+        self.files = IndexTable()
+        self._counts = SparseAccumulator()
+        self._daily = DailySlices()
+        self._matrix = None
+        self._stats = None
+        
+        # Totales, autor principal y máximo de cada columna, y columnas
+        # modificadas desde el último cálculo
+        self._columns = None
+        self._dirty_files = set()
+        
+        # Aumenta con cada cambio (para saber si un resultado derivado sigue vigente)
+        self.version = 0
+    
+    def __len__(self) -> int:
+        """Número de archivos con contribuciones."""
+        return len(self.stats().files)
+    
+    def add(self, author: str, files: Iterable[str], weight: float = 1.0, day: Optional[int] = None):
+        """
+        Suma una contribución del autor a cada archivo (weight=-1 la
+        descuenta), también en la matriz de su día si se conoce.
+        """
+        author_index = self.authors.index(author)
+        for file_path in files:
+            file_index = self.files.index(file_path)
+            self._counts.add(author_index, file_index, weight)
+            if day is not None:
+                self._daily.add(day, author_index, file_index, weight)
+            self._dirty_files.add(file_index)
+        self._matrix = None
+        self._stats = None
+        self.version += 1
+    
+    def clear(self):
+        self.authors.clear()
+        self.files.clear()
+        self._counts.clear()
+        self._daily.clear()
+        self._matrix = None
+        self._stats = None
+        self._columns = None
+        self._dirty_files.clear()
+        self.version += 1
+    
+    def matrix(self):
+        """Matriz de contribuciones autores × archivos (scipy.sparse CSC)."""
+        if self._matrix is None:
+            self._matrix = self._counts.matrix((len(self.authors), len(self.files))).tocsc()
+        return self._matrix
+    
+    def window(self, end_day: int, days: Optional[int] = None,
+               half_life: Optional[float] = None) -> 'OwnershipMatrix':
+        """
+        Ownership de las contribuciones con fecha de una ventana temporal
+        (ver DailySlices.window). Comparte las tablas de autores y archivos
+        y es de solo lectura.
+        """
+        view = OwnershipMatrix()
+        view.authors, view.files = self.authors, self.files
+        view._matrix = self._daily.window((len(self.authors), len(self.files)), end_day, days, half_life).tocsc()
+        return view
+    
+    def stats(self) -> OwnershipStats:
+        """Totales, autor principal y su porcentaje de todos los archivos a la vez."""
+        if self._stats is None:
+            self._update_columns()
+            totals, owners, maxima = self._columns
+            files = np.flatnonzero(totals > 0)
+            self._stats = OwnershipStats(files=files, totals=totals[files], owners=owners[files],
+                                         shares=maxima[files] / totals[files])
+        return self._stats
+    
+    def _update_columns(self):
+        """Recalcula las reducciones por columna de los archivos modificados."""
+        counts = self.matrix()
+        if self._columns is None:
+            self._columns = column_owners(counts)
+        elif self._dirty_files:
+            dirty = np.fromiter(self._dirty_files, dtype=np.int64, count=len(self._dirty_files))
+            
+            # Columnas nuevas (archivos vistos por primera vez) vacías hasta calcularlas
+            grown = len(self.files) - len(self._columns[0])
+            if grown:
+                self._columns = tuple(np.concatenate([column, np.zeros(grown, dtype=column.dtype)])
+                                      for column in self._columns)
+            
+            for column, values in zip(self._columns, column_owners(counts[:, dirty])):
+                column[dirty] = values
+        self._dirty_files.clear()
@@ -0,0 +1,191 @@
+"""
+Ownership por directorio: un árbol de rutas con las contribuciones
+acumuladas de cada subárbol.
+
+Cada directorio del repositorio es un nodo del árbol (la raíz es ''). Las
+contribuciones de cada autor a cada archivo se suman en su directorio y en
+todos sus antecesores de una vez, multiplicando la matriz autores ×
+archivos por la matriz de pertenencia archivo → directorios. Con eso se
+precalculan el autor principal, su porcentaje y el bus factor de todos los
+subárboles, y consultar "quién conoce services/payments/**" es una
+búsqueda en un diccionario.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .ownership_matrix import OwnershipMatrix
+from .sparse_counts import column_bus_factors, column_owners
+
+logger = logging.getLogger(__name__)
+
+# Fracción de las contribuciones de un subárbol que deben concentrar los
+# autores del bus factor
+BUS_FACTOR_SHARE = 0.5
+
+
+class OwnershipTree:
+    """
+    Árbol de directorios con el ownership agregado de cada subárbol.
+    """
+    
+    def __init__(self, ownership: OwnershipMatrix):
+        """
+        Construye el árbol con los archivos con contribuciones de la matriz.
+        
+        Args:
+            ownership: Contribuciones autores × archivos
+        """
+        self._authors = ownership.authors.names
+        
+        # Directorios: ruta → nodo, con su padre (la raíz es su propio padre)
+        self.paths: List[str] = ['']
+        self._nodes: Dict[str, int] = {'': 0}
+        self._parents: List[int] = [0]
+        self._children: List[List[int]] = [[]]
+        
+        stats = ownership.stats()
+        file_names = ownership.files.names
+        file_nodes = np.array([self._directory(file_names[index].rpartition('/')[0])
+                               for index in stats.files.tolist()], dtype=np.int64)
+        
+        # Contribuciones por directorio (autores × directorios) y de cada
+        # subárbol: se suman en cada directorio antecesor de una vez
+        ancestors = self._ancestor_matrix()
+        direct = ownership.matrix()[:, stats.files] @ _indicator(file_nodes, len(self.paths))
+        counts = (direct @ ancestors).tocsc()
+        counts.sort_indices()
+        
+        self.totals, self._owners, maxima = column_owners(counts)
+        self.shares = np.divide(maxima, self.totals, out=np.zeros_like(maxima), where=self.totals > 0)
+        self.bus_factors = column_bus_factors(counts, self.totals, BUS_FACTOR_SHARE)
+        self.file_counts = np.bincount(file_nodes, minlength=len(self.paths)) @ ancestors
+        self.author_counts = np.diff(counts.indptr)
+        
+        logger.debug(f"🌳 Ownership de {len(stats.files)} archivos en {len(self.paths)} directorios")
+    
+    def __len__(self) -> int:
+        """Número de directorios (incluida la raíz)."""
+        return len(self.paths)
+    
+    def __contains__(self, path: str) -> bool:
+        return _normalize(path) in self._nodes
+    
+    def owner(self, path: str) -> Tuple[Optional[str], float]:
+        """Autor principal de un subárbol y su fracción de las contribuciones."""
+        node = self._node(path)
+        owner = self._owners[node]
+        return (self._authors[owner] if owner >= 0 else None), float(self.shares[node])
+    
+    def bus_factor(self, path: str) -> int:
+        """Autores que concentran al menos BUS_FACTOR_SHARE de las contribuciones del subárbol."""
+        return int(self.bus_factors[self._node(path)])
+    
+    def children(self, path: str = '') -> List[str]:
+        """Subdirectorios directos de un directorio."""
+        return [self.paths[child] for child in self._children[self._node(path)]]
+    
+    def summary(self, path: str = '') -> Dict[str, Any]:
+        """Ownership de un subárbol: contribuciones, archivos, autor principal y bus factor."""
+        node = self._node(path)
+        owner, share = self.owner(path)
+        return {
+            'path': self.paths[node],
+            'files': int(self.file_counts[node]),
+            'contributions': float(self.totals[node]),
+            'contributors': int(self.author_counts[node]),
+            'primary_owner': owner,
+            'ownership_percentage': share,
+            'bus_factor': int(self.bus_factors[node])
+        }
+    
+    def to_list(self, max_depth: Optional[int] = 2) -> List[Dict[str, Any]]:
+        """
+        Resumen de los directorios hasta max_depth niveles (None = todos),
+        en orden de recorrido (cada directorio seguido de sus
+        subdirectorios, de más a menos contribuciones).
+        """
+        rows = []
+        pending = [(child, 1) for child in self._largest_last(0)]
+        while pending:
+            node, depth = pending.pop()
+            rows.append(dict(self.summary(self.paths[node]), depth=depth))
+            if max_depth is None or depth < max_depth:
+                pending.extend((child, depth + 1) for child in self._largest_last(node))
+        return rows
+    
+    def owned_areas(self, min_files: int = 3) -> Dict[str, List[str]]:
+        """
+        Directorios más amplios de los que cada autor es el principal.
+        
+        Un directorio cuenta si el autor es su autor principal, tiene al
+        menos min_files archivos y el directorio padre no es también suyo.
+        Se ordenan de más a menos contribuciones del autor.
+        """
+        nodes = np.arange(1, len(self.paths))
+        owners = self._owners[nodes]
+        parents = np.asarray(self._parents)[nodes]
+        widest = (owners >= 0) & (self.file_counts[nodes] >= min_files) & \
+                 ((parents == 0) | (self._owners[parents] != owners))
+        
+        nodes = nodes[widest]
+        contributions = self.shares[nodes] * self.totals[nodes]
+        areas: Dict[str, List[str]] = {}
+        for node in nodes[np.argsort(-contributions, kind='stable')].tolist():
+            areas.setdefault(self._authors[self._owners[node]], []).append(self.paths[node])
+        return areas
+    
+    def _largest_last(self, node: int) -> List[int]:
+        """Subdirectorios de menos a más contribuciones (para sacarlos de una pila)."""
+        return sorted(self._children[node], key=lambda child: (-self.totals[child], child))[::-1]
+    
+    def _node(self, path: str) -> int:
+        node = self._nodes.get(_normalize(path))
+        if node is None:
+            raise KeyError(f"Directorio sin contribuciones: {path}")
+        return node
+    
+    def _directory(self, path: str) -> int:
+        """Nodo de un directorio, creando los directorios que falten."""
+        node = self._nodes.get(path)
+        if node is None:
+            parent = self._directory(path.rpartition('/')[0])
+            node = self._nodes[path] = len(self.paths)
+            self.paths.append(path)
+            self._parents.append(parent)
+            self._children.append([])
+            self._children[parent].append(node)
+        return node
+    
+    def _ancestor_matrix(self):
+        """Matriz directorios × directorios: 1 en cada antecesor (y el propio directorio)."""
+        from scipy import sparse
+        
+        # Los padres se crean antes que sus hijos: basta un recorrido en orden
+        ancestors: List[List[int]] = []
+        for node, parent in enumerate(self._parents):
+            ancestors.append([node] if node == 0 else ancestors[parent] + [node])
+        
+        rows = np.repeat(np.arange(len(ancestors)), [len(chain) for chain in ancestors])
+        columns = np.fromiter((node for chain in ancestors for node in chain), dtype=np.int64, count=len(rows))
+        return sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(ancestors), len(ancestors)))
+
+
+def _indicator(columns: np.ndarray, size: int):
+    """Matriz con un 1 por fila en la columna indicada."""
+    from scipy import sparse
+    
+    return sparse.csr_matrix((np.ones(len(columns)), (np.arange(len(columns)), columns)),
+                             shape=(len(columns), size))
+
+
+def _normalize(path: str) -> str:
+    """'services/payments/**', './services/payments/' → 'services/payments'."""
+    path = path.strip()
+    if path.endswith('**'):
+        path = path[:-2]
+    if path.startswith('./'):
+        path = path[2:]
+    return path.strip('/')
@@ -0,0 +1,163 @@
+"""
+Paquetes de patrones de desarrollo por idioma.
+
+Cada idioma tiene un archivo JSON en pattern_packs/ con:
+- stopwords: palabras frecuentes que identifican el idioma
+- markers: caracteres propios del idioma (p. ej. 'ñ', '¿')
+- categories: categoría → {weight, patterns}
+
+Los paquetes se compilan una sola vez por proceso y solo cuando aparece un
+texto en su idioma: un equipo que solo escribe en inglés nunca compila los
+patrones en español. Para añadir un idioma basta con añadir su archivo.
+"""
+
+import re
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from functools import lru_cache
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .dev_patterns import DevPatternMatcher
+
+logger = logging.getLogger(__name__)
+
+PATTERN_PACK_DIR = Path(__file__).parent / 'pattern_packs'
+
+# Matchers compilados por conjunto de idiomas, compartidos por todos los analizadores
+_matchers: Dict[FrozenSet[str], DevPatternMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def available_languages() -> Tuple[str, ...]:
+    """Idiomas con paquete de patrones."""
+    return tuple(sorted(path.stem for path in PATTERN_PACK_DIR.glob('*.json')))
+
+
+@lru_cache(maxsize=None)
+def load_pattern_pack(language: str) -> Dict[str, Any]:
+    """
+    Lee el paquete de patrones de un idioma.
+    
+    Raises:
+        ValueError: Si no hay paquete para el idioma
+    """
+    if language not in available_languages():
+        raise ValueError(f"No hay paquete de patrones para el idioma '{language}'")
+    
+    with open(PATTERN_PACK_DIR / f'{language}.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_languages(languages: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Normaliza una lista de idiomas (o una cadena 'en,es'), descartando los que no tienen paquete.
+    
+    'auto' equivale a todos los idiomas disponibles.
+    """
+    if isinstance(languages, str):
+        languages = languages.split(',')
+    
+    parsed: List[str] = []
+    for language in languages:
+        language = language.strip().lower()
+        if language == 'auto':
+            parsed.extend(other for other in available_languages() if other not in parsed)
+            continue
+        if not language or language in parsed:
+            continue
+        if language not in available_languages():
+            logger.warning(f"⚠️ Idioma sin paquete de patrones ignorado: {language}")
+            continue
+        parsed.append(language)
+    
+    return tuple(parsed)
+
+
+@lru_cache(maxsize=None)
+def patterns_fingerprint() -> str:
+    """Huella del contenido de todos los paquetes (para invalidar cachés)."""
+    digest = hashlib.sha256()
+    for language in available_languages():
+        digest.update(json.dumps(load_pattern_pack(language), sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def get_pattern_matcher(languages: FrozenSet[str]) -> DevPatternMatcher:
+    """
+    Devuelve el matcher de los patrones de varios idiomas, compilándolo la primera vez.
+    
+    Las categorías se llaman '<categoría>_<idioma>' (p. ej. 'negative_es').
+    """
+    matcher = _matchers.get(languages)
+    if matcher is not None:
+        return matcher
+    
+    with _matchers_lock:
+        if languages not in _matchers:
+            categories = {}
+            for language in sorted(languages):
+                for name, category in load_pattern_pack(language)['categories'].items():
+                    categories[f'{name}_{language}'] = (category['weight'], category['patterns'])
+            
+            logger.debug(f"🔤 Compilando patrones de desarrollo: {', '.join(sorted(languages)) or '-'}")
+            _matchers[languages] = DevPatternMatcher(categories)
+        return _matchers[languages]
+
+
+@lru_cache(maxsize=None)
+def _language_signals() -> Tuple[Tuple[str, FrozenSet[str], Optional[re.Pattern]], ...]:
+    """
+    Señales de identificación de cada paquete: (idioma, stopwords, regex de caracteres propios).
+    
+    Las stopwords compartidas por varios idiomas no identifican ninguno y
+    se descartan.
+    """
+    packs = {language: load_pattern_pack(language) for language in available_languages()}
+    
+    owners: Dict[str, set] = {}
+    for language, pack in packs.items():
+        for word in pack.get('stopwords', []):
+            owners.setdefault(word.casefold(), set()).add(language)
+    
+    signals = []
+    for language, pack in packs.items():
+        stopwords = frozenset(word for word, languages in owners.items() if languages == {language})
+        markers = pack.get('markers')
+        signals.append((language, stopwords, re.compile(f'[{re.escape(markers)}]') if markers else None))
+    
+    return tuple(signals)
+
+
+def detect_languages(text: str, skip: AbstractSet[str] = frozenset()) -> FrozenSet[str]:
+    """
+    Identificación rápida de los idiomas de un texto por stopwords y caracteres propios.
+    
+    Las palabras se separan solo por espacios: basta para las stopwords,
+    que rara vez van junto a un signo de puntuación. Un texto puede tener
+    varios idiomas (mensajes mezclados) o ninguno (textos cortos sin
+    palabras frecuentes).
+    
+    Args:
+        text: Texto a identificar
+        skip: Idiomas que no hace falta comprobar (p. ej. los que ya se aplican)
+    """
+    folded = text.casefold()
+    words = None
+    
+    detected = set()
+    for language, stopwords, markers in _language_signals():
+        if language in skip:
+            continue
+        if markers is not None and markers.search(folded):
+            detected.add(language)
+            continue
+        if words is None:
+            words = folded.split()
+        if not stopwords.isdisjoint(words):
+            detected.add(language)
+    
+    return frozenset(detected)
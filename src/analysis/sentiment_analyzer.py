@@ -8,18 +8,87 @@ Este módulo analiza el tono y sentimiento de:
 - Comunicación general del equipo
 """
 
+import os
+import math
 import logging
-from typing import Dict, List, Any, Tuple
+import threading
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass
 import re
 
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer as VaderAnalyzer
+import numpy as np
+from vaderSentiment.vaderSentiment import (BOOSTER_DICT, NEGATE, SENTIMENT_LADEN_IDIOMS, SPECIAL_CASES,
+                                           SentimentIntensityAnalyzer as VaderAnalyzer)
+
+from .activity_stream import COMMIT, PULL_REQUEST, iter_activity
+from .sentiment_cache import SentimentCache
+from .transformer_backend import get_transformer_model, transformers_available
+from .pattern_packs import detect_languages, get_pattern_matcher, parse_languages, patterns_fingerprint
+from .epoch_time import to_epoch_seconds
+from .sentiment_trends import SentimentTrends
+from .text_dedup import canonicalize, find_near_duplicates, is_bot
 
 logger = logging.getLogger(__name__)
 
+# Etiquetas de sentimiento; SentimentBatch.label guarda el índice en esta tupla
+SENTIMENT_LABELS = ('negative', 'neutral', 'positive')
+NEGATIVE, NEUTRAL, POSITIVE = range(len(SENTIMENT_LABELS))
+
+# Umbrales del score para considerar un texto positivo o negativo
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+
+# Textos acumulados por grupo antes de puntuarlos en lote en modo streaming
+# (por cada proceso en el modo multiproceso)
+STREAM_BATCH_SIZE = 512
+
+# Modo multiproceso: lotes más pequeños se puntúan en el proceso actual y los
+# grandes se reparten en varios trozos por worker para equilibrar la carga
+PARALLEL_MIN_TEXTS = 256
+CHUNKS_PER_WORKER = 4
+
+# Modelo 'transformer': los textos con |score VADER| por debajo de este
+# umbral (ambiguos) se vuelven a puntuar con el modelo transformer
+TRANSFORMER_GATE = 0.5
+
+# Versión de la forma de aplicar los patrones; súbela si cambia el ajuste
+# sin cambiar patrones ni pesos, para invalidar los resultados en caché
+PATTERN_SET_VERSION = 2
+
+# Palabras con reglas propias en VADER (contraste, "kind of", "at least",
+# "never so/this", "without doubt"), fuera de su léxico
+VADER_SPECIAL_WORDS = frozenset({'but', 'kind', 'of', 'at', 'least', 'never', 'so', 'this', 'without', 'doubt',
+                                 'no', 'nor', 'or', 'very'})
+
+# Palabras de las expresiones de VADER ("the shit", "break a leg") que solas
+# no forman ninguna: basta con las demás para detectarlas
+IDIOM_STOPWORDS = frozenset({'a', 'the', 'to', 'for', 'in', 'on'})
+
+# Columnas de SentimentBatch.emotions
+EMOTION_COLUMNS = ('positive', 'negative', 'neutral')
+
+# Columnas por elemento de SentimentBatch
+BATCH_COLUMNS = ('score', 'label', 'confidence', 'emotions', 'timestamp', 'author_id', 'text_id')
+
+# Decimales de los scores en SentimentBatch.to_dict() (float32 no da más precisión útil)
+SERIALIZED_DECIMALS = 4
+
+# Agrupación de textos antes de puntuarlos: 'off' (solo textos idénticos),
+# 'exact' (misma forma canónica) o 'near' (además, casi duplicados)
+DEDUP_MODES = ('off', 'exact', 'near')
+
+# Grupos de textos de los resultados y su contexto de análisis
+TEXT_CONTEXTS = {
+    'commits': 'commit',
+    'titles': 'pr_title',
+    'comments': 'comment',
+    'reviews': 'review',
+}
+
 
 @dataclass
 class SentimentResult:
@@ -29,6 +98,194 @@ class SentimentResult:
     sentiment_label: str    # 'positive', 'negative', 'neutral'
     confidence: float      # 0.0 a 1.0
     emotions: Dict[str, float]  # Emociones específicas detectadas
+    timestamp: Optional[datetime] = None  # Fecha del commit, comentario o review
+    author: Optional[str] = None
+
+
+@dataclass
+class SentimentBatch:
+    """
+    Resultados de sentimiento de muchos textos en columnas NumPy.
+    
+    La posición i de cada array corresponde al texto i del lote. Los autores
+    y textos no se copian por elemento: cada elemento guarda un índice en
+    las tablas authors y texts, donde cada valor distinto aparece una vez.
+    Los textos solo se conservan si el analizador se crea con keep_texts;
+    sin ellos text_id sigue indicando qué elementos tienen el mismo texto.
+    """
+    score: np.ndarray       # float32, -1.0 a 1.0
+    label: np.ndarray       # int8, índice en SENTIMENT_LABELS
+    confidence: np.ndarray  # float32, 0.0 a 1.0
+    emotions: np.ndarray    # float32 (n, 3), columnas de EMOTION_COLUMNS
+    timestamp: np.ndarray   # float64, segundos desde epoch (NaN = sin fecha)
+    author_id: np.ndarray   # int32, índice en authors (-1 = desconocido)
+    text_id: np.ndarray     # int32, índice del texto en el lote (-1 = vacío)
+    authors: Tuple[str, ...] = ()
+    texts: Tuple[str, ...] = ()
+    
+    def __len__(self) -> int:
+        return len(self.score)
+    
+    @property
+    def positive(self) -> np.ndarray:
+        return self.emotions[:, 0]
+    
+    @property
+    def negative(self) -> np.ndarray:
+        return self.emotions[:, 1]
+    
+    @property
+    def neutral(self) -> np.ndarray:
+        return self.emotions[:, 2]
+    
+    @property
+    def author(self) -> np.ndarray:
+        """Autor de cada elemento (None = desconocido)."""
+        names = np.array(self.authors + (None,), dtype=object)
+        return names[self.author_id]
+    
+    @property
+    def nbytes(self) -> int:
+        """Memoria de las columnas (sin contar las tablas de autores y textos)."""
+        return sum(getattr(self, column).nbytes for column in BATCH_COLUMNS)
+    
+    @classmethod
+    def empty(cls) -> 'SentimentBatch':
+        """Lote sin textos."""
+        return cls.from_scores(np.zeros(0), np.zeros(0), np.zeros((0, 3)))
+    
+    @classmethod
+    def from_scores(cls, score: np.ndarray, confidence: np.ndarray, emotions: np.ndarray,
+                    timestamp: Optional[np.ndarray] = None, author_id: Optional[np.ndarray] = None,
+                    authors: Tuple[str, ...] = (), text_id: Optional[np.ndarray] = None,
+                    texts: Tuple[str, ...] = ()) -> 'SentimentBatch':
+        """
+        Construye el lote y calcula las etiquetas a partir de los scores.
+        
+        Args:
+            score: Scores de sentimiento
+            confidence: Confianza de cada score
+            emotions: Matriz (n, 3) con las columnas positive, negative, neutral
+            timestamp: Fecha de cada texto en segundos desde epoch (por defecto, sin fecha)
+            author_id: Índice del autor de cada texto en authors (por defecto, desconocido)
+            authors: Autores distintos del lote
+            text_id: Índice de cada texto en texts (por defecto, cada elemento el suyo)
+            texts: Textos distintos del lote, si se conservan
+        """
+        count = len(score)
+        label = np.full(count, NEUTRAL, dtype=np.int8)
+        label[score >= POSITIVE_THRESHOLD] = POSITIVE
+        label[score <= NEGATIVE_THRESHOLD] = NEGATIVE
+        
+        if timestamp is None:
+            timestamp = np.full(count, np.nan)
+        if author_id is None:
+            author_id = np.full(count, -1, dtype=np.int32)
+        if text_id is None:
+            text_id = np.arange(count, dtype=np.int32)
+        
+        return cls(score=np.asarray(score, dtype=np.float32), label=label,
+                   confidence=np.asarray(confidence, dtype=np.float32),
+                   emotions=np.asarray(emotions, dtype=np.float32).reshape(count, len(EMOTION_COLUMNS)),
+                   timestamp=np.asarray(timestamp, dtype=np.float64),
+                   author_id=np.asarray(author_id, dtype=np.int32), text_id=np.asarray(text_id, dtype=np.int32),
+                   authors=tuple(authors), texts=tuple(texts))
+    
+    @classmethod
+    def concatenate(cls, batches: Sequence['SentimentBatch']) -> 'SentimentBatch':
+        """Une varios lotes en uno, conservando el orden."""
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        
+        # Tabla de autores común y traducción de los índices de cada lote
+        author_table: Dict[str, int] = {}
+        author_ids = []
+        for batch in batches:
+            mapping = np.array([author_table.setdefault(name, len(author_table)) for name in batch.authors] + [-1],
+                               dtype=np.int32)
+            author_ids.append(mapping[batch.author_id])
+        
+        # Los índices de texto de cada lote se desplazan tras los del anterior
+        text_ids = []
+        offset = 0
+        for batch in batches:
+            text_ids.append(np.where(batch.text_id >= 0, batch.text_id + offset, -1).astype(np.int32))
+            offset += int(batch.text_id.max()) + 1 if len(batch) else 0
+        keep_texts = all(batch.texts or (batch.text_id < 0).all() for batch in batches)
+        
+        columns = {column: np.concatenate([getattr(batch, column) for batch in batches])
+                   for column in ('score', 'label', 'confidence', 'emotions', 'timestamp')}
+        return cls(**columns, author_id=np.concatenate(author_ids), text_id=np.concatenate(text_ids),
+                   authors=tuple(author_table),
+                   texts=tuple(text for batch in batches for text in batch.texts) if keep_texts else ())
+    
+    def labels(self) -> List[str]:
+        """Etiquetas de texto de cada elemento."""
+        return [SENTIMENT_LABELS[code] for code in self.label]
+    
+    def text(self, index: int) -> Optional[str]:
+        """Texto de un elemento (None si el lote no conserva los textos)."""
+        text_id = self.text_id[index]
+        if text_id < 0:
+            return ''
+        return self.texts[text_id] if self.texts else None
+    
+    def result(self, index: int, text: Optional[str] = None) -> SentimentResult:
+        """Resultado individual de un elemento del lote."""
+        author_id = self.author_id[index]
+        return SentimentResult(
+            text=text if text is not None else self.text(index),
+            sentiment_score=float(self.score[index]),
+            sentiment_label=SENTIMENT_LABELS[self.label[index]],
+            confidence=float(self.confidence[index]),
+            emotions=dict(zip(EMOTION_COLUMNS, self.emotions[index].tolist())),
+            timestamp=_epoch_to_datetime(self.timestamp[index]),
+            author=self.authors[author_id] if author_id >= 0 else None
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialización compacta para JSON: una lista plana por columna, scores
+        con SERIALIZED_DECIMALS decimales y fechas en segundos enteros. Los
+        índices de texto solo se incluyen si el lote conserva los textos.
+        """
+        known = ~np.isnan(self.timestamp)
+        timestamp = np.floor(np.where(known, self.timestamp, 0)).astype(np.int64).tolist()
+        if not known.all():
+            for index in np.flatnonzero(~known).tolist():
+                timestamp[index] = None
+        
+        data = {
+            'labels': list(SENTIMENT_LABELS),
+            'score': _rounded(self.score),
+            'label': self.label.tolist(),
+            'confidence': _rounded(self.confidence),
+            'emotions': {name: _rounded(self.emotions[:, column]) for column, name in enumerate(EMOTION_COLUMNS)},
+            'timestamp': timestamp,
+            'author_id': self.author_id.tolist(),
+            'authors': list(self.authors)
+        }
+        if self.texts:
+            data['text_id'] = self.text_id.tolist()
+            data['texts'] = list(self.texts)
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SentimentBatch':
+        """Reconstruye un lote guardado con to_dict()."""
+        timestamp = np.array([np.nan if value is None else value for value in data['timestamp']], dtype=np.float64)
+        return cls(score=np.array(data['score'], dtype=np.float32),
+                   label=np.array(data['label'], dtype=np.int8),
+                   confidence=np.array(data['confidence'], dtype=np.float32),
+                   emotions=np.column_stack([np.array(data['emotions'][name], dtype=np.float32)
+                                             for name in EMOTION_COLUMNS]).reshape(-1, len(EMOTION_COLUMNS)),
+                   timestamp=timestamp,
+                   author_id=np.array(data['author_id'], dtype=np.int32),
+                   text_id=np.array(data['text_id'], dtype=np.int32) if 'text_id' in data
+                   else np.arange(len(data['score']), dtype=np.int32),
+                   authors=tuple(data['authors']), texts=tuple(data.get('texts', ())))
 
 
 class SentimentAnalyzer:
@@ -36,104 +293,107 @@ class SentimentAnalyzer:
     Analizador de sentimientos para comunicación de equipos de desarrollo.
     """
     
-    def __init__(self, model: str = 'vader'):
+    # Campos de los datos recopilados que usa el análisis (ver
+    # data_collection.models.COLLECTABLE_FIELDS); la fecha y el autor de
+    # cada texto alimentan las tendencias diarias
+    REQUIRED_FIELDS = frozenset({
+        'commit.author',
+        'commit.message',
+        'commit.timestamp',
+        'pull_request.author',
+        'pull_request.title',
+        'pull_request.comments.body',
+        'pull_request.reviews.body',
+    })
+    
+    def __init__(self, model: str = 'vader', workers: int = 1, cache: Optional[SentimentCache] = None,
+                 language: str = 'en', transformer_model: Optional[str] = None,
+                 transformer_gate: float = TRANSFORMER_GATE, keep_texts: bool = False,
+                 dedup: str = 'exact', exclude_bots: bool = False):
         """
         Inicializa el analizador de sentimientos.
         
         Args:
-            model: Modelo a usar ('vader', 'textblob', 'hybrid')
+            model: Modelo a usar ('vader', 'textblob', 'hybrid', 'transformer')
+            workers: Procesos para puntuar los lotes grandes (1 = en el
+                proceso actual, 0 = uno por CPU)
+            cache: Caché de resultados por texto (None = sin caché)
+            language: Idioma(s) cuyos patrones se aplican a todos los textos
+                ('en', 'es', 'en,es' o 'auto'); los de otros idiomas solo se
+                cargan si aparecen textos en ellos
+            transformer_model: Modelo de Hugging Face del modelo 'transformer'
+                (None = DEFAULT_TRANSFORMER_MODEL)
+            transformer_gate: |score VADER| a partir del cual el modelo
+                'transformer' no vuelve a puntuar el texto
+            keep_texts: Conservar los textos en los resultados (por
+                defecto solo se guardan sus scores)
+            dedup: Agrupación de textos antes de puntuarlos (ver DEDUP_MODES);
+                cada grupo se puntúa una vez y su resultado se copia a todos
+            exclude_bots: Omitir los textos de cuentas de bots
         """
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f"Modo de agrupación desconocido: {dedup} (opciones: {', '.join(DEDUP_MODES)})")
+        
+        if model == 'transformer' and not transformers_available():
+            logger.warning("⚠️ torch/transformers no están instalados: se usa el modelo 'vader'")
+            model = 'vader'
+        
         self.model = model
-        self._setup_analyzers()
+        self.transformer_model = transformer_model
+        self.transformer_gate = transformer_gate
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.cache = cache
+        self.language = language
+        self.keep_texts = keep_texts
+        self.dedup = dedup
+        self.exclude_bots = exclude_bots
+        self._stream_results: Optional[Dict[str, Any]] = None
+        
+        # Los modelos se cargan al puntuar el primer texto: crear el
+        # analizador no lee léxicos ni importa TextBlob (y con él NLTK)
+        self._vader: Optional[VaderAnalyzer] = None
         
         # Patrones específicos para comunicación de desarrollo
         self._setup_dev_patterns()
     
-    def _setup_analyzers(self):
-        """Configura los analizadores de sentimiento."""
-        try:
-            # Descargar recursos de NLTK si es necesario
-            try:
-                nltk.data.find('vader_lexicon')
-            except LookupError:
-                nltk.download('vader_lexicon', quiet=True)
-            
-            # Inicializar analizadores
-            self.vader = VaderAnalyzer()
-            self.nltk_analyzer = SentimentIntensityAnalyzer()
-            
-            logger.info(f"✅ Analizador de sentimientos '{self.model}' inicializado")
-            
-        except Exception as e:
-            logger.error(f"❌ Error inicializando analizadores: {e}")
-            raise
+        logger.info(f"✅ Analizador de sentimientos '{self.model}' inicializado")
+    
+    @property
+    def vader(self) -> VaderAnalyzer:
+        """Analizador VADER, compartido por todos los analizadores del proceso."""
+        if self._vader is None:
+            self._vader = get_vader_analyzer()
+        return self._vader
+    
+    @vader.setter
+    def vader(self, analyzer: VaderAnalyzer):
+        self._vader = analyzer
+    
+    @property
+    def model_id(self) -> str:
+        """Identificador del modelo y su configuración, para las claves de la caché."""
+        if self.model == 'transformer':
+            return f"transformer:{self.transformer_model or 'default'}:{self.transformer_gate}"
+        return self.model
+    
+    def warm_up(self):
+        """Carga ahora los modelos que se cargarían al puntuar el primer texto."""
+        self.vader
+        if self.model == 'transformer':
+            get_transformer_model(self.transformer_model)
     
     def _setup_dev_patterns(self):
-        """Configura patrones específicos para comunicación de desarrollo."""
-        
-        # Palabras/frases que indican sentimientos positivos en desarrollo (INGLÉS)
-        self.positive_dev_patterns = [
-            r'good\s+(?:job|work|catch|point)',
-            r'nice\s+(?:work|job|fix|solution)',
-            r'(?:well|great)\s+done',
-            r'(?:looks|sounds)\s+good',
-            r'thanks?\s+for',
-            r'appreciate\s+(?:it|this|the)',
-            r'clever\s+(?:solution|fix|approach)',
-            r'clean\s+(?:code|implementation)',
-            r'excellent\s+(?:work|job|solution)'
-        ]
-        
-        # Palabras/frases positivas en ESPAÑOL
-        self.positive_spanish_patterns = [
-            r'(?:muy\s+)?(?:buen|excelente)\s+(?:trabajo|trabajo)',
-            r'me\s+gusta\s+(?:esta|la)\s+solución',
-            r'(?:está|quedó)\s+(?:muy\s+)?(?:bien|genial|perfecto)',
-            r'gracias\s+por\s+(?:el|la|esto)',
-            r'(?:muy\s+)?buena\s+(?:idea|propuesta|solución)',
-            r'funciona\s+(?:muy\s+)?(?:bien|perfecto)',
-            r'código\s+(?:muy\s+)?(?:limpio|claro)',
-            r'(?:me\s+)?encanta\s+(?:este|esta|el|la)'
-        ]
-        
-        # Palabras/frases que indican sentimientos negativos en desarrollo (INGLÉS)
-        self.negative_dev_patterns = [
-            r'(?:this\s+is\s+)?(?:terrible|awful|horrible)',
-            r'what\s+(?:the\s+hell|were\s+you\s+thinking)',
-            r'(?:this\s+)?(?:doesn\'?t\s+)?(?:work|make\s+sense)',
-            r'(?:completely\s+)?(?:wrong|broken|buggy)',
-            r'(?:waste\s+of\s+time|pointless)',
-            r'(?:stupid|dumb|ridiculous)\s+(?:mistake|error|approach)',
-            r'(?:why\s+would\s+you|how\s+could\s+you)',
-            r'(?:sloppy|messy)\s+code'
-        ]
-        
-        # Palabras/frases negativas en ESPAÑOL
-        self.negative_spanish_patterns = [
-            r'(?:está|esto)\s+(?:muy\s+)?(?:mal|terrible|horrible)',
-            r'no\s+(?:me\s+gusta\s+)?(?:funciona|sirve)',
-            r'(?:muy\s+)?(?:malo|feo|horrible)\s+(?:código|enfoque)',
-            r'(?:qué\s+)?(?:desastre|porquería)',
-            r'no\s+(?:tiene\s+)?sentido',
-            r'(?:está|es)\s+(?:roto|bugueado)',
-            r'(?:muy\s+)?(?:confuso|complicado|enredado)',
-            r'(?:pérdida\s+de\s+tiempo|inútil)'
-        ]
-        
-        # Palabras que indican frustración técnica
-        self.frustration_patterns = [
-            r'(?:still\s+)?(?:not\s+working|broken)',
-            r'(?:keeps?\s+)?(?:failing|crashing)',
-            r'(?:can\'?t\s+)?(?:figure\s+out|understand)',
-            r'(?:this\s+is\s+)?(?:confusing|unclear)',
-            r'(?:urgent|critical)\s+(?:fix|bug)',
-            r'(?:blocking|blocked\s+by)'
-        ]
-        
-        # Compilar patrones para mejor rendimiento
-        self.positive_regex = [re.compile(pattern, re.IGNORECASE) for pattern in self.positive_dev_patterns]
-        self.negative_regex = [re.compile(pattern, re.IGNORECASE) for pattern in self.negative_dev_patterns]
-        self.frustration_regex = [re.compile(pattern, re.IGNORECASE) for pattern in self.frustration_patterns]
+        """
+        Configura los patrones específicos para comunicación de desarrollo.
+        
+        Los patrones viven en paquetes por idioma (analysis/pattern_packs/)
+        y se compilan la primera vez que aparece un texto en ese idioma.
+        """
+        self.default_languages = frozenset(parse_languages(self.language))
+        
+        # Huella de los paquetes para las claves de la caché de resultados
+        self.patterns_version = (f"{PATTERN_SET_VERSION}-{patterns_fingerprint()}-"
+                                 f"{','.join(sorted(self.default_languages))}")
     
     def analyze(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -145,6 +405,33 @@ class SentimentAnalyzer:
         Returns:
             Resultados del análisis de sentimientos
         """
+        return self.analyze_stream(iter_activity(raw_data))
+    
+    def analyze_stream(self, activity: Iterable[Tuple[str, Any]],
+                       trends: Optional[SentimentTrends] = None) -> Dict[str, Any]:
+        """
+        Analiza el sentimiento de un flujo de actividad a medida que llega.
+        
+        Args:
+            activity: Tuplas (tipo, dato) del recopilador
+            trends: Agregados diarios de ejecuciones anteriores (ver start_stream)
+            
+        Returns:
+            Resultados del análisis de sentimientos
+        """
+        self.start_stream(trends)
+        for kind, item in activity:
+            self.consume(kind, item)
+        return self.finish_stream()
+    
+    def start_stream(self, trends: Optional[SentimentTrends] = None):
+        """
+        Prepara un nuevo análisis incremental.
+        
+        Args:
+            trends: Agregados de ejecuciones anteriores a los que sumar la
+                actividad nueva (solo debe pasarse actividad no analizada)
+        """
         logger.info("🧠 Iniciando análisis de sentimientos...")
         
         # 🚨 ADVERTENCIA SOBRE LIMITACIONES NLP
@@ -155,19 +442,59 @@ class SentimentAnalyzer:
         logger.warning("   - Contexto específico del equipo no considerado")
         logger.warning("   📋 Usar como herramienta de apoyo, no decisión final")
         
+        # Textos pendientes de puntuar (con fecha y autor), lotes ya puntuados
+        # de cada grupo y agregados diarios, que se actualizan con cada lote
+        self._stream_results = {
+            'pending': {group: [] for group in TEXT_CONTEXTS},
+            'batches': {group: [] for group in TEXT_CONTEXTS},
+            'trends': trends if trends is not None else SentimentTrends(),
+            'excluded_bot_texts': 0
+        }
+    
+    def consume(self, kind: str, item: Any):
+        """
+        Añade los textos de un elemento del flujo de actividad.
+        
+        Los textos se puntúan en lotes de STREAM_BATCH_SIZE; el commit o PR
+        original puede liberarse en cuanto se procesa.
+        """
+        if self._stream_results is None:
+            self.start_stream()
+        
+        if kind == COMMIT:
+            self._add_stream_text('commits', self._commit_message(item), *self._commit_metadata(item))
+        elif kind == PULL_REQUEST:
+            for group, text, timestamp, author in self._pull_request_texts(item):
+                self._add_stream_text(group, text, timestamp, author)
+    
+    def finish_stream(self) -> Dict[str, Any]:
+        """Calcula las métricas finales del análisis incremental."""
+        if self._stream_results is None:
+            self.start_stream()
+        
+        state, self._stream_results = self._stream_results, None
+        
+        for group in TEXT_CONTEXTS:
+            self._flush_stream_texts(state, group)
+        
+        batches = {group: SentimentBatch.concatenate(state['batches'][group]) for group in TEXT_CONTEXTS}
+        
         results = {
-            'commit_sentiments': self._analyze_commits(raw_data.get('commits', [])),
-            'pr_sentiments': self._analyze_pull_requests(raw_data.get('pull_requests', [])),
-            'overall_metrics': {},
-            'sentiment_trends': {},
-            'communication_patterns': {}
+            'commit_sentiments': batches['commits'],
+            'pr_sentiments': {
+                'titles': batches['titles'],
+                'comments': batches['comments'],
+                'reviews': batches['reviews']
+            }
         }
         
         # Calcular métricas generales
         results['overall_metrics'] = self._calculate_overall_metrics(results)
         
+        results['excluded_bot_texts'] = state['excluded_bot_texts']
+        
         # Analizar tendencias temporales
-        results['sentiment_trends'] = self._analyze_sentiment_trends(results)
+        results['sentiment_trends'] = self._analyze_sentiment_trends(state['trends'])
         
         # Analizar patrones de comunicación
         results['communication_patterns'] = self._analyze_communication_patterns(results)
@@ -175,6 +502,27 @@ class SentimentAnalyzer:
         logger.info("✅ Análisis de sentimientos completado")
         return results
     
+    def _add_stream_text(self, group: str, text: str, timestamp: Any = None, author: Optional[str] = None):
+        """Acumula un texto y puntúa el grupo cuando se completa un lote."""
+        if self.exclude_bots and is_bot(author):
+            self._stream_results['excluded_bot_texts'] += 1
+            return
+        
+        pending = self._stream_results['pending'][group]
+        pending.append((text, timestamp, author))
+        
+        if len(pending) >= STREAM_BATCH_SIZE * self.workers:
+            self._flush_stream_texts(self._stream_results, group)
+    
+    def _flush_stream_texts(self, state: Dict[str, Any], group: str):
+        """Puntúa los textos pendientes de un grupo."""
+        pending = state['pending'][group]
+        if pending:
+            batch = self._analyze_items(pending, TEXT_CONTEXTS[group])
+            state['batches'][group].append(batch)
+            state['trends'].add(batch.timestamp, batch.score)
+            state['pending'][group] = []
+    
     def analyze_sentiment(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Método alias para analyze() para compatibilidad con la API.
@@ -187,56 +535,72 @@ class SentimentAnalyzer:
         """
         return self.analyze(raw_data)
     
-    def _analyze_commits(self, commits: List[Any]) -> List[SentimentResult]:
+    def analyze_sentiment_patterns(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Método alias para analyze() usado por el orquestador principal."""
+        return self.analyze(raw_data)
+    
+    def _analyze_commits(self, commits: List[Any]) -> SentimentBatch:
         """Analiza el sentimiento en mensajes de commit."""
-        commit_sentiments = []
-        
-        for commit in commits:
-            if hasattr(commit, 'message'):
-                message = commit.message
-            else:
-                message = commit.get('message', '')
-            
-            sentiment = self._analyze_text(message, context='commit')
-            commit_sentiments.append(sentiment)
-        
-        return commit_sentiments
+        return self._analyze_items([(self._commit_message(commit), *self._commit_metadata(commit))
+                                    for commit in commits], TEXT_CONTEXTS['commits'])
+    
+    def _commit_message(self, commit: Any) -> str:
+        """Mensaje de un commit (dataclass o diccionario)."""
+        if hasattr(commit, 'message'):
+            return commit.message
+        return commit.get('message', '')
     
-    def _analyze_pull_requests(self, pull_requests: List[Any]) -> Dict[str, List[SentimentResult]]:
+    def _commit_metadata(self, commit: Any) -> Tuple[Any, Optional[str]]:
+        """Fecha y autor de un commit (dataclass o diccionario)."""
+        if hasattr(commit, 'timestamp'):
+            return commit.timestamp, commit.author
+        return commit.get('timestamp'), commit.get('author')
+    
+    def _analyze_pull_requests(self, pull_requests: List[Any]) -> Dict[str, SentimentBatch]:
         """Analiza el sentimiento en pull requests y sus comentarios."""
-        pr_sentiments = {
-            'titles': [],
-            'comments': [],
-            'reviews': []
-        }
+        items: Dict[str, List[Tuple[str, Any, Optional[str]]]] = {'titles': [], 'comments': [], 'reviews': []}
         
         for pr in pull_requests:
-            # Analizar título del PR
-            if hasattr(pr, 'title'):
-                title = pr.title
-            else:
-                title = pr.get('title', '')
-            
-            title_sentiment = self._analyze_text(title, context='pr_title')
-            pr_sentiments['titles'].append(title_sentiment)
-            
-            # Analizar comentarios
-            comments = pr.comments if hasattr(pr, 'comments') else pr.get('comments', [])
-            for comment in comments:
-                comment_text = comment.get('body', '')
-                if comment_text:
-                    comment_sentiment = self._analyze_text(comment_text, context='comment')
-                    pr_sentiments['comments'].append(comment_sentiment)
-            
-            # Analizar reviews
-            reviews = pr.reviews if hasattr(pr, 'reviews') else pr.get('reviews', [])
-            for review in reviews:
-                review_text = review.get('body', '')
-                if review_text:
-                    review_sentiment = self._analyze_text(review_text, context='review')
-                    pr_sentiments['reviews'].append(review_sentiment)
+            for group, text, timestamp, author in self._pull_request_texts(pr):
+                items[group].append((text, timestamp, author))
+        
+        return {group: self._analyze_items(group_items, TEXT_CONTEXTS[group])
+                for group, group_items in items.items()}
+    
+    def _analyze_items(self, items: List[Tuple[str, Any, Optional[str]]], context: str) -> SentimentBatch:
+        """Analiza tuplas (texto, fecha, autor) de un mismo contexto."""
+        if self.exclude_bots:
+            items = [item for item in items if not is_bot(item[2])]
+        if not items:
+            return SentimentBatch.empty()
+        texts, timestamps, authors = zip(*items)
+        return self.analyze_batch(texts, context, timestamps, authors)
+    
+    def _pull_request_texts(self, pr: Any) -> Iterator[Tuple[str, str, Any, Optional[str]]]:
+        """
+        Textos de un PR a analizar: el título siempre y los comentarios y
+        reviews que tienen texto.
+        
+        Yields:
+            Tuplas (grupo, texto, fecha, autor) con grupo 'titles', 'comments'
+            o 'reviews'
+        """
+        if hasattr(pr, 'title'):
+            yield 'titles', pr.title, pr.created_at, pr.author
+        else:
+            yield 'titles', pr.get('title', ''), pr.get('created_at'), pr.get('author')
+        
+        comments = pr.comments if hasattr(pr, 'comments') else pr.get('comments', [])
+        for comment in comments:
+            comment_text = comment.get('body', '')
+            if comment_text:
+                yield 'comments', comment_text, comment.get('created_at'), comment.get('author')
         
-        return pr_sentiments
+        reviews = pr.reviews if hasattr(pr, 'reviews') else pr.get('reviews', [])
+        for review in reviews:
+            review_text = review.get('body', '')
+            if review_text:
+                yield 'reviews', review_text, review.get('submitted_at'), review.get('author')
     
     def _analyze_text(self, text: str, context: str = 'general') -> SentimentResult:
         """
@@ -258,172 +622,320 @@ class SentimentAnalyzer:
                 emotions={}
             )
         
-        # Limpiar texto
-        cleaned_text = self._clean_text(text)
+        return self.analyze_batch([text], [context]).result(0, text)
+    
+    def analyze_batch(self, texts: Sequence[str], contexts: Any = None,
+                      timestamps: Optional[Sequence[Any]] = None,
+                      authors: Optional[Sequence[Optional[str]]] = None) -> SentimentBatch:
+        """
+        Analiza el sentimiento de muchos textos a la vez.
         
-        # Analizar con diferentes métodos según el modelo
-        if self.model == 'vader':
-            score, confidence, emotions = self._analyze_with_vader(cleaned_text, context)
-        elif self.model == 'textblob':
-            score, confidence, emotions = self._analyze_with_textblob(cleaned_text, context)
-        else:  # hybrid
-            score, confidence, emotions = self._analyze_hybrid(cleaned_text, context)
+        Cada texto distinto se limpia y puntúa una sola vez (mensajes como
+        "LGTM" se repiten mucho) y los ajustes, límites, confianza y
+        etiquetas se calculan sobre arrays completos. Con caché solo se
+        puntúan los textos que no se han visto antes; con workers > 1 se
+        reparten entre procesos y el resultado conserva el orden.
         
-        # Determinar etiqueta
-        label = self._get_sentiment_label(score)
+        Args:
+            texts: Textos a analizar
+            contexts: Contexto de cada texto, o uno común para todos
+                ('commit', 'comment', 'review', etc.)
+            timestamps: Fecha de cada texto (datetime, ISO 8601 o None)
+            authors: Autor de cada texto
+            
+        Returns:
+            Resultados en columnas, en el mismo orden que los textos
+        """
+        count = len(texts)
+        if contexts is not None and not isinstance(contexts, str) and len(contexts) != count:
+            raise ValueError(f"Se esperaban {count} contextos, se recibieron {len(contexts)}")
+        for name, values in (('fechas', timestamps), ('autores', authors)):
+            if values is not None and len(values) != count:
+                raise ValueError(f"Se esperaban {count} {name}, se recibieron {len(values)}")
         
-        return SentimentResult(
-            text=text,
-            sentiment_score=score,
-            sentiment_label=label,
-            confidence=confidence,
-            emotions=emotions
-        )
+        # Posición de cada texto en la lista de textos limpios únicos y en la
+        # de textos originales distintos (-1 = vacío); los textos repetidos
+        # tal cual o con la misma forma canónica no se vuelven a limpiar
+        unique_texts: Dict[str, int] = {}
+        canonical_texts: List[str] = []
+        canonical_positions: Dict[Union[str, Tuple[str, Tuple[float, int, int]]], int] = {}
+        raw_texts: Dict[str, Tuple[int, int]] = {}
+        positions = np.full(count, -1, dtype=np.int64)
+        text_id = np.full(count, -1, dtype=np.int32)
+        for index, text in enumerate(texts):
+            if text and text.strip():
+                known = raw_texts.get(text)
+                if known is None:
+                    canonical, cleaned = text, None
+                    group_key: Union[str, Tuple[str, Tuple[float, int, int]]] = text
+                    if self.dedup != 'off':
+                        canonical = group_key = canonicalize(text, _vader_sentiment_words())
+                        if canonical != ' '.join(text.split()):
+                            # Con valores sustituidos, solo se agrupan textos con
+                            # el mismo ajuste de patrones y las mismas palabras
+                            # para VADER (número y mayúsculas)
+                            cleaned = self._clean_text(text)
+                            group_key = (canonical, self._substitution_key(cleaned))
+                    position = canonical_positions.get(group_key)
+                    if position is None:
+                        cleaned = cleaned if cleaned is not None else self._clean_text(text)
+                        position = unique_texts.setdefault(cleaned, len(unique_texts))
+                        canonical_positions[group_key] = position
+                        if position == len(canonical_texts):
+                            canonical_texts.append(canonical)
+                    known = (position, len(raw_texts))
+                    raw_texts[text] = known
+                positions[index], text_id[index] = known
+        
+        unique_score, unique_confidence, unique_emotions = self._score_unique_texts(
+            list(unique_texts), canonical_texts)
+        
+        # Los textos vacíos quedan neutrales con confianza 0
+        scored = positions >= 0
+        score = np.zeros(count)
+        confidence = np.zeros(count)
+        emotions = np.zeros((count, 3))
+        score[scored] = unique_score[positions[scored]]
+        confidence[scored] = unique_confidence[positions[scored]]
+        emotions[scored] = unique_emotions[positions[scored]]
+        
+        timestamp = None
+        if timestamps is not None:
+            timestamp = np.fromiter((to_epoch_seconds(value) for value in timestamps), dtype=np.float64, count=count)
+        
+        # Cada autor distinto se guarda una vez en la tabla del lote
+        author_id = None
+        author_table: Dict[str, int] = {}
+        if authors is not None:
+            author_id = np.fromiter((-1 if name is None else author_table.setdefault(name, len(author_table))
+                                     for name in authors), dtype=np.int32, count=count)
+        
+        return SentimentBatch.from_scores(score, confidence, emotions, timestamp,
+                                          author_id, tuple(author_table),
+                                          text_id, tuple(raw_texts) if self.keep_texts else ())
     
-    def _clean_text(self, text: str) -> str:
-        """Limpia y normaliza el texto para análisis."""
-        # Remover URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    def _substitution_key(self, cleaned: str) -> Tuple[float, int, int]:
+        """
+        Lo que debe coincidir entre textos con la misma forma canónica para
+        que su score sea el mismo: el ajuste de los patrones de desarrollo
+        (que pueden coincidir con palabras de una rama o un número), el
+        número de palabras (proporciones de emociones y distancias de las
+        negaciones) y el de palabras en mayúsculas (énfasis de VADER).
+        """
+        words = cleaned.split()
+        return self._get_dev_pattern_adjustment(cleaned), len(words), sum(word.isupper() for word in words)
+    
+    def _score_unique_texts(self, texts: List[str],
+                            canonical_texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Puntúa textos limpios únicos; con dedup='near' solo se puntúa el
+        primer texto de cada grupo de casi duplicados.
         
-        # Remover menciones de usuarios
-        text = re.sub(r'@\w+', '', text)
+        Args:
+            texts: Textos limpios únicos
+            canonical_texts: Forma canónica del texto original de cada uno
         
-        # Remover caracteres especiales excesivos
-        text = re.sub(r'[^\w\s\.,!?\-\(\)]', ' ', text)
+        Returns:
+            Las mismas columnas que _score_texts, en el orden de los textos
+        """
+        if self.dedup != 'near' or len(texts) < 2:
+            return self._score_cleaned_texts(texts)
         
-        # Normalizar espacios
-        text = re.sub(r'\s+', ' ', text).strip()
+        representatives = find_near_duplicates(canonical_texts, sentiment_words=_vader_sentiment_words())
         
-        return text
+        # Los patrones de desarrollo también deben dar el mismo ajuste
+        for index in np.flatnonzero(representatives != np.arange(len(texts))).tolist():
+            leader = representatives[index]
+            if self._get_dev_pattern_adjustment(texts[index]) != self._get_dev_pattern_adjustment(texts[leader]):
+                representatives[index] = index
+        
+        leaders, group = np.unique(representatives, return_inverse=True)
+        score, confidence, emotions = self._score_cleaned_texts([texts[index] for index in leaders.tolist()])
+        return score[group], confidence[group], emotions[group]
     
-    def _analyze_with_vader(self, text: str, context: str) -> Tuple[float, float, Dict[str, float]]:
-        """Analiza texto usando VADER."""
-        scores = self.vader.polarity_scores(text)
+    def _score_cleaned_texts(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Puntúa textos limpios únicos, reutilizando los resultados en caché.
         
-        # VADER devuelve compound score (-1 a 1)
-        sentiment_score = scores['compound']
+        Returns:
+            Las mismas columnas que _score_texts, en el orden de los textos
+        """
+        if self.cache is None:
+            return self._score_uncached(texts)
         
-        # Ajustar score basado en patrones específicos de desarrollo
-        adjustment = self._get_dev_pattern_adjustment(text)
-        sentiment_score = max(-1.0, min(1.0, sentiment_score + adjustment))
+        keys = [SentimentCache.make_key(text, self.model_id, self.patterns_version) for text in texts]
+        cached = self.cache.get_many(keys)
         
-        # Calcular confianza basada en intensidad
-        confidence = abs(sentiment_score)
+        # Columnas: score, confianza y emociones positive/negative/neutral
+        columns = np.zeros((len(texts), 5))
+        missing = []
+        for index, key in enumerate(keys):
+            scores = cached.get(key)
+            if scores is None:
+                missing.append(index)
+            else:
+                columns[index] = scores
         
-        # Emociones básicas de VADER
-        emotions = {
-            'positive': scores['pos'],
-            'negative': scores['neg'],
-            'neutral': scores['neu']
-        }
+        if missing:
+            score, confidence, emotions = self._score_uncached([texts[index] for index in missing])
+            new_columns = np.column_stack([score, confidence, emotions])
+            columns[missing] = new_columns
+            self.cache.put_many({keys[index]: tuple(row)
+                                 for index, row in zip(missing, new_columns.tolist())})
         
-        return sentiment_score, confidence, emotions
+        return columns[:, 0], columns[:, 1], columns[:, 2:]
+    
+    def _score_uncached(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Puntúa textos limpios en el proceso actual o en el pool de procesos."""
+        if self.workers > 1 and len(texts) >= PARALLEL_MIN_TEXTS:
+            return self._score_in_processes(texts)
+        return self._score_texts(texts)
     
-    def _analyze_with_textblob(self, text: str, context: str) -> Tuple[float, float, Dict[str, float]]:
-        """Analiza texto usando TextBlob."""
-        blob = TextBlob(text)
+    def _score_in_processes(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Reparte la puntuación de los textos limpios entre el pool de procesos.
         
-        # TextBlob devuelve polarity (-1 a 1) y subjectivity (0 a 1)
-        sentiment_score = blob.sentiment.polarity
-        subjectivity = blob.sentiment.subjectivity
+        Returns:
+            Las mismas columnas que _score_texts, en el orden de los textos
+        """
+        chunk_size = math.ceil(len(texts) / (self.workers * CHUNKS_PER_WORKER))
+        chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
         
-        # Ajustar score basado en patrones específicos de desarrollo
-        adjustment = self._get_dev_pattern_adjustment(text)
-        sentiment_score = max(-1.0, min(1.0, sentiment_score + adjustment))
+        pool = get_shared_process_pool(self.workers, model=self.model, language=self.language,
+                                       transformer_model=self.transformer_model,
+                                       transformer_gate=self.transformer_gate)
+        scores, confidences, emotions = zip(*pool.map(_score_chunk_in_worker, chunks))
         
-        # Usar subjectividad como indicador de confianza
-        confidence = subjectivity
+        return np.concatenate(scores), np.concatenate(confidences), np.concatenate(emotions)
+    
+    def _score_texts(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Puntúa textos ya limpios con el modelo configurado.
         
-        # Emociones simuladas para TextBlob
-        emotions = {
-            'positive': max(0, sentiment_score),
-            'negative': max(0, -sentiment_score),
-            'neutral': 1 - abs(sentiment_score)
-        }
+        Returns:
+            Tupla (scores, confianzas, matriz de emociones positive/negative/neutral)
+        """
+        count = len(texts)
+        adjustments = np.fromiter((self._get_dev_pattern_adjustment(text) for text in texts),
+                                  dtype=np.float64, count=count)
+        
+        if self.model in ('vader', 'hybrid', 'transformer'):
+            # VADER devuelve compound score (-1 a 1) y proporciones pos/neg/neu
+            vader = np.zeros((count, 4))
+            for index, text in enumerate(texts):
+                scores = self.vader.polarity_scores(text)
+                vader[index] = (scores['compound'], scores['pos'], scores['neg'], scores['neu'])
+            
+            # Ajustar score basado en patrones específicos de desarrollo
+            vader_score = np.clip(vader[:, 0] + adjustments, -1.0, 1.0)
+            vader_emotions = vader[:, 1:]
+        
+        if self.model in ('textblob', 'hybrid'):
+            # Importación diferida: TextBlob importa NLTK, que tarda segundos
+            from textblob import TextBlob
+            
+            # TextBlob devuelve polarity (-1 a 1) y subjectivity (0 a 1)
+            textblob = np.zeros((count, 2))
+            for index, text in enumerate(texts):
+                sentiment = TextBlob(text).sentiment
+                textblob[index] = (sentiment.polarity, sentiment.subjectivity)
+            
+            textblob_score = np.clip(textblob[:, 0] + adjustments, -1.0, 1.0)
+            subjectivity = textblob[:, 1]
+            
+            # Emociones simuladas para TextBlob
+            textblob_emotions = np.column_stack([
+                np.maximum(0, textblob_score),
+                np.maximum(0, -textblob_score),
+                1 - np.abs(textblob_score)
+            ])
+        
+        if self.model == 'vader':
+            # Calcular confianza basada en intensidad
+            return vader_score, np.abs(vader_score), vader_emotions
+        
+        if self.model == 'transformer':
+            return self._refine_with_transformer(texts, vader_score, vader_emotions, adjustments)
+        
+        if self.model == 'textblob':
+            # Usar subjetividad como indicador de confianza
+            return textblob_score, subjectivity, textblob_emotions
+        
+        # Híbrido: promedio ponderado (VADER es mejor para texto informal)
+        # y la confianza más alta de ambos
+        score = (vader_score * 0.7) + (textblob_score * 0.3)
+        confidence = np.maximum(np.abs(vader_score), subjectivity)
+        emotions = (vader_emotions + textblob_emotions) / 2
         
-        return sentiment_score, confidence, emotions
+        return score, confidence, emotions
     
-    def _analyze_hybrid(self, text: str, context: str) -> Tuple[float, float, Dict[str, float]]:
-        """Analiza texto usando un enfoque híbrido."""
-        # Combinar VADER y TextBlob
-        vader_score, _, vader_emotions = self._analyze_with_vader(text, context)
-        textblob_score, textblob_confidence, textblob_emotions = self._analyze_with_textblob(text, context)
+    def _refine_with_transformer(self, texts: List[str], score: np.ndarray, emotions: np.ndarray,
+                                 adjustments: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vuelve a puntuar con el modelo transformer los textos en los que VADER duda.
         
-        # Promedio ponderado (VADER es mejor para texto informal)
-        sentiment_score = (vader_score * 0.7) + (textblob_score * 0.3)
+        VADER actúa como filtro: los textos con |score| >= transformer_gate
+        conservan su resultado y solo los ambiguos pasan por el modelo caro.
         
-        # Usar la confianza más alta
-        confidence = max(abs(vader_score), textblob_confidence)
+        Returns:
+            Las mismas columnas que _score_texts
+        """
+        confidence = np.abs(score)
+        ambiguous = np.flatnonzero(confidence < self.transformer_gate)
+        if not len(ambiguous):
+            return score, confidence, emotions
         
-        # Combinar emociones
-        emotions = {
-            'positive': (vader_emotions['positive'] + textblob_emotions['positive']) / 2,
-            'negative': (vader_emotions['negative'] + textblob_emotions['negative']) / 2,
-            'neutral': (vader_emotions['neutral'] + textblob_emotions['neutral']) / 2
-        }
+        # Probabilidades negative/neutral/positive de los textos ambiguos
+        probabilities = get_transformer_model(self.transformer_model).predict([texts[i] for i in ambiguous])
+        negative, neutral, positive = probabilities.T
         
-        return sentiment_score, confidence, emotions
+        score[ambiguous] = np.clip(positive - negative + adjustments[ambiguous], -1.0, 1.0)
+        confidence[ambiguous] = probabilities.max(axis=1)
+        emotions[ambiguous] = np.column_stack([positive, negative, neutral])
+        
+        logger.debug(f"🤖 {len(ambiguous)} de {len(texts)} textos puntuados con el modelo transformer")
+        return score, confidence, emotions
+    
+    def _clean_text(self, text: str) -> str:
+        """Limpia y normaliza el texto para análisis."""
+        # Remover URLs
+        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+        
+        # Remover menciones de usuarios
+        text = re.sub(r'@\w+', '', text)
+        
+        # Remover caracteres especiales excesivos
+        text = re.sub(r'[^\w\s\.,!?\-\(\)]', ' ', text)
+        
+        # Normalizar espacios
+        text = re.sub(r'\s+', ' ', text).strip()
+        
+        return text
     
     def _get_dev_pattern_adjustment(self, text: str) -> float:
-        """Ajusta el score basado en patrones específicos de desarrollo."""
-        adjustment = 0.0
-        text_lower = text.lower()
-        
-        # Buscar patrones positivos en INGLÉS
-        positive_matches = sum(1 for pattern in self.positive_regex if pattern.search(text))
-        if positive_matches > 0:
-            adjustment += 0.2 * positive_matches
-        
-        # Buscar patrones positivos en ESPAÑOL
-        spanish_positive_matches = 0
-        for pattern_str in self.positive_spanish_patterns:
-            if re.search(pattern_str, text_lower, re.IGNORECASE):
-                spanish_positive_matches += 1
-        if spanish_positive_matches > 0:
-            adjustment += 0.2 * spanish_positive_matches
-        
-        # Buscar patrones negativos en INGLÉS
-        negative_matches = sum(1 for pattern in self.negative_regex if pattern.search(text))
-        if negative_matches > 0:
-            adjustment -= 0.3 * negative_matches
-        
-        # Buscar patrones negativos en ESPAÑOL
-        spanish_negative_matches = 0
-        for pattern_str in self.negative_spanish_patterns:
-            if re.search(pattern_str, text_lower, re.IGNORECASE):
-                spanish_negative_matches += 1
-        if spanish_negative_matches > 0:
-            adjustment -= 0.3 * spanish_negative_matches
-        
-        # Buscar patrones de frustración (menos severo que negativo)
-        frustration_matches = sum(1 for pattern in self.frustration_regex if pattern.search(text))
-        if frustration_matches > 0:
-            adjustment -= 0.1 * frustration_matches
-        
-        return max(-0.5, min(0.5, adjustment))
-    
-    def _get_sentiment_label(self, score: float) -> str:
-        """Convierte score numérico a etiqueta de sentimiento."""
-        if score >= 0.1:
-            return 'positive'
-        elif score <= -0.1:
-            return 'negative'
-        else:
-            return 'neutral'
+        """
+        Ajusta el score basado en patrones específicos de desarrollo.
+        
+        Se aplican los patrones de los idiomas por defecto y de los otros
+        idiomas identificados en el texto.
+        """
+        detected = detect_languages(text, skip=self.default_languages)
+        languages = self.default_languages | detected if detected else self.default_languages
+        return get_pattern_matcher(languages).adjustment(text)
     
     def _calculate_overall_metrics(self, sentiment_results: Dict[str, Any]) -> Dict[str, float]:
         """Calcula métricas generales de sentimiento."""
-        all_sentiments = []
-        
-        # Recopilar todos los sentimientos
-        all_sentiments.extend(sentiment_results['commit_sentiments'])
-        
         pr_sentiments = sentiment_results['pr_sentiments']
-        all_sentiments.extend(pr_sentiments['titles'])
-        all_sentiments.extend(pr_sentiments['comments'])
-        all_sentiments.extend(pr_sentiments['reviews'])
         
-        if not all_sentiments:
+        # Unir las columnas de todos los textos analizados
+        all_sentiments = SentimentBatch.concatenate([
+            sentiment_results['commit_sentiments'],
+            pr_sentiments['titles'],
+            pr_sentiments['comments'],
+            pr_sentiments['reviews']
+        ])
+        
+        if not len(all_sentiments):
             return {
                 'overall_sentiment_score': 0.0,
                 'positive_ratio': 0.0,
@@ -433,39 +945,37 @@ class SentimentAnalyzer:
             }
         
         # Calcular métricas
-        scores = [s.sentiment_score for s in all_sentiments]
-        labels = [s.sentiment_label for s in all_sentiments]
-        confidences = [s.confidence for s in all_sentiments]
+        label_ratios = np.bincount(all_sentiments.label, minlength=len(SENTIMENT_LABELS)) / len(all_sentiments)
         
         return {
-            'overall_sentiment_score': sum(scores) / len(scores),
-            'positive_ratio': labels.count('positive') / len(labels),
-            'negative_ratio': labels.count('negative') / len(labels),
-            'neutral_ratio': labels.count('neutral') / len(labels),
-            'average_confidence': sum(confidences) / len(confidences)
+            'overall_sentiment_score': float(all_sentiments.score.mean()),
+            'positive_ratio': float(label_ratios[POSITIVE]),
+            'negative_ratio': float(label_ratios[NEGATIVE]),
+            'neutral_ratio': float(label_ratios[NEUTRAL]),
+            'average_confidence': float(all_sentiments.confidence.mean())
         }
     
-    def _analyze_sentiment_trends(self, sentiment_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Analiza tendencias temporales de sentimiento."""
-        # TODO: Implementar análisis de tendencias temporales
-        # Esto requeriría agrupar sentimientos por fecha y analizar cambios
-        return {
-            'trend_direction': 'stable',  # 'improving', 'declining', 'stable'
-            'trend_strength': 0.0,
-            'recent_change': 0.0
-        }
+    def _analyze_sentiment_trends(self, trends: SentimentTrends) -> Dict[str, Any]:
+        """
+        Analiza tendencias temporales de sentimiento a partir de los agregados
+        diarios, sin recorrer los resultados.
+        """
+        analysis = trends.summary()  # 'improving', 'declining' o 'stable'
+        analysis['weekly'] = trends.weekly()
+        analysis['daily_aggregates'] = trends.to_dict()
+        return analysis
     
     def _analyze_communication_patterns(self, sentiment_results: Dict[str, Any]) -> Dict[str, Any]:
         """Analiza patrones de comunicación del equipo."""
-        pr_sentiments = sentiment_results['pr_sentiments']
+        pr_sentiments: Dict[str, SentimentBatch] = sentiment_results['pr_sentiments']
         
         # Analizar comentarios vs reviews
-        comment_scores = [s.sentiment_score for s in pr_sentiments['comments']]
-        review_scores = [s.sentiment_score for s in pr_sentiments['reviews']]
+        comment_scores = pr_sentiments['comments'].score
+        review_scores = pr_sentiments['reviews'].score
         
-        patterns = {
-            'comment_sentiment_avg': sum(comment_scores) / len(comment_scores) if comment_scores else 0.0,
-            'review_sentiment_avg': sum(review_scores) / len(review_scores) if review_scores else 0.0,
+        patterns: Dict[str, Any] = {
+            'comment_sentiment_avg': float(comment_scores.mean()) if len(comment_scores) else 0.0,
+            'review_sentiment_avg': float(review_scores.mean()) if len(review_scores) else 0.0,
             'communication_balance': 'balanced'  # 'positive_heavy', 'negative_heavy', 'balanced'
         }
         
@@ -475,4 +985,85 @@ class SentimentAnalyzer:
         elif patterns['comment_sentiment_avg'] < -0.2 or patterns['review_sentiment_avg'] < -0.2:
             patterns['communication_balance'] = 'negative_heavy'
         
-        return patterns
\ No newline at end of file
+        return patterns
+
+
+def _rounded(values: np.ndarray) -> List[Any]:
+    """Valores float32 como listas de floats cortos para JSON."""
+    return np.round(values.astype(np.float64), SERIALIZED_DECIMALS).tolist()
+
+
+def _epoch_to_datetime(timestamp: float) -> Optional[datetime]:
+    """Fecha UTC de una marca en segundos desde epoch (None si es NaN)."""
+    if math.isnan(timestamp):
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+# Pools de procesos compartidos por todos los analizadores con la misma
+# configuración y número de workers (p. ej. los threads del modo por lotes)
+_process_pools: Dict[Tuple[int, Tuple], ProcessPoolExecutor] = {}
+_process_pools_lock = threading.Lock()
+
+# Analizador de cada proceso worker, creado una sola vez al arrancar
+_worker_analyzer: Optional[SentimentAnalyzer] = None
+
+# Analizador VADER del proceso: su léxico se lee una sola vez
+_vader_analyzer: Optional[VaderAnalyzer] = None
+_vader_lock = threading.Lock()
+
+
+def get_vader_analyzer() -> VaderAnalyzer:
+    """Devuelve el analizador VADER del proceso, leyendo su léxico la primera vez."""
+    global _vader_analyzer
+    if _vader_analyzer is None:
+        with _vader_lock:
+            if _vader_analyzer is None:
+                _vader_analyzer = VaderAnalyzer()
+    return _vader_analyzer
+
+
+@lru_cache(maxsize=1)
+def _vader_sentiment_words() -> frozenset:
+    """
+    Palabras que cambian el score de VADER: léxico, negaciones,
+    intensificadores, las palabras de sus expresiones y las que trata aparte
+    ("but", "kind of", "at least", "never so"...).
+    """
+    idioms = {word for idiom in (*SPECIAL_CASES, *SENTIMENT_LADEN_IDIOMS) for word in idiom.split()} - IDIOM_STOPWORDS
+    return (frozenset(get_vader_analyzer().lexicon) | frozenset(NEGATE) | frozenset(BOOSTER_DICT)
+            | frozenset(idioms) | VADER_SPECIAL_WORDS)
+
+
+def get_shared_process_pool(workers: int, **analyzer_options) -> ProcessPoolExecutor:
+    """
+    Devuelve el pool de procesos para una configuración, creándolo si no existe.
+    
+    Los workers se arrancan con 'spawn' (seguro con threads activos) y cada
+    uno crea su SentimentAnalyzer(**analyzer_options) y carga sus modelos
+    (VADER, el modelo transformer) una sola vez, al arrancar.
+    """
+    with _process_pools_lock:
+        key = (workers, tuple(sorted(analyzer_options.items())))
+        if key not in _process_pools:
+            logger.info(f"🧵 Iniciando {workers} procesos de análisis de sentimientos "
+                        f"({analyzer_options.get('model', 'vader')})")
+            _process_pools[key] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(analyzer_options,)
+            )
+        return _process_pools[key]
+
+
+def _init_worker(analyzer_options: Dict[str, Any]):
+    """Inicializa el analizador del proceso worker y carga sus modelos."""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(**analyzer_options)
+    _worker_analyzer.warm_up()
+
+
+def _score_chunk_in_worker(texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Puntúa un trozo de textos limpios en el proceso worker."""
+    return _worker_analyzer._score_texts(texts)
@@ -0,0 +1,164 @@
+"""
+Caché persistente de resultados de sentimiento.
+
+Los mismos textos se repiten entre ejecuciones y dentro de un mismo
+repositorio: los mensajes de commit no cambian, los bots publican
+comentarios idénticos ("LGTM", plantillas de dependabot) y los títulos de PR
+aparecen en ventanas que se solapan. Esta caché guarda el resultado de cada
+texto indexado por un hash de (texto limpio, modelo, versión de los
+patrones), con dos niveles:
+
+- Memoria: LRU dentro del proceso, sin coste de E/S
+- Disco: SQLite, compartido entre ejecuciones
+
+Cambiar el modelo o los patrones cambia la clave, así que nunca se
+reutilizan resultados calculados con otra configuración.
+"""
+
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Versión del formato de las entradas; cambiarla invalida las cachés existentes
+SENTIMENT_CACHE_VERSION = 1
+
+# Claves por consulta SQLite (el límite de parámetros por defecto es 999)
+SQLITE_BATCH_SIZE = 500
+
+# Valores guardados por texto: score, confianza y emociones positive/negative/neutral
+CachedScores = Tuple[float, float, float, float, float]
+
+
+class SentimentCache:
+    """
+    Caché de resultados de sentimiento en dos niveles, segura entre threads.
+    """
+    
+    def __init__(self, path: Optional[str] = None, memory_size: int = 100_000):
+        """
+        Abre (o crea) la caché.
+        
+        Args:
+            path: Archivo SQLite del nivel en disco (None = solo memoria)
+            memory_size: Entradas máximas del nivel en memoria
+        """
+        self.path = Path(path) if path else None
+        self.memory_size = memory_size
+        
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, CachedScores]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._connection = None
+        
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sentiments (
+                    key TEXT PRIMARY KEY,
+                    score REAL NOT NULL,
+                    confidence REAL NOT NULL,
+                    positive REAL NOT NULL,
+                    negative REAL NOT NULL,
+                    neutral REAL NOT NULL
+                )
+                """
+            )
+            self._connection.commit()
+    
+    @staticmethod
+    def make_key(cleaned_text: str, model: str, patterns_version: str) -> str:
+        """Genera la clave de caché de un texto ya limpio."""
+        canonical = f"{SENTIMENT_CACHE_VERSION}\x1f{model}\x1f{patterns_version}\x1f{cleaned_text}"
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, CachedScores]:
+        """
+        Busca varias claves, primero en memoria y después en disco.
+        
+        Returns:
+            Los resultados encontrados, por clave
+        """
+        keys = list(keys)
+        found = {}
+        missing = []
+        
+        with self._lock:
+            for key in keys:
+                scores = self._memory.get(key)
+                if scores is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = scores
+            
+            if missing and self._connection:
+                for start in range(0, len(missing), SQLITE_BATCH_SIZE):
+                    batch = missing[start:start + SQLITE_BATCH_SIZE]
+                    rows = self._connection.execute(
+                        "SELECT key, score, confidence, positive, negative, neutral FROM sentiments "
+                        f"WHERE key IN ({', '.join('?' * len(batch))})",
+                        batch
+                    ).fetchall()
+                    
+                    for key, *scores in rows:
+                        found[key] = tuple(scores)
+                        self._remember(key, found[key])
+            
+            self._hits += len(found)
+            self._misses += len(keys) - len(found)
+        
+        return found
+    
+    def put_many(self, entries: Dict[str, CachedScores]):
+        """Guarda varios resultados en ambos niveles."""
+        if not entries:
+            return
+        
+        with self._lock:
+            for key, scores in entries.items():
+                self._remember(key, scores)
+            
+            if self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO sentiments "
+                    "(key, score, confidence, positive, negative, neutral) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(key, *scores) for key, scores in entries.items()]
+                )
+                self._connection.commit()
+    
+    def stats(self) -> Dict[str, int]:
+        """Devuelve el número de entradas y de aciertos/fallos de la caché."""
+        with self._lock:
+            disk_entries = 0
+            if self._connection:
+                disk_entries = self._connection.execute("SELECT COUNT(*) FROM sentiments").fetchone()[0]
+            
+            return {
+                'memory_entries': len(self._memory),
+                'disk_entries': disk_entries,
+                'hits': self._hits,
+                'misses': self._misses
+            }
+    
+    def close(self):
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+    
+    def _remember(self, key: str, scores: CachedScores):
+        """Añade una entrada al nivel en memoria, descartando la menos reciente."""
+        self._memory[key] = scores
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
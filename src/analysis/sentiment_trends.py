@@ -0,0 +1,180 @@
+"""
+Tendencias de sentimiento por día y por semana.
+
+Por cada día se guardan la suma, el número y la suma de cuadrados de los
+scores. Con eso se obtienen la media y la desviación de cualquier día,
+semana o ventana sin volver a recorrer los resultados, y añadir un lote
+nuevo solo actualiza los días que aparecen en él. Los agregados se pueden
+combinar (merge) y guardar (to_dict / from_dict) para seguir
+actualizándolos en ejecuciones posteriores con solo la actividad nueva.
+"""
+
+import math
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .epoch_time import SECONDS_PER_DAY
+
+logger = logging.getLogger(__name__)
+
+# El 1970-01-01 (día 0) fue jueves: (día + 3) % 7 da el día de la semana (lunes = 0)
+EPOCH_WEEKDAY_OFFSET = 3
+
+# Días de la ventana reciente que se compara con la anterior
+TREND_WINDOW_DAYS = 7
+
+# Cambios de la media menores que este se consideran estables
+STABLE_CHANGE = 0.05
+
+# Suma, número y suma de cuadrados de los scores de un periodo
+Aggregate = Tuple[float, int, float]
+
+
+class SentimentTrends:
+    """
+    Agregados diarios de sentimiento actualizables de forma incremental.
+    """
+    
+    def __init__(self):
+        # Día (desde epoch) → [suma, número, suma de cuadrados], todos float
+        self._days: Dict[int, List[float]] = {}
+    
+    def __len__(self) -> int:
+        """Número de scores agregados."""
+        return int(sum(bucket[1] for bucket in self._days.values()))
+    
+    def add(self, timestamps: np.ndarray, scores: np.ndarray):
+        """
+        Añade scores con su fecha en segundos desde epoch (NaN = sin fecha, se ignoran).
+        """
+        known = ~np.isnan(timestamps)
+        if not known.any():
+            return
+        
+        days = np.floor(timestamps[known] / SECONDS_PER_DAY).astype(np.int64)
+        values = scores[known]
+        
+        # Agregados de cada día presente en el lote, calculados en NumPy
+        unique_days, inverse = np.unique(days, return_inverse=True)
+        sums = np.bincount(inverse, weights=values)
+        counts = np.bincount(inverse)
+        squares = np.bincount(inverse, weights=values * values)
+        
+        for day, total, count, square in zip(unique_days.tolist(), sums.tolist(),
+                                             counts.tolist(), squares.tolist()):
+            self._add_aggregate(day, (total, count, square))
+    
+    def merge(self, other: 'SentimentTrends'):
+        """Suma los agregados de otro objeto (p. ej. de otra ejecución o worker)."""
+        for day, bucket in other._days.items():
+            self._add_aggregate(day, (bucket[0], int(bucket[1]), bucket[2]))
+    
+    def daily(self) -> List[Dict[str, Any]]:
+        """Serie diaria: fecha, número de textos, media y desviación."""
+        return [_period_summary(_day_to_date(day), bucket) for day, bucket in sorted(self._days.items())]
+    
+    def weekly(self) -> List[Dict[str, Any]]:
+        """Serie semanal (semanas de lunes a domingo, fecha = lunes)."""
+        weeks: Dict[int, List[float]] = {}
+        for day, (total, count, square) in self._days.items():
+            week = day - (day + EPOCH_WEEKDAY_OFFSET) % 7
+            bucket = weeks.setdefault(week, [0.0, 0, 0.0])
+            bucket[0] += total
+            bucket[1] += count
+            bucket[2] += square
+        
+        return [_period_summary(_day_to_date(week), bucket) for week, bucket in sorted(weeks.items())]
+    
+    def window(self, first_day: int, last_day: int) -> Aggregate:
+        """Agregado de los días first_day..last_day (inclusive)."""
+        total, count, square = 0.0, 0, 0.0
+        for day in range(first_day, last_day + 1):
+            bucket = self._days.get(day)
+            if bucket:
+                total += bucket[0]
+                count += int(bucket[1])
+                square += bucket[2]
+        return total, count, square
+    
+    def summary(self, window_days: int = TREND_WINDOW_DAYS) -> Dict[str, Any]:
+        """
+        Dirección de la tendencia: últimos window_days días frente a los anteriores.
+        
+        La fuerza es la diferencia de medias en errores estándar, escalada a
+        0-1 (3 errores estándar o más = 1.0).
+        """
+        if not self._days:
+            return {'trend_direction': 'stable', 'trend_strength': 0.0, 'recent_change': 0.0,
+                    'recent_average': 0.0, 'previous_average': 0.0}
+        
+        last_day = max(self._days)
+        recent = self.window(last_day - window_days + 1, last_day)
+        previous = self.window(last_day - 2 * window_days + 1, last_day - window_days)
+        
+        recent_mean, recent_var = _mean_and_variance(recent)
+        previous_mean, previous_var = _mean_and_variance(previous)
+        
+        change = recent_mean - previous_mean if recent[1] and previous[1] else 0.0
+        strength = 0.0
+        if change:
+            standard_error = math.sqrt(recent_var / recent[1] + previous_var / previous[1])
+            strength = 1.0 if standard_error == 0 else min(1.0, abs(change) / standard_error / 3)
+        
+        direction = 'stable'
+        if abs(change) >= STABLE_CHANGE:
+            direction = 'improving' if change > 0 else 'declining'
+        
+        return {
+            'trend_direction': direction,
+            'trend_strength': strength,
+            'recent_change': change,
+            'recent_average': recent_mean,
+            'previous_average': previous_mean
+        }
+    
+    def to_dict(self) -> Dict[str, List[float]]:
+        """Agregados serializables en JSON, por fecha ISO."""
+        return {_day_to_date(day).isoformat(): list(bucket) for day, bucket in sorted(self._days.items())}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Iterable[float]]) -> 'SentimentTrends':
+        """Reconstruye los agregados guardados con to_dict()."""
+        trends = cls()
+        for day, (total, count, square) in data.items():
+            trends._add_aggregate(_date_to_day(date.fromisoformat(day)), (total, int(count), square))
+        return trends
+    
+    def _add_aggregate(self, day: int, aggregate: Aggregate):
+        bucket = self._days.get(day)
+        if bucket is None:
+            self._days[day] = list(aggregate)
+        else:
+            bucket[0] += aggregate[0]
+            bucket[1] += aggregate[1]
+            bucket[2] += aggregate[2]
+
+
+def _mean_and_variance(aggregate: Aggregate) -> Tuple[float, float]:
+    """Media y varianza poblacional de un agregado (0 si está vacío)."""
+    total, count, square = aggregate
+    if not count:
+        return 0.0, 0.0
+    mean = total / count
+    return mean, max(0.0, square / count - mean * mean)
+
+
+def _period_summary(start: date, aggregate: Iterable[float]) -> Dict[str, Any]:
+    total, count, square = aggregate
+    mean, variance = _mean_and_variance((total, int(count), square))
+    return {'date': start.isoformat(), 'count': int(count), 'mean': mean, 'std': math.sqrt(variance)}
+
+
+def _day_to_date(day: int) -> date:
+    return date(1970, 1, 1) + timedelta(days=day)
+
+
+def _date_to_day(value: date) -> int:
+    return (value - date(1970, 1, 1)).days
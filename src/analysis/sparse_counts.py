@@ -0,0 +1,142 @@
+"""
+Piezas comunes de las matrices dispersas del análisis de colaboración.
+
+IndexTable asigna un índice entero a cada nombre (miembro, archivo) la
+primera vez que aparece. SparseAccumulator guarda los incrementos como
+triples COO (fila, columna, peso) en arrays compactos y los suma en bloque
+en una matriz de SciPy solo cuando se necesita.
+"""
+
+import logging
+from array import array
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class IndexTable:
+    """Tabla nombre → índice entero (y su inversa, names)."""
+    
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self.names: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+    
+    def index(self, name: str) -> int:
+        """Índice de un nombre, asignándole uno nuevo si no existe."""
+        index = self._index.get(name)
+        if index is None:
+            index = self._index[name] = len(self.names)
+            self.names.append(name)
+        return index
+    
+    def get(self, name: str, default: int = -1) -> int:
+        """Índice de un nombre sin registrarlo (default si no existe)."""
+        return self._index.get(name, default)
+    
+    def clear(self):
+        self._index.clear()
+        self.names.clear()
+
+
+class SparseAccumulator:
+    """
+    Incrementos (fila, columna, peso) sumados en bloque en una matriz dispersa.
+    """
+    
+    def __init__(self):
+        self.clear()
+    
+    def add(self, row: int, col: int, weight: float = 1.0):
+        self._rows.append(row)
+        self._cols.append(col)
+        self._weights.append(weight)
+        self._matrix = None
+    
+    def clear(self):
+        self._rows = array('l')
+        self._cols = array('l')
+        self._weights = array('d')
+        self._matrix = None
+    
+    def matrix(self, shape):
+        """
+        Matriz CSR con los pesos de cada celda sumados.
+        
+        Los triples acumulados se sustituyen por la forma compacta de la
+        matriz, de modo que la memoria no crece con incrementos repetidos
+        en las mismas celdas. Las celdas que suman 0 se eliminan.
+        """
+        if self._matrix is None or self._matrix.shape != shape:
+            # Importación diferida: SciPy tarda ~0.5 s en cargarse
+            from scipy import sparse
+            
+            matrix = sparse.coo_matrix(
+                (np.frombuffer(self._weights, dtype=np.float64),
+                 (np.frombuffer(self._rows, dtype=np.int_), np.frombuffer(self._cols, dtype=np.int_))),
+                shape=shape
+            ).tocsr()
+            matrix.sum_duplicates()
+            matrix.eliminate_zeros()
+            
+            compact = matrix.tocoo()
+            self._rows = array('l', compact.row.astype(np.int_).tobytes())
+            self._cols = array('l', compact.col.astype(np.int_).tobytes())
+            self._weights = array('d', compact.data.astype(np.float64).tobytes())
+            self._matrix = matrix
+        return self._matrix
+
+
+def column_owners(counts) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Total, fila con el máximo y máximo de cada columna de una matriz CSC.
+    
+    Se calcula sobre los datos de la CSC con reduceat (el argmax por eje de
+    SciPy recorre las columnas en Python). Con empates gana la primera
+    fila; las columnas vacías tienen total 0 y fila -1.
+    """
+    columns = counts.shape[1]
+    totals, maxima = np.zeros(columns), np.zeros(columns)
+    owners = np.full(columns, -1, dtype=np.int64)
+    
+    sizes = np.diff(counts.indptr)
+    non_empty = np.flatnonzero(sizes)
+    if not len(non_empty):
+        return totals, owners, maxima
+    
+    starts = counts.indptr[non_empty]
+    totals[non_empty] = np.add.reduceat(counts.data, starts)
+    maxima[non_empty] = np.maximum.reduceat(counts.data, starts)
+    
+    entry_columns = np.repeat(np.arange(columns), sizes)
+    is_max = np.flatnonzero(counts.data == maxima[entry_columns])
+    max_columns, first = np.unique(entry_columns[is_max], return_index=True)
+    owners[max_columns] = counts.indices[is_max[first]]
+    return totals, owners, maxima
+
+
+def column_bus_factors(counts, totals: np.ndarray, fraction: float = 0.5) -> np.ndarray:
+    """
+    Bus factor de cada columna de una matriz CSC: número mínimo de filas
+    que suman al menos fraction del total de la columna (0 si está vacía).
+    """
+    sizes = np.diff(counts.indptr)
+    entry_columns = np.repeat(np.arange(counts.shape[1]), sizes)
+    
+    # Valores de cada columna de mayor a menor y suma acumulada dentro de la columna
+    order = np.lexsort((-counts.data, entry_columns))
+    values = counts.data[order]
+    cumulative = np.cumsum(values)
+    column_start = np.concatenate([[0.0], cumulative])[counts.indptr[:-1]]
+    before = cumulative - values - column_start[entry_columns]
+    
+    # Una fila cuenta si lo acumulado antes de ella aún no llega al objetivo
+    needed = before < fraction * totals[entry_columns]
+    return np.bincount(entry_columns[needed], minlength=counts.shape[1])
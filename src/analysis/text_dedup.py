@@ -0,0 +1,202 @@
+"""
+Agrupación de textos duplicados y casi duplicados antes de puntuarlos.
+
+Los mensajes de merge ("Merge pull request #123 from alice/fix"), los
+comentarios de CI y las plantillas de bots solo se diferencian en números,
+SHAs o ramas. Cada texto se reduce a una forma canónica (esos valores se
+sustituyen por marcadores neutros) y los textos con la misma forma canónica
+se puntúan una sola vez. Las ramas con alguna palabra con sentimiento
+("from bob/fix-terrible-crash") no se sustituyen.
+
+Opcionalmente, los textos largos casi iguales también se agrupan: cada
+texto tiene una firma MinHash de sus palabras y las firmas se indexan por
+bandas (LSH), de modo que cada texto solo se compara con los pocos textos
+que comparten alguna banda. Dos textos se agrupan si sus palabras coinciden
+en al menos NEAR_DUPLICATE_SIMILARITY (Jaccard) y las palabras que los
+diferencian no cambian el sentimiento.
+"""
+
+import re
+import zlib
+import logging
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Valores que no cambian el sentimiento y se sustituyen en la forma canónica
+CANONICAL_PATTERNS = (
+    (re.compile(r'https?://\S+'), 'url'),
+    (re.compile(r'\b(?=[0-9a-f]*\d)[0-9a-f]{7,40}\b'), 'sha'),     # SHAs de commits
+)
+
+# Ramas (from alice/fix): se sustituyen si ninguna de sus palabras está en keep
+BRANCH_PATTERN = re.compile(r"\b(from|into|branch) '?([\w.-]+/[\w./-]+)'?")
+
+# Números y versiones, salvo los que forman parte de palabras o emoticonos ("8)", "<3")
+NUMBER_PATTERN = re.compile(r'(?<![\w:;=<>^*\\/|])\d+(?:[.,]\d+)*(?![\w:;)(\\/|*-])')
+
+# MinHash: funciones hash de la firma, divididas en bandas de MINHASH_ROWS
+# filas para el índice LSH (con 8 x 4, los pares con Jaccard >= 0.8 son
+# candidatos con probabilidad de ~0.98)
+MINHASH_PERMUTATIONS = 32
+MINHASH_ROWS = 4
+
+# Similitud de Jaccard mínima entre las palabras de dos casi duplicados
+NEAR_DUPLICATE_SIMILARITY = 0.8
+
+# Representantes por cubo del índice: acota las comparaciones por texto
+# cuando muchos textos comparten vocabulario sin llegar a agruparse
+MAX_BUCKET_LEADERS = 4
+
+# Los textos más cortos solo se agrupan si son iguales: en pocas palabras
+# un cambio ("good" / "not good") cambia el sentimiento
+MIN_NEAR_DUPLICATE_TOKENS = 8
+
+# Cuentas de bots conocidas que no llevan el sufijo [bot]
+BOT_ACCOUNTS = frozenset({
+    'dependabot', 'renovate', 'github-actions', 'codecov', 'coveralls', 'netlify', 'vercel',
+    'sonarcloud', 'mergify', 'greenkeeper', 'snyk-bot', 'allcontributors', 'stale', 'k8s-ci-robot',
+})
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+_WORD_PART_PATTERN = re.compile(r'[^\W_]+')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_CANONICAL_HINT = re.compile(r'[\d/]')
+
+# Funciones hash universales (a * x + b) mod p, fijas para que las firmas
+# sean las mismas en todas las ejecuciones
+_MINHASH_PRIME = 4294967291
+_MINHASH_A, _MINHASH_B = np.random.default_rng(0).integers(1, _MINHASH_PRIME, (2, MINHASH_PERMUTATIONS),
+                                                           dtype=np.uint64)
+
+
+def canonicalize(text: str, keep: FrozenSet[str] = frozenset()) -> str:
+    """
+    Forma canónica de un texto: URLs, SHAs, ramas y números sustituidos.
+    
+    Args:
+        text: Texto original
+        keep: Palabras (en minúsculas) con sentimiento en el léxico: los
+            números que están en él (como "1337") y las ramas con alguna de
+            ellas no se sustituyen
+    """
+    # Sin dígitos, URLs ni rutas no hay nada que sustituir
+    if not _CANONICAL_HINT.search(text):
+        return text.strip()
+    
+    for pattern, replacement in CANONICAL_PATTERNS:
+        text = pattern.sub(replacement, text)
+    text = BRANCH_PATTERN.sub(lambda match: match.group() if _has_word(match.group(2), keep)
+                              else f"{match.group(1)} ref", text)
+    text = NUMBER_PATTERN.sub(lambda match: match.group() if match.group() in keep else '0', text)
+    return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def is_bot(author: Optional[str]) -> bool:
+    """Indica si un autor es una cuenta de bot ('[bot]', '-bot' o conocida)."""
+    if not author:
+        return False
+    name = author.lower()
+    return name.endswith(('[bot]', '-bot', '_bot')) or name in BOT_ACCOUNTS
+
+
+def minhash_signatures(token_sets: Sequence[FrozenSet[str]]) -> np.ndarray:
+    """
+    Firmas MinHash de conjuntos de palabras.
+    
+    Returns:
+        Matriz (n, MINHASH_PERMUTATIONS) uint64; la fracción de columnas
+        iguales entre dos filas estima la similitud de Jaccard
+    """
+    signatures = np.full((len(token_sets), MINHASH_PERMUTATIONS), _MINHASH_PRIME, dtype=np.uint64)
+    hashes = [zlib.crc32(token.encode('utf-8')) for tokens in token_sets for token in tokens]
+    if not hashes:
+        return signatures
+    
+    # Todas las palabras a la vez y el mínimo por texto con reduceat
+    values = np.array(hashes, dtype=np.uint64)[:, None]
+    permuted = (values * _MINHASH_A % _MINHASH_PRIME + _MINHASH_B) % _MINHASH_PRIME
+    sizes = np.array([len(tokens) for tokens in token_sets])
+    non_empty = sizes > 0
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])[non_empty]
+    signatures[non_empty] = np.minimum.reduceat(permuted, starts, axis=0)
+    return signatures
+
+
+def find_near_duplicates(texts: Sequence[str], similarity: float = NEAR_DUPLICATE_SIMILARITY,
+                         sentiment_words: FrozenSet[str] = frozenset()) -> np.ndarray:
+    """
+    Agrupa los textos largos casi iguales.
+    
+    Solo se agrupan textos con las mismas palabras de sentimiento, en el
+    mismo orden y con las mismas mayúsculas, y la misma enfatización con
+    '!' y '?': las palabras que los diferencian no cambian el score. Cada
+    texto se une al primer texto anterior que cumple la similitud
+    (agrupación por líderes: los grupos no se encadenan).
+    
+    Args:
+        texts: Formas canónicas (canonicalize) de textos distintos
+        similarity: Similitud de Jaccard mínima entre las palabras
+        sentiment_words: Palabras (en minúsculas) con efecto en el score:
+            léxico de sentimiento, negaciones, intensificadores
+    
+    Returns:
+        Array con el índice del representante de cada texto (el propio
+        índice si no se agrupa)
+    """
+    representatives = np.arange(len(texts), dtype=np.int64)
+    
+    candidates, token_sets, sentiment_keys = [], [], []
+    for index, text in enumerate(texts):
+        if text.count(' ') + 1 < MIN_NEAR_DUPLICATE_TOKENS:
+            continue
+        words = _TOKEN_PATTERN.findall(text)
+        tokens = frozenset(word.lower() for word in words)
+        if len(tokens) >= MIN_NEAR_DUPLICATE_TOKENS:
+            candidates.append(index)
+            token_sets.append(tokens)
+            sentiment_keys.append(repr((
+                [word for word in words if word.lower() in sentiment_words],
+                min(text.count('!'), 4), min(text.count('?'), 3)
+            )).encode('utf-8'))
+    if len(candidates) < 2:
+        return representatives
+    
+    signatures = minhash_signatures(token_sets)
+    bands = [signatures[:, start:start + MINHASH_ROWS] for start in range(0, MINHASH_PERMUTATIONS, MINHASH_ROWS)]
+    buckets: List[Dict[bytes, List[int]]] = [{} for _ in bands]
+    grouped = 0
+    
+    for position, tokens in enumerate(token_sets):
+        # Cubos por banda y clave de sentimiento: textos con distinto
+        # sentimiento nunca se comparan
+        keys = [sentiment_keys[position] + band[position].tobytes() for band in bands]
+        
+        # Representantes que comparten algún cubo, del más antiguo al más reciente
+        neighbours = sorted({other for bucket, key in zip(buckets, keys) for other in bucket.get(key, ())})
+        leader = next((other for other in neighbours if _jaccard(tokens, token_sets[other]) >= similarity), None)
+        
+        if leader is None:
+            for bucket, key in zip(buckets, keys):
+                leaders = bucket.setdefault(key, [])
+                if len(leaders) < MAX_BUCKET_LEADERS:
+                    leaders.append(position)
+        else:
+            representatives[candidates[position]] = candidates[leader]
+            grouped += 1
+    
+    if grouped:
+        logger.debug(f"🔁 {grouped} textos agrupados como casi duplicados")
+    return representatives
+
+
+def _has_word(text: str, words: FrozenSet[str]) -> bool:
+    """Indica si alguna palabra del texto (separando también por '_', '-' y '/') está en words."""
+    return any(part in words for part in _WORD_PART_PATTERN.findall(text.lower()))
+
+
+def _jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    common = len(first & second)
+    return common / (len(first) + len(second) - common)
@@ -0,0 +1,84 @@
+"""
+Matrices dispersas separadas por día para vistas por ventana temporal.
+
+DailySlices guarda los incrementos (fila, columna, peso) de cada día en su
+propio SparseAccumulator. La matriz de los últimos 7, 30 o 90 días, o con
+un decaimiento exponencial por antigüedad (semivida), se obtiene sumando
+las matrices compactas de los días que entran en la vista, sin volver a
+recorrer los commits y PRs de los que salen.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .sparse_counts import SparseAccumulator
+
+logger = logging.getLogger(__name__)
+
+
+class DailySlices:
+    """
+    Incrementos de una matriz dispersa agrupados por día.
+    """
+    
+    def __init__(self):
+        self._slices: Dict[int, SparseAccumulator] = {}
+    
+    def __len__(self) -> int:
+        """Número de días con incrementos."""
+        return len(self._slices)
+    
+    def days(self) -> List[int]:
+        """Días con incrementos, en orden."""
+        return sorted(self._slices)
+    
+    def add(self, day: int, row: int, col: int, weight: float = 1.0):
+        """Suma un incremento en la matriz de un día (weight negativo lo descuenta)."""
+        accumulator = self._slices.get(day)
+        if accumulator is None:
+            accumulator = self._slices[day] = SparseAccumulator()
+        accumulator.add(row, col, weight)
+    
+    def clear(self):
+        self._slices.clear()
+    
+    def window(self, shape, end_day: int, days: Optional[int] = None, half_life: Optional[float] = None):
+        """
+        Suma de las matrices de los días de una ventana (scipy.sparse CSR).
+        
+        Args:
+            shape: Forma de la matriz resultante
+            end_day: Último día de la ventana (los posteriores no cuentan)
+            days: Días de la ventana, end_day incluido (None = todos los
+                anteriores)
+            half_life: Semivida en días: cada día pesa 0.5 ** (antigüedad /
+                half_life) (None = todos pesan 1)
+        """
+        from scipy import sparse
+        
+        rows, cols, data = [], [], []
+        for day in list(self._slices):
+            age = end_day - day
+            if age < 0 or (days is not None and age >= days):
+                continue
+            
+            matrix = self._slices[day].matrix(shape).tocoo()
+            if not matrix.nnz:
+                # Día cuya actividad se descontó por completo (caducidad o PR reemplazado)
+                del self._slices[day]
+                continue
+            
+            weight = 1.0 if half_life is None else 0.5 ** (age / half_life)
+            rows.append(matrix.row)
+            cols.append(matrix.col)
+            data.append(matrix.data * weight)
+        
+        if not rows:
+            return sparse.csr_matrix(shape)
+        
+        result = sparse.coo_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+                                   shape=shape).tocsr()
+        result.sum_duplicates()
+        return result
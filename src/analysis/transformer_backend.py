@@ -0,0 +1,149 @@
+"""
+Modelo de sentimiento basado en transformers (opcional).
+
+Ejecuta en CPU un modelo multilingüe pequeño de clasificación de
+sentimiento (negativo / neutral / positivo). torch y transformers son
+dependencias opcionales: este módulo no los importa hasta cargar el modelo,
+y transformers_available() permite comprobar si están instalados.
+
+Para que la inferencia en CPU sea asumible:
+- Los textos se tokenizan una vez, se ordenan por longitud y se agrupan en
+  lotes de longitud parecida, así el relleno (padding) es mínimo
+- El tamaño de cada lote se ajusta a un presupuesto de tokens: muchos
+  textos cortos o pocos largos
+- Las capas lineales se cuantizan a int8 (cuantización dinámica)
+- El modelo se carga una sola vez por proceso y se comparte
+"""
+
+import logging
+import threading
+import importlib.util
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Modelo multilingüe (DistilBERT) con etiquetas positive/neutral/negative
+DEFAULT_TRANSFORMER_MODEL = 'lxyuan/distilbert-base-multilingual-cased-sentiments-student'
+
+# Tokens máximos por texto (los mensajes más largos se truncan)
+MAX_SEQUENCE_LENGTH = 128
+
+# Lotes: como mucho MAX_BATCH_SIZE textos y MAX_BATCH_TOKENS tokens con relleno
+MAX_BATCH_SIZE = 64
+MAX_BATCH_TOKENS = 4096
+
+# Orden de las columnas de probabilidad que devuelve predict()
+PROBABILITY_LABELS = ('negative', 'neutral', 'positive')
+
+# Modelos cargados en este proceso, por (nombre, cuantizado)
+_models: Dict[Tuple[str, bool], 'TransformerSentiment'] = {}
+_models_lock = threading.Lock()
+
+
+def transformers_available() -> bool:
+    """Indica si torch y transformers están instalados (sin importarlos)."""
+    return all(importlib.util.find_spec(name) is not None for name in ('torch', 'transformers'))
+
+
+def plan_batches(lengths: Sequence[int], max_batch_size: int = MAX_BATCH_SIZE,
+                 max_batch_tokens: int = MAX_BATCH_TOKENS) -> List[List[int]]:
+    """
+    Agrupa textos en lotes de longitud parecida.
+    
+    Args:
+        lengths: Tokens de cada texto
+        max_batch_size: Textos máximos por lote
+        max_batch_tokens: Tokens máximos por lote, contando el relleno hasta
+            el texto más largo del lote
+    
+    Returns:
+        Índices de los textos de cada lote
+    """
+    batches = []
+    batch: List[int] = []
+    
+    # En orden creciente, el último texto añadido es el más largo del lote
+    for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+        padded_tokens = (len(batch) + 1) * max(lengths[index], 1)
+        if batch and (len(batch) >= max_batch_size or padded_tokens > max_batch_tokens):
+            batches.append(batch)
+            batch = []
+        batch.append(index)
+    
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class TransformerSentiment:
+    """
+    Clasificador de sentimiento con un modelo de transformers en CPU.
+    """
+    
+    def __init__(self, model_name: str = DEFAULT_TRANSFORMER_MODEL, quantize: bool = True):
+        """
+        Carga el tokenizer y el modelo.
+        
+        Args:
+            model_name: Modelo de Hugging Face (clasificación de secuencias)
+            quantize: Cuantizar las capas lineales a int8
+        """
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+        
+        self.model_name = model_name
+        self._torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+        if quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        
+        # Columna de la salida del modelo para cada etiqueta de PROBABILITY_LABELS
+        labels = {label.lower(): index for index, label in model.config.id2label.items()}
+        missing = [label for label in PROBABILITY_LABELS if label not in labels]
+        if missing:
+            raise ValueError(f"El modelo {model_name} no tiene las etiquetas: {', '.join(missing)}")
+        self._columns = [labels[label] for label in PROBABILITY_LABELS]
+        
+        logger.info(f"🤖 Modelo transformer cargado: {model_name}{' (int8)' if quantize else ''}")
+    
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Probabilidades de cada texto.
+        
+        Returns:
+            Matriz (n, 3) con las columnas de PROBABILITY_LABELS
+        """
+        probabilities = np.zeros((len(texts), len(PROBABILITY_LABELS)))
+        if not texts:
+            return probabilities
+        
+        encoded = self.tokenizer(list(texts), truncation=True, max_length=MAX_SEQUENCE_LENGTH)['input_ids']
+        
+        with self._torch.inference_mode():
+            for batch in plan_batches([len(ids) for ids in encoded]):
+                inputs = self.tokenizer.pad({'input_ids': [encoded[index] for index in batch]},
+                                            return_tensors='pt')
+                logits = self.model(**inputs).logits
+                batch_probabilities = self._torch.softmax(logits, dim=-1).numpy()
+                probabilities[batch] = batch_probabilities[:, self._columns]
+        
+        return probabilities
+
+
+def get_transformer_model(model_name: Optional[str] = None, quantize: bool = True) -> TransformerSentiment:
+    """Devuelve el modelo del proceso, cargándolo la primera vez."""
+    key = (model_name or DEFAULT_TRANSFORMER_MODEL, quantize)
+    model = _models.get(key)
+    if model is not None:
+        return model
+    
+    with _models_lock:
+        if key not in _models:
+            _models[key] = TransformerSentiment(*key)
+        return _models[key]
@@ -0,0 +1,210 @@
+"""
+Ejecución por lotes del análisis sobre muchos repositorios.
+
+Pensado para el análisis nocturno de una organización completa:
+
+- Reparte los repositorios entre un pool acotado de workers
+- Guarda el resultado de cada repositorio en un checkpoint en disco en
+  cuanto termina
+- Al reanudar una ejecución interrumpida, omite los repositorios ya
+  completados y reintenta solo los fallidos o pendientes
+"""
+
+import json
+import logging
+from pathlib import Path
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def read_repos_file(path: str) -> List[str]:
+    """
+    Lee una lista de repositorios, uno por línea.
+    
+    Las líneas vacías y las que empiezan por '#' se ignoran.
+    """
+    repos = []
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                repos.append(line)
+    
+    # Sin duplicados, conservando el orden del archivo
+    return list(dict.fromkeys(repos))
+
+
+def to_json_compatible(value: Any) -> Any:
+    """Serializa los tipos de los resultados que JSON no soporta."""
+    # Tipos con serialización propia (p. ej. SentimentBatch, en columnas compactas)
+    if hasattr(value, 'to_dict') and not isinstance(value, type):
+        return value.to_dict()
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+class BatchRunner:
+    """
+    Ejecuta una función de análisis sobre una lista de repositorios con
+    checkpoints por repositorio.
+    """
+    
+    def __init__(self, analyze: Callable[[str], Dict[str, Any]], checkpoint_dir: str,
+                 run_id: Optional[str] = None, max_workers: int = 4):
+        """
+        Args:
+            analyze: Función que analiza un repositorio y devuelve sus resultados
+            checkpoint_dir: Directorio base de los checkpoints
+            run_id: Identificador de la ejecución (por defecto, la fecha UTC);
+                reanudar usa el mismo identificador
+            max_workers: Repositorios analizados en paralelo
+        """
+        self.analyze = analyze
+        self.run_id = run_id or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        self.run_dir = Path(checkpoint_dir) / self.run_id
+        self.max_workers = max(1, max_workers)
+    
+    def run(self, repos: List[str], resume: bool = True) -> Dict[str, Any]:
+        """
+        Analiza todos los repositorios.
+        
+        Args:
+            repos: Repositorios en formato owner/repo
+            resume: Omitir los repositorios con checkpoint completado
+        
+        Returns:
+            Resumen con los repositorios completados, omitidos y fallidos
+        """
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        
+        completed = self.completed_repositories() if resume else set()
+        pending = [repo for repo in repos if repo not in completed]
+        skipped = [repo for repo in repos if repo in completed]
+        
+        logger.info(f"📦 Ejecución {self.run_id}: {len(pending)} repositorios pendientes, "
+                    f"{len(skipped)} ya completados")
+        
+        summary: Dict[str, Any] = {
+            'run_id': self.run_id,
+            'completed': [],
+            'skipped': skipped,
+            'failed': {}
+        }
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._run_one, repo): repo for repo in pending}
+            
+            for number, future in enumerate(as_completed(futures), start=1):
+                repo = futures[future]
+                error = future.result()
+                
+                if error:
+                    summary['failed'][repo] = error
+                    logger.error(f"❌ [{number}/{len(pending)}] {repo}: {error}")
+                else:
+                    summary['completed'].append(repo)
+                    logger.info(f"✅ [{number}/{len(pending)}] {repo}")
+        
+        logger.info(f"📊 Ejecución {self.run_id} terminada: {len(summary['completed'])} completados, "
+                    f"{len(skipped)} omitidos, {len(summary['failed'])} fallidos")
+        
+        return summary
+    
+    def completed_repositories(self) -> set:
+        """Repositorios con un checkpoint completado en esta ejecución."""
+        completed = set()
+        
+        for path in self.run_dir.glob('*.json'):
+            checkpoint = self._read_checkpoint(path)
+            if checkpoint and checkpoint.get('status') == 'completed':
+                completed.add(checkpoint['repository'])
+        
+        return completed
+    
+    def load_results(self) -> Dict[str, Dict[str, Any]]:
+        """Carga los resultados de todos los repositorios completados."""
+        results = {}
+        
+        for path in sorted(self.run_dir.glob('*.json')):
+            checkpoint = self._read_checkpoint(path)
+            if checkpoint and checkpoint.get('status') == 'completed':
+                results[checkpoint['repository']] = checkpoint['results']
+        
+        return results
+    
+    def _run_one(self, repo: str) -> Optional[str]:
+        """
+        Analiza un repositorio y guarda su checkpoint.
+        
+        Returns:
+            None si terminó bien, o el mensaje de error
+        """
+        started_at = datetime.now(timezone.utc)
+        
+        try:
+            results = self.analyze(repo)
+            if not results:
+                raise RuntimeError("el análisis no devolvió resultados")
+            
+            self._write_checkpoint(repo, {
+                'status': 'completed',
+                'started_at': started_at,
+                'finished_at': datetime.now(timezone.utc),
+                'results': results
+            })
+            return None
+        
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            self._write_checkpoint(repo, {
+                'status': 'failed',
+                'error': error,
+                'started_at': started_at
+            })
+            return error
+    
+    def _write_checkpoint(self, repo: str, checkpoint: Dict[str, Any]):
+        """Guarda el checkpoint de un repositorio de forma atómica."""
+        checkpoint = dict(checkpoint, repository=repo, format_version=CHECKPOINT_FORMAT_VERSION)
+        
+        # Serializar antes de abrir el archivo: un error no deja checkpoints a medias
+        content = json.dumps(checkpoint, ensure_ascii=False, default=to_json_compatible)
+        
+        path = self._checkpoint_path(repo)
+        tmp_path = path.with_suffix('.tmp')
+        
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        tmp_path.replace(path)
+    
+    def _read_checkpoint(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Lee un checkpoint; los ilegibles (escritura interrumpida) se ignoran."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Checkpoint ilegible {path.name}: {e}")
+            return None
+        
+        if checkpoint.get('format_version') != CHECKPOINT_FORMAT_VERSION:
+            return None
+        
+        return checkpoint
+    
+    def _checkpoint_path(self, repo: str) -> Path:
+        """Ruta del checkpoint de un repositorio ('owner/repo')."""
+        return self.run_dir / f"{repo.replace('/', '__')}.json"
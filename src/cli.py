@@ -0,0 +1,16 @@
+"""
+Punto de entrada del comando 'empathy' (ver setup.py).
+
+Equivale a 'python src/main.py': importa la aplicación solo al ejecutarse,
+así que importar este módulo no carga ninguna dependencia.
+"""
+
+
+def main():
+    """Ejecuta la línea de comandos de Empathy."""
+    from .main import main as run_main
+    run_main()
+
+
+if __name__ == "__main__":
+    main()
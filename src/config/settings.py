@@ -41,12 +41,43 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
         'github': {
             'token': github_token,
             'api_url': os.getenv('GITHUB_API_URL', 'https://api.github.com'),
-            'rate_limit_delay': max(1, int(os.getenv('GITHUB_RATE_LIMIT_DELAY', '1'))),
+            'backend': os.getenv('GITHUB_BACKEND', 'rest'),  # rest, graphql
+            'rate_limit_delay': max(0, int(os.getenv('GITHUB_RATE_LIMIT_DELAY', '0'))),
+            'max_workers': max(1, int(os.getenv('GITHUB_MAX_WORKERS', '8'))),
+            'rate_limit_reserve': max(0, int(os.getenv('GITHUB_RATE_LIMIT_RESERVE', '50'))),
+            'http_cache_path': os.getenv('GITHUB_HTTP_CACHE', '.empathy_cache/http_cache.sqlite'),
+            'state_dir': os.getenv('EMPATHY_STATE_DIR', '.empathy_cache/repositories'),
+            'local_clone_dir': os.getenv('EMPATHY_LOCAL_CLONE_DIR', ''),
+            'identity_map_path': os.getenv('EMPATHY_IDENTITY_MAP', '.empathy_cache/identities.json'),
+        },
+        
+        # Configuración del análisis por lotes (--org / --repos-file)
+        'batch': {
+            'max_workers': max(1, int(os.getenv('EMPATHY_BATCH_WORKERS', '4'))),
+            'checkpoint_dir': os.getenv('EMPATHY_BATCH_DIR', '.empathy_cache/batch'),
         },
         
         # Configuración de análisis
         'analysis': {
             'sentiment_model': os.getenv('SENTIMENT_MODEL', 'vader'),
+            # Procesos para puntuar sentimiento (1 = sin multiproceso, 0 = uno por CPU)
+            'sentiment_workers': max(0, int(os.getenv('EMPATHY_SENTIMENT_WORKERS', '1'))),
+            # Caché de resultados por texto (vacío = solo en memoria)
+            'sentiment_cache_path': os.getenv('EMPATHY_SENTIMENT_CACHE', '.empathy_cache/sentiment_cache.sqlite'),
+            # Modelo 'transformer': modelo de Hugging Face (vacío = el de por defecto)
+            # y |score VADER| a partir del cual no se vuelve a puntuar el texto
+            'transformer_model': os.getenv('EMPATHY_TRANSFORMER_MODEL', ''),
+            'transformer_gate': max(0.0, min(1.0, float(os.getenv('EMPATHY_TRANSFORMER_GATE', '0.5')))),
+            # Guardar los textos analizados en los resultados (por defecto solo los scores)
+            'keep_texts': os.getenv('EMPATHY_KEEP_TEXTS', 'False').lower() == 'true',
+            # Agrupación de textos antes de puntuarlos ('off', 'exact', 'near') y
+            # omitir los textos de cuentas de bots
+            'sentiment_dedup': os.getenv('EMPATHY_SENTIMENT_DEDUP', 'exact'),
+            'exclude_bots': os.getenv('EMPATHY_EXCLUDE_BOTS', 'False').lower() == 'true',
+            # Colaboración: ventana deslizante en días (0 = sin caducidad) y
+            # semivida en días de la vista ponderada de time_windows (0 = sin ella)
+            'collaboration_window_days': max(0, int(os.getenv('EMPATHY_COLLABORATION_WINDOW_DAYS', '0'))),
+            'collaboration_half_life_days': max(0.0, float(os.getenv('EMPATHY_COLLABORATION_HALF_LIFE_DAYS', '0'))),
             'language': os.getenv('ANALYSIS_LANGUAGE', 'en'),
             'confidence_threshold': max(0.0, min(1.0, float(os.getenv('CONFIDENCE_THRESHOLD', '0.5')))),
         },
@@ -3,5 +3,14 @@ Archivo __init__.py para el paquete data_collection.
 """
 
 from .github_collector import GitHubCollector
+from .graphql_collector import GraphQLCollector
+from .local_git_collector import LocalGitCollector
+from .rate_limiter import GitHubRateLimiter, get_shared_rate_limiter
 
-__all__ = ['GitHubCollector']
\ No newline at end of file
+__all__ = [
+    'GitHubCollector',
+    'GraphQLCollector',
+    'LocalGitCollector',
+    'GitHubRateLimiter',
+    'get_shared_rate_limiter'
+]
\ No newline at end of file
@@ -10,42 +10,78 @@ Este módulo se conecta a la API de GitHub para obtener información sobre:
 
 import time
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import threading
+from pathlib import Path
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Callable, Deque, Iterable, Iterator, Tuple, Set
 
 import requests
 from github import Github, GithubException
 from github.Repository import Repository
 
+from .models import CommitData, PullRequestData, COLLECTABLE_FIELDS, needs_field
+from .incremental_store import (RepositoryState, RepositoryStateStore, as_utc,
+                                merge_commits, merge_pull_requests)
+from .rate_limiter import get_shared_rate_limiter
+from .response_cache import ResponseCache
+from .local_git_collector import LocalGitCollector, LocalGitError
+from .identity_map import IdentityMap
+
 logger = logging.getLogger(__name__)
 
+# Margen con el que se vuelve a pedir la historia anterior a la marca de
+# agua de commits: los commits que llegan con una fecha de committer algo
+# anterior a la marca (relojes desajustados, pushes tardíos) no se pierden,
+# y los ya conocidos se descartan por SHA
+COMMIT_SINCE_OVERLAP = timedelta(days=1)
+
+# Reintentos de una llamada rechazada por rate limit (403/429), cada uno
+# tras esperar al reset o al Retry-After
+RATE_LIMIT_RETRIES = 3
+
+# Espera si un 403/429 por presupuesto agotado no trae la fecha de reset (segundos)
+RATE_LIMIT_DEFAULT_WAIT = 60
+
 
-@dataclass
-class CommitData:
-    """Estructura de datos para información de commits."""
-    sha: str
-    author: str
-    author_email: str
-    message: str
-    timestamp: datetime
-    files_changed: List[str]
-    additions: int
-    deletions: int
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Convierte una fecha ISO 8601 de la API de GitHub a datetime."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _rate_limit_retry_at(response: requests.Response) -> Optional[float]:
+    """
+    Fecha (timestamp Unix) a partir de la que repetir una llamada rechazada
+    por rate limit, o None si la respuesta no es un rate limit.
+    
+    GitHub responde 403 o 429 con Retry-After en los rate limits
+    secundarios y con X-RateLimit-Remaining: 0 al agotar el presupuesto.
+    """
+    if response.status_code not in (403, 429):
+        return None
+    
+    headers = {key.lower(): value for key, value in response.headers.items()}
+    if 'retry-after' in headers:
+        try:
+            return time.time() + float(headers['retry-after'])
+        except ValueError:
+            return time.time() + RATE_LIMIT_DEFAULT_WAIT
+    
+    if headers.get('x-ratelimit-remaining') == '0':
+        try:
+            return float(headers['x-ratelimit-reset'])
+        except (KeyError, ValueError):
+            return time.time() + RATE_LIMIT_DEFAULT_WAIT
+    
+    return None
 
 
-@dataclass
-class PullRequestData:
-    """Estructura de datos para información de pull requests."""
-    number: int
-    title: str
-    author: str
-    state: str
-    created_at: datetime
-    merged_at: Optional[datetime]
-    comments: List[Dict[str, Any]]
-    reviews: List[Dict[str, Any]]
-    files_changed: List[str]
+def _login(user: Optional[Dict[str, Any]]) -> str:
+    """Obtiene el login de un usuario de la API (None si la cuenta se eliminó)."""
+    return (user or {}).get('login') or 'Unknown'
 
 
 class GitHubCollector:
@@ -62,26 +98,76 @@ class GitHubCollector:
         """
         self.config = config
         self.github_token = config['github']['token']
-        self.rate_limit_delay = config['github'].get('rate_limit_delay', 1)
+        self.rate_limit_delay = config['github'].get('rate_limit_delay', 0)
+        
+        # Modo concurrente: con más de un worker los detalles de cada
+        # commit/PR se obtienen en paralelo
+        self.max_workers = max(1, int(config['github'].get('max_workers', 1)))
+        
+        # Presupuesto de la API compartido por todos los colectores del proceso
+        self.rate_limit_reserve = max(0, int(config['github'].get('rate_limit_reserve', 50)))
+        self.rate_limiter = get_shared_rate_limiter(self.github_token, reserve=self.rate_limit_reserve)
+        
+        # Caché persistente de respuestas HTTP (vacía = desactivada)
+        cache_path = config['github'].get('http_cache_path')
+        self.response_cache = ResponseCache(cache_path) if cache_path else None
+        
+        # Campos que necesitan los analizadores (None = todos); el resto de
+        # llamadas por elemento se omiten
+        self.required_fields: Optional[frozenset] = None
+        
+        # Mapa email → login persistente entre ejecuciones (vacío = solo en memoria)
+        self.identity_map = IdentityMap(config['github'].get('identity_map_path') or None)
+        
+        # Directorio de mirrors git locales para obtener los commits sin la API
+        self.local_clone_dir = config['github'].get('local_clone_dir') or None
+        
+        # Estado de la recopilación incremental (marcas de agua por repositorio)
+        state_dir = config['github'].get('state_dir')
+        self.state_store = RepositoryStateStore(state_dir) if state_dir else None
+        
+        # Elementos que no se pudieron recopilar en la ejecución en curso de
+        # cada thread (el modo por lotes comparte el recopilador)
+        self._collection = threading.local()
         
         # Inicializar cliente de GitHub
+        self.api_url = config['github'].get('api_url', 'https://api.github.com').rstrip('/')
         self.github = Github(self.github_token)
+        self.session = self._create_session()
         
         # Verificar autenticación
         try:
             user = self.github.get_user()
             logger.info(f"✅ Autenticado como: {user.login}")
+            self._sync_rate_limit()
         except GithubException as e:
             logger.error(f"❌ Error de autenticación: {e}")
             raise
     
-    def collect_repository_data(self, repo_url: str, days_back: int = 30) -> Dict[str, Any]:
+    def set_required_fields(self, fields: Optional[Iterable[str]]):
+        """
+        Limita la recopilación a los campos que usarán los analizadores.
+        
+        Args:
+            fields: Campos de COLLECTABLE_FIELDS (p. ej. 'commit.files_changed'),
+                o None para recopilar todo
+        """
+        self.required_fields = frozenset(fields) if fields is not None else None
+    
+    def _needs(self, field: str) -> bool:
+        """Indica si algún analizador necesita un campo."""
+        return needs_field(self.required_fields, field)
+    
+    def collect_repository_data(self, repo_url: str, days_back: int = 30,
+                                incremental: bool = False) -> Dict[str, Any]:
         """
         Recopila datos completos de un repositorio.
         
         Args:
             repo_url: URL del repositorio (formato: owner/repo)
             days_back: Días hacia atrás para analizar
+            incremental: Pedir solo la actividad posterior a la última
+                ejecución y fusionarla con el dataset guardado
             
         Returns:
             Diccionario con todos los datos recopilados
@@ -94,21 +180,44 @@ class GitHubCollector:
             logger.info(f"📁 Analizando repositorio: {repo.full_name}")
             
             # Calcular fecha límite
-            since_date = datetime.now() - timedelta(days=days_back)
-            
-            # Recopilar datos
-            data = {
-                'repository_info': self._get_repository_info(repo),
-                'commits': self._collect_commits(repo, since_date),
-                'pull_requests': self._collect_pull_requests(repo, since_date),
-                'contributors': self._collect_contributors(repo),
-                'collection_metadata': {
-                    'collected_at': datetime.now(),
-                    'days_analyzed': days_back,
-                    'since_date': since_date
+            since_date = datetime.now(timezone.utc) - timedelta(days=days_back)
+            
+            state = self._load_incremental_state(repo.full_name, since_date) if incremental else None
+            self._collection.errors = 0
+            
+            if state:
+                data = self._collect_incremental(repo, since_date, state)
+            else:
+                # Los contributors primero: alimentan el mapa de identidades
+                contributors = self._collect_contributors(repo)
+                
+                # Recopilar datos
+                data = {
+                    'repository_info': self._get_repository_info(repo),
+                    'commits': self._collect_commit_history(repo, since_date),
+                    'pull_requests': self._collect_pull_requests(repo, since_date),
+                    'contributors': contributors
                 }
+                data['new_activity'] = {
+                    'commits': len(data['commits']),
+                    'pull_requests': len(data['pull_requests'])
+                }
+            
+            new_activity = data.pop('new_activity')
+            data['collection_metadata'] = {
+                'collected_at': datetime.now(timezone.utc),
+                'days_analyzed': days_back,
+                'since_date': since_date,
+                'incremental': state is not None,
+                'new_commits': new_activity['commits'],
+                'new_pull_requests': new_activity['pull_requests']
             }
             
+            if incremental and self.state_store:
+                self._save_incremental_state(repo.full_name, since_date, data, state)
+            
+            self.identity_map.save()
+            
             logger.info(f"📊 Datos recopilados: "
                        f"{len(data['commits'])} commits, "
                        f"{len(data['pull_requests'])} PRs, "
@@ -123,6 +232,163 @@ class GitHubCollector:
             logger.error(f"❌ Error inesperado: {e}")
             return {}
     
+    def stream_repository_data(self, repo_url: str, days_back: int = 30) -> Iterator[Tuple[str, Any]]:
+        """
+        Recopila los datos de un repositorio como un flujo de eventos.
+        
+        A diferencia de collect_repository_data, los commits y PRs se
+        entregan a medida que llegan las páginas de la API, sin construir
+        las listas completas: el análisis puede empezar con el primer
+        elemento y la memoria no crece con la historia del repositorio.
+        
+        Args:
+            repo_url: URL del repositorio (formato: owner/repo)
+            days_back: Días hacia atrás para analizar
+            
+        Yields:
+            Tuplas (tipo, dato): primero ('repository_info', dict), después
+            ('commit', CommitData) y por último ('pull_request', PullRequestData)
+        """
+        try:
+            repo_name = self._extract_repo_name(repo_url)
+            repo = self.github.get_repo(repo_name)
+            
+            logger.info(f"📁 Analizando repositorio en streaming: {repo.full_name}")
+            
+            since_date = datetime.now(timezone.utc) - timedelta(days=days_back)
+            
+            yield 'repository_info', self._get_repository_info(repo)
+            
+            # Una sola llamada paginada que alimenta el mapa de identidades
+            self._collect_contributors(repo)
+            
+            commits_count = 0
+            for commit in self._iter_commit_history(repo, since_date):
+                commits_count += 1
+                yield 'commit', commit
+            
+            prs_count = 0
+            for pr in self._iter_pull_requests(repo, since_date):
+                prs_count += 1
+                yield 'pull_request', pr
+            
+            logger.info(f"📊 Datos recopilados en streaming: {commits_count} commits, {prs_count} PRs")
+            self.identity_map.save()
+            
+        except GithubException as e:
+            logger.error(f"❌ Error accediendo al repositorio: {e}")
+    
+    def _load_incremental_state(self, repo_name: str, since_date: datetime) -> Optional[RepositoryState]:
+        """
+        Carga el estado incremental si cubre la ventana pedida.
+        
+        Si la ventana empieza antes que el dataset guardado, hace falta una
+        recopilación completa.
+        """
+        if not self.state_store:
+            logger.warning("⚠️  Modo incremental sin directorio de estado configurado")
+            return None
+        
+        state = self.state_store.load(repo_name)
+        if state and as_utc(state.coverage_start) > since_date:
+            logger.info("ℹ️  La ventana pedida es mayor que la guardada, recopilación completa")
+            return None
+        
+        if state and state.fields is not None:
+            required = self.required_fields if self.required_fields is not None else COLLECTABLE_FIELDS
+            stored_fields = frozenset(state.fields)
+            if not all(needs_field(stored_fields, field) for field in required):
+                logger.info("ℹ️  El dataset guardado no tiene todos los campos pedidos, recopilación completa")
+                return None
+        
+        return state
+    
+    def _collect_incremental(self, repo: Repository, since_date: datetime,
+                             state: RepositoryState) -> Dict[str, Any]:
+        """Recopila solo la actividad posterior a las marcas de agua y la fusiona."""
+        # La marca es la fecha del committer, la misma que compara el filtro `since`
+        commit_mark = as_utc(state.last_commit_timestamp)
+        commits_since = max(since_date, commit_mark - COMMIT_SINCE_OVERLAP) if commit_mark else since_date
+        prs_since = max(since_date, as_utc(state.last_pr_updated_at) or since_date)
+        
+        logger.info(f"🔁 Recopilación incremental: commits desde {commits_since:%Y-%m-%d %H:%M}, "
+                    f"PRs actualizados desde {prs_since:%Y-%m-%d %H:%M}")
+        
+        contributors = self._collect_contributors(repo)
+        
+        known_shas = {commit.sha for commit in state.commits}
+        new_commits = self._collect_commit_history(repo, commits_since, exclude_shas=known_shas)
+        new_prs = self._collect_pull_requests(repo, prs_since, exclude_updated_at=state.last_pr_updated_at)
+        
+        return {
+            'repository_info': self._get_repository_info(repo),
+            'commits': merge_commits(state.commits, new_commits, since_date),
+            'pull_requests': merge_pull_requests(state.pull_requests, new_prs, since_date),
+            'contributors': contributors,
+            'new_activity': {
+                'commits': len(new_commits),
+                'pull_requests': len(new_prs)
+            }
+        }
+    
+    def _save_incremental_state(self, repo_name: str, since_date: datetime,
+                                data: Dict[str, Any], previous: Optional[RepositoryState]):
+        """Guarda el dataset fusionado y sus marcas de agua."""
+        commits = data['commits']
+        prs = data['pull_requests']
+        
+        state = RepositoryState(
+            repository=repo_name,
+            coverage_start=since_date,
+            last_commit_sha=previous.last_commit_sha if previous else None,
+            last_commit_timestamp=previous.last_commit_timestamp if previous else None,
+            last_pr_updated_at=previous.last_pr_updated_at if previous else None,
+            repository_info=data['repository_info'],
+            contributors=data['contributors'],
+            commits=commits,
+            pull_requests=prs,
+            fields=sorted(self.required_fields) if self.required_fields is not None else None
+        )
+        
+        # Con elementos que fallaron, las marcas no avanzan: la próxima
+        # ejecución vuelve a pedir desde las anteriores y los recuperados se
+        # fusionan con el dataset guardado
+        errors = getattr(self._collection, 'errors', 0)
+        if errors:
+            logger.warning(f"⚠️  {errors} elementos no se pudieron recopilar, "
+                           f"las marcas de agua no avanzan")
+            self._save_state(state)
+            return
+        
+        # Las marcas solo avanzan: un repositorio sin actividad conserva las anteriores.
+        # La de commits es la fecha del committer (un commit rebasado o
+        # fusionado tarde conserva una fecha de autor más antigua)
+        dated_commits = [commit for commit in commits if (commit.committed_at or commit.timestamp)]
+        latest_commit = max(dated_commits, key=lambda c: as_utc(c.committed_at or c.timestamp), default=None)
+        if latest_commit:
+            latest_date = as_utc(latest_commit.committed_at or latest_commit.timestamp)
+            if state.last_commit_timestamp is None or latest_date >= as_utc(state.last_commit_timestamp):
+                state.last_commit_sha = latest_commit.sha
+                state.last_commit_timestamp = latest_date
+        
+        pr_updates = [as_utc(pr.updated_at) for pr in prs if pr.updated_at]
+        if pr_updates and (state.last_pr_updated_at is None or
+                           max(pr_updates) > as_utc(state.last_pr_updated_at)):
+            state.last_pr_updated_at = max(pr_updates)
+        
+        self._save_state(state)
+    
+    def _save_state(self, state: RepositoryState):
+        """Guarda el estado incremental de un repositorio."""
+        try:
+            self.state_store.save(state)
+        except OSError as e:
+            logger.warning(f"⚠️  No se pudo guardar el estado incremental: {e}")
+    
+    def _record_collection_error(self):
+        """Anota un elemento o listado que no se pudo recopilar en la ejecución en curso."""
+        self._collection.errors = getattr(self._collection, 'errors', 0) + 1
+    
     def _extract_repo_name(self, repo_url: str) -> str:
         """
         Extrae el nombre del repositorio de diferentes formatos de URL.
@@ -174,109 +440,452 @@ class GitHubCollector:
             'default_branch': repo.default_branch
         }
     
-    def _collect_commits(self, repo: Repository, since_date: datetime) -> List[CommitData]:
+    def _collect_commit_history(self, repo: Repository, since_date: datetime,
+                                exclude_shas: Optional[Set[str]] = None) -> List[CommitData]:
         """
-        Recopila información de commits desde una fecha específica.
+        Recopila los commits desde un mirror git local si está configurado,
+        o desde la API en caso contrario.
+        """
+        local = self._open_local_mirror(repo)
+        if local:
+            commits = local.collect_commits(since=since_date, exclude_shas=exclude_shas,
+                                            with_files=self._needs('commit.files_changed'))
+            logger.info(f"📂 {len(commits)} commits obtenidos del mirror local")
+            return commits
+        
+        return self._collect_commits(repo, since_date, exclude_shas=exclude_shas)
+    
+    def _iter_commit_history(self, repo: Repository, since_date: datetime,
+                             exclude_shas: Optional[Set[str]] = None) -> Iterator[CommitData]:
+        """Versión en streaming de _collect_commit_history."""
+        local = self._open_local_mirror(repo)
+        if local:
+            return local.iter_commits(since=since_date, exclude_shas=exclude_shas,
+                                      with_files=self._needs('commit.files_changed'))
+        
+        return self._iter_commits(repo, since_date, exclude_shas=exclude_shas)
+    
+    def _open_local_mirror(self, repo: Repository) -> Optional[LocalGitCollector]:
+        """Clona o actualiza el mirror local del repositorio, si está configurado."""
+        if not self.local_clone_dir:
+            return None
+        
+        try:
+            return LocalGitCollector.clone_or_update(
+                repo.clone_url,
+                str(Path(self.local_clone_dir) / f"{repo.full_name}.git"),
+                identity_map=self.identity_map
+            )
+        except LocalGitError as e:
+            logger.warning(f"⚠️  Mirror local no disponible, se usa la API: {e}")
+            return None
+    
+    def _collect_commits(self, repo: Repository, since_date: datetime,
+                         exclude_shas: Optional[Set[str]] = None) -> List[CommitData]:
         """
-        commits_data = []
+        Recopila información de commits desde una fecha específica.
         
+        Args:
+            repo: Repositorio de PyGithub
+            since_date: Fecha desde la que recopilar
+            exclude_shas: SHAs ya conocidos que no hace falta volver a procesar
+        """
+        return list(self._iter_commits(repo, since_date, exclude_shas=exclude_shas))
+    
+    def _iter_commits(self, repo: Repository, since_date: datetime,
+                      exclude_shas: Optional[Set[str]] = None) -> Iterator[CommitData]:
+        """Recorre los commits desde una fecha a medida que llegan las páginas."""
         try:
-            commits = repo.get_commits(since=since_date)
+            listing = repo.get_commits(since=since_date)
+            commits = (commit for commit in listing if not exclude_shas or commit.sha not in exclude_shas)
             
-            for commit in commits:
-                try:
-                    # Información básica del commit
-                    commit_data = CommitData(
-                        sha=commit.sha,
-                        author=commit.author.login if commit.author else 'Unknown',
-                        author_email=commit.commit.author.email,
-                        message=commit.commit.message,
-                        timestamp=commit.commit.author.date,
-                        files_changed=[file.filename for file in commit.files],
-                        additions=commit.stats.additions,
-                        deletions=commit.stats.deletions
-                    )
-                    
-                    commits_data.append(commit_data)
-                    
-                    # Control de rate limiting
-                    time.sleep(self.rate_limit_delay)
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️  Error procesando commit {commit.sha}: {e}")
-                    continue
+            if not self._needs('commit.files_changed'):
+                # El listado ya trae autor, mensaje y fecha: sin llamada por commit
+                for commit in commits:
+                    yield self._commit_from_listing(commit)
+                return
+            
+            yield from self._iter_items(commits, self._build_commit_data,
+                                        lambda commit: f"commit {commit.sha}")
                     
         except GithubException as e:
             logger.error(f"❌ Error obteniendo commits: {e}")
-        
-        return commits_data
+            self._record_collection_error()
     
-    def _collect_pull_requests(self, repo: Repository, since_date: datetime) -> List[PullRequestData]:
+    def _collect_pull_requests(self, repo: Repository, since_date: datetime,
+                               exclude_updated_at: Optional[datetime] = None) -> List[PullRequestData]:
         """
         Recopila información de pull requests desde una fecha específica.
-        """
-        prs_data = []
         
+        Args:
+            repo: Repositorio de PyGithub
+            since_date: Fecha desde la que recopilar
+            exclude_updated_at: Omitir también los PRs actualizados exactamente
+                en esta fecha (ya procesados en la ejecución anterior)
+        """
+        return list(self._iter_pull_requests(repo, since_date, exclude_updated_at=exclude_updated_at))
+    
+    def _iter_pull_requests(self, repo: Repository, since_date: datetime,
+                            exclude_updated_at: Optional[datetime] = None) -> Iterator[PullRequestData]:
+        """Recorre los PRs actualizados desde una fecha a medida que llegan las páginas."""
         try:
             # Obtener PRs recientes
             pulls = repo.get_pulls(state='all', sort='updated', direction='desc')
             
-            for pr in pulls:
-                # Filtrar por fecha
-                if pr.updated_at < since_date:
-                    break
-                
-                try:
-                    # Recopilar comentarios
-                    comments = []
-                    for comment in pr.get_issue_comments():
-                        comments.append({
-                            'author': comment.user.login,
-                            'body': comment.body,
-                            'created_at': comment.created_at
-                        })
-                    
-                    # Recopilar reviews
-                    reviews = []
-                    for review in pr.get_reviews():
-                        reviews.append({
-                            'author': review.user.login,
-                            'state': review.state,
-                            'body': review.body or '',
-                            'submitted_at': review.submitted_at
-                        })
-                    
-                    pr_data = PullRequestData(
-                        number=pr.number,
-                        title=pr.title,
-                        author=pr.user.login,
-                        state=pr.state,
-                        created_at=pr.created_at,
-                        merged_at=pr.merged_at,
-                        comments=comments,
-                        reviews=reviews,
-                        files_changed=[file.filename for file in pr.get_files()]
-                    )
-                    
-                    prs_data.append(pr_data)
-                    
-                    # Control de rate limiting
-                    time.sleep(self.rate_limit_delay)
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️  Error procesando PR #{pr.number}: {e}")
-                    continue
+            # Filtrar por fecha (la lista viene ordenada por actualización)
+            recent_pulls = self._take_while_updated_since(pulls, since_date)
+            if exclude_updated_at:
+                recent_pulls = (pr for pr in recent_pulls
+                                if as_utc(pr.updated_at) != as_utc(exclude_updated_at))
+            yield from self._iter_items(recent_pulls, self._build_pull_request_data,
+                                        lambda pr: f"PR #{pr.number}")
                     
         except GithubException as e:
             logger.error(f"❌ Error obteniendo pull requests: {e}")
+            self._record_collection_error()
+    
+    def _take_while_updated_since(self, pulls: Iterable[Any], since_date: datetime) -> Iterable[Any]:
+        """Recorre los PRs hasta encontrar el primero anterior a la fecha límite."""
+        since_date = as_utc(since_date)
+        for pr in pulls:
+            if as_utc(pr.updated_at) < since_date:
+                break
+            yield pr
+    
+    def _build_commit_data(self, commit: Any) -> CommitData:
+        """
+        Construye CommitData a partir de los detalles de un commit.
+        
+        Los detalles de un commit nunca cambian, así que se sirven desde la
+        caché sin ninguna llamada a la API cuando ya se obtuvieron antes.
+        """
+        details, _ = self._request_json(commit.url, immutable=True)
+        
+        author = details.get('author') or {}
+        git_author = details['commit']['author']
+        git_committer = details['commit'].get('committer') or {}
+        stats = details.get('stats') or {}
+        
+        return CommitData(
+            sha=details['sha'],
+            author=self._resolve_commit_author(author.get('login'), git_author),
+            author_email=git_author.get('email'),
+            message=details['commit']['message'],
+            timestamp=_parse_datetime(git_author.get('date')),
+            files_changed=[file['filename'] for file in details.get('files', [])],
+            additions=stats.get('additions', 0),
+            deletions=stats.get('deletions', 0),
+            committed_at=_parse_datetime(git_committer.get('date'))
+        )
+    
+    def _commit_from_listing(self, commit: Any) -> CommitData:
+        """
+        Construye CommitData (sin archivos ni líneas) con los datos del listado.
+        
+        Solo se leen atributos presentes en la página, así que PyGithub no
+        hace ninguna llamada adicional.
+        """
+        git_author = commit.commit.author
+        
+        return CommitData(
+            sha=commit.sha,
+            author=self._resolve_commit_author(
+                commit.author.login if commit.author else None,
+                {'email': git_author.email, 'name': git_author.name}
+            ),
+            author_email=git_author.email,
+            message=commit.commit.message,
+            timestamp=git_author.date,
+            files_changed=[],
+            additions=0,
+            deletions=0,
+            committed_at=commit.commit.committer.date
+        )
+    
+    def _resolve_commit_author(self, login: Optional[str], git_author: Dict[str, Any]) -> str:
+        """
+        Determina el autor de un commit.
+        
+        Si la API trae el login se memoriza su email; si no (email sin
+        cuenta vinculada) se consulta el mapa de identidades y, en último
+        caso, se usa el nombre de git para no perder el commit.
+        """
+        email = git_author.get('email')
+        name = git_author.get('name')
+        
+        if login:
+            self.identity_map.learn(email, login)
+            return login
+        
+        return self.identity_map.resolve(email, name) or name or 'Unknown'
+    
+    def _build_pull_request_data(self, pr: Any) -> PullRequestData:
+        """
+        Construye PullRequestData con comentarios, reviews y archivos del PR.
+        
+        Cada listado es una llamada paginada por PR; solo se piden los que
+        necesita algún analizador.
+        """
+        # Recopilar comentarios
+        comments = []
+        if self._needs('pull_request.comments'):
+            keep_body = self._needs('pull_request.comments.body')
+            for comment in self._request_paginated(f"{pr.issue_url}/comments"):
+                comments.append({
+                    'author': _login(comment.get('user')),
+                    'body': comment.get('body') if keep_body else None,
+                    'created_at': _parse_datetime(comment.get('created_at'))
+                })
+        
+        # Recopilar reviews
+        reviews = []
+        if self._needs('pull_request.reviews'):
+            keep_body = self._needs('pull_request.reviews.body')
+            for review in self._request_paginated(f"{pr.url}/reviews"):
+                reviews.append({
+                    'author': _login(review.get('user')),
+                    'state': review.get('state'),
+                    'body': (review.get('body') or '') if keep_body else '',
+                    'submitted_at': _parse_datetime(review.get('submitted_at'))
+                })
+        
+        files = []
+        if self._needs('pull_request.files_changed'):
+            files = self._request_paginated(f"{pr.url}/files")
+        
+        return PullRequestData(
+            number=pr.number,
+            title=pr.title,
+            author=pr.user.login,
+            state=pr.state,
+            created_at=pr.created_at,
+            merged_at=pr.merged_at,
+            comments=comments,
+            reviews=reviews,
+            files_changed=[file['filename'] for file in files],
+            updated_at=pr.updated_at
+        )
+    
+    def _create_session(self) -> requests.Session:
+        """Crea la sesión HTTP usada para las llamadas REST con caché."""
+        session = requests.Session()
+        session.headers.update({
+            'Authorization': f'token {self.github_token}',
+            'Accept': 'application/vnd.github+json'
+        })
+        
+        # Un pool de conexiones por worker concurrente
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, self.max_workers))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        return session
+    
+    def _request_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                      immutable: bool = False) -> Tuple[Any, Optional[str]]:
+        """
+        Realiza un GET a la API REST pasando por la caché de respuestas.
+        
+        Args:
+            url: URL absoluta o ruta relativa a la API
+            params: Parámetros de la query
+            immutable: Si la respuesta nunca cambia y puede reutilizarse sin revalidar
+            
+        Returns:
+            Tupla (cuerpo JSON, URL de la página siguiente o None)
+        """
+        if not url.startswith('http'):
+            url = f"{self.api_url}/{url.lstrip('/')}"
+        
+        cached = self.response_cache.get(url, params) if self.response_cache else None
+        if cached and cached.immutable:
+            return cached.body, cached.next_url
+        
+        # Petición condicional si ya tenemos una versión de la respuesta
+        headers = {}
+        if cached:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+        
+        response = self._send('core', lambda: self.session.get(url, params=params, headers=headers, timeout=30))
+        
+        if response.status_code == 304 and cached:
+            # Las respuestas 304 no consumen rate limit
+            self.rate_limiter.release('core')
+            self.response_cache.touch(url, params)
+            return cached.body, cached.next_url
+        
+        response.raise_for_status()
+        body = response.json()
+        next_url = response.links.get('next', {}).get('url')
+        
+        if self.response_cache:
+            self.response_cache.put(
+                url, params, body,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                next_url=next_url,
+                immutable=immutable
+            )
+        
+        return body, next_url
+    
+    def _send(self, resource: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Realiza una llamada reservando presupuesto del rate limiter.
+        
+        Si la API la rechaza por rate limit, el recurso se pausa en el
+        limitador compartido hasta el reset o el Retry-After (también para
+        las llamadas en curso de otros workers) y se repite, como mucho
+        RATE_LIMIT_RETRIES veces.
+        
+        Args:
+            resource: Recurso de la API ('core', 'graphql')
+            send: Función que realiza la llamada HTTP
         
-        return prs_data
+        Returns:
+            La última respuesta recibida
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(resource)
+            response = send()
+            self.rate_limiter.update_from_headers(response.headers, default_resource=resource)
+            
+            retry_at = _rate_limit_retry_at(response)
+            if retry_at is None or attempt >= RATE_LIMIT_RETRIES:
+                return response
+            
+            attempt += 1
+            logger.warning(f"⏳ Rate limit '{resource}' (HTTP {response.status_code}), reintento "
+                           f"{attempt}/{RATE_LIMIT_RETRIES} en {max(0.0, retry_at - time.time()):.0f}s")
+            self.rate_limiter.pause(resource, retry_at)
+    
+    def _request_paginated(self, url: str, params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Obtiene todas las páginas de un listado de la API REST."""
+        items = []
+        params = dict(params or {}, per_page=100)
+        
+        while url:
+            page, url = self._request_json(url, params)
+            items.extend(page)
+            # Las URLs de las páginas siguientes ya incluyen la query
+            params = None
+        
+        return items
+    
+    def _collect_items(self, items: Iterable[Any], builder: Callable[[Any], Any],
+                       describe: Callable[[Any], str]) -> List[Any]:
+        """
+        Construye los datos de cada elemento, en secuencia o con un pool de workers.
+        
+        Args:
+            items: Elementos paginados de PyGithub (commits o PRs)
+            builder: Función que obtiene los detalles de un elemento
+            describe: Función que describe un elemento para los logs
+            
+        Returns:
+            Lista de resultados en el mismo orden que los elementos
+        """
+        return list(self._iter_items(items, builder, describe))
+    
+    def _iter_items(self, items: Iterable[Any], builder: Callable[[Any], Any],
+                    describe: Callable[[Any], str]) -> Iterator[Any]:
+        """
+        Versión en streaming de _collect_items: entrega cada resultado en
+        cuanto está listo, respetando el orden de los elementos.
+        """
+        def fetch(item):
+            try:
+                return builder(item)
+            finally:
+                self._sync_rate_limit()
+        
+        if self.max_workers <= 1:
+            return self._iter_items_sequentially(items, fetch, describe)
+        return self._iter_items_concurrently(items, fetch, describe)
+    
+    def _iter_items_sequentially(self, items: Iterable[Any], fetch: Callable[[Any], Any],
+                                 describe: Callable[[Any], str]) -> Iterator[Any]:
+        """Procesa los elementos uno a uno."""
+        for item in items:
+            try:
+                result = fetch(item)
+            except Exception as e:
+                logger.warning(f"⚠️  Error procesando {describe(item)}: {e}")
+                self._record_collection_error()
+                continue
+            
+            yield result
+            
+            # Delay opcional adicional al rate limiter
+            if self.rate_limit_delay > 0:
+                time.sleep(self.rate_limit_delay)
+    
+    def _iter_items_concurrently(self, items: Iterable[Any], fetch: Callable[[Any], Any],
+                                 describe: Callable[[Any], str]) -> Iterator[Any]:
+        """
+        Procesa los elementos con un pool acotado de threads.
+        
+        La paginación se recorre en el thread principal mientras los workers
+        obtienen los detalles de cada elemento. Como mucho hay dos elementos
+        en vuelo por worker, así que la paginación avanza al ritmo del
+        consumidor y la memoria no depende del tamaño de la historia.
+        """
+        max_pending = self.max_workers * 2
+        pending: Deque[Tuple[Any, Future]] = deque()
+        
+        def next_result():
+            item, future = pending.popleft()
+            try:
+                return True, future.result()
+            except Exception as e:
+                logger.warning(f"⚠️  Error procesando {describe(item)}: {e}")
+                self._record_collection_error()
+                return False, None
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for item in items:
+                    pending.append((item, executor.submit(fetch, item)))
+                    
+                    while len(pending) >= max_pending:
+                        ok, result = next_result()
+                        if ok:
+                            yield result
+                
+                while pending:
+                    ok, result = next_result()
+                    if ok:
+                        yield result
+            finally:
+                # Si el consumidor deja de iterar, no pedir más detalles
+                for _, future in pending:
+                    future.cancel()
+    
+    def _sync_rate_limit(self):
+        """
+        Actualiza el rate limiter con el presupuesto de la última respuesta.
+        
+        PyGithub guarda las cabeceras X-RateLimit-Remaining/Limit/Reset de
+        cada respuesta, así que no hace falta ninguna llamada adicional.
+        """
+        try:
+            remaining, limit = self.github.rate_limiting
+            reset_time = self.github.rate_limiting_resettime
+        except Exception as e:
+            logger.debug(f"No se pudo leer el rate limit: {e}")
+            return
+        
+        self.rate_limiter.update('core', limit, remaining, reset_time)
     
     def _collect_contributors(self, repo: Repository) -> List[Dict[str, Any]]:
         """
         Recopila información de contributors del repositorio.
         """
-        contributors_data = []
+        contributors_data: List[Dict[str, Any]] = []
         
         try:
             contributors = repo.get_contributors()
@@ -299,14 +908,52 @@ class GitHubCollector:
         except GithubException as e:
             logger.error(f"❌ Error obteniendo contributors: {e}")
         
+        self.identity_map.learn_logins(contributor['login'] for contributor in contributors_data)
+        
         return contributors_data
     
+    def list_organization_repositories(self, org: str, include_archived: bool = False,
+                                       include_forks: bool = False) -> List[str]:
+        """
+        Lista los repositorios de una organización.
+        
+        Args:
+            org: Nombre de la organización
+            include_archived: Incluir repositorios archivados
+            include_forks: Incluir forks
+            
+        Returns:
+            Nombres en formato 'owner/repo'
+        """
+        repos = []
+        
+        try:
+            for repo in self.github.get_organization(org).get_repos(type='all'):
+                if repo.archived and not include_archived:
+                    continue
+                if repo.fork and not include_forks:
+                    continue
+                repos.append(repo.full_name)
+                
+        except GithubException as e:
+            logger.error(f"❌ Error listando repositorios de {org}: {e}")
+            raise
+        
+        logger.info(f"🏢 {len(repos)} repositorios encontrados en {org}")
+        return repos
+    
     def get_rate_limit_info(self) -> Dict[str, Any]:
         """
         Obtiene información sobre el rate limit actual.
         """
         try:
             rate_limit = self.github.get_rate_limit()
+            
+            for resource in ('core', 'search'):
+                budget = getattr(rate_limit, resource)
+                self.rate_limiter.update(resource, budget.limit, budget.remaining,
+                                         budget.reset.timestamp())
+            
             return {
                 'core': {
                     'limit': rate_limit.core.limit,
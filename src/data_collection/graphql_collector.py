@@ -0,0 +1,372 @@
+"""
+Recopilador de datos de GitHub basado en la API GraphQL v4.
+
+Obtiene en lotes paginados de 100 elementos:
+- Pull requests con sus comentarios, reviews y rutas de archivos anidados
+- Commits de la rama principal con additions/deletions
+
+Produce las mismas estructuras CommitData/PullRequestData que el
+recopilador REST, de modo que los analizadores funcionan sin cambios, con
+una o dos órdenes de magnitud menos de llamadas a la API.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterator, Set
+
+from github import GithubException
+from github.Repository import Repository
+
+from .github_collector import GitHubCollector, _parse_datetime, _login
+from .incremental_store import as_utc
+from .models import CommitData, PullRequestData
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 100
+
+RATE_LIMIT_FRAGMENT = "rateLimit { limit cost remaining resetAt }"
+
+COMMITS_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp!, $cursor: String) {
+  %s
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: %d, since: $since, after: $cursor) {
+            pageInfo { hasNextPage endCursor }
+            nodes {
+              oid
+              message
+              additions
+              deletions
+              committedDate
+              author { name email date user { login } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" % (RATE_LIMIT_FRAGMENT, PAGE_SIZE)
+
+PULL_REQUEST_FIELDS = "number title state createdAt mergedAt updatedAt author { login }"
+
+# Conexiones anidadas de un PR y el campo de COLLECTABLE_FIELDS que las
+# requiere; solo se incluyen en la consulta las que pide algún analizador
+PULL_REQUEST_CONNECTIONS = {
+    'comments': 'pull_request.comments',
+    'reviews': 'pull_request.reviews',
+    'files': 'pull_request.files_changed',
+}
+
+NESTED_CONNECTION_FIELDS = {
+    'comments': "author { login } createdAt",
+    'reviews': "author { login } state submittedAt",
+    'files': "path",
+}
+
+# Conexiones cuyo texto ('body') solo se pide si lo necesita un analizador
+CONNECTIONS_WITH_BODY = {'comments', 'reviews'}
+
+CONNECTION_FRAGMENT = """
+  %%(connection)s(first: %d) {
+    pageInfo { hasNextPage endCursor }
+    nodes { %%(fields)s }
+  }
+""" % PAGE_SIZE
+
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  %s
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: %d, after: $cursor, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { %%(fields)s }
+    }
+  }
+}
+""" % (RATE_LIMIT_FRAGMENT, PAGE_SIZE)
+
+# Consulta para completar conexiones anidadas con más de 100 elementos
+
+NESTED_CONNECTION_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $cursor: String) {
+  %s
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      %%(connection)s(first: %d, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes { %%(fields)s }
+      }
+    }
+  }
+}
+""" % (RATE_LIMIT_FRAGMENT, PAGE_SIZE)
+
+
+class GraphQLError(Exception):
+    """Error devuelto por la API GraphQL de GitHub."""
+
+
+class GraphQLCollector(GitHubCollector):
+    """
+    Recopilador de GitHub que usa consultas GraphQL en bloque.
+    
+    La información general del repositorio y los contributors siguen usando
+    la API REST (una sola llamada cada uno).
+    """
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Inicializa el recopilador con configuración.
+        
+        Args:
+            config: Diccionario de configuración con token de GitHub
+        """
+        super().__init__(config)
+        self.graphql_url = config['github'].get('graphql_url', f"{self.api_url}/graphql")
+        
+        # GraphQL no expone las rutas de archivos de un commit: se completan
+        # con el detalle REST, inmutable y servido desde la caché HTTP
+        self.fetch_commit_files = config['github'].get('graphql_commit_files', True)
+    
+    def _iter_commits(self, repo: Repository, since_date: datetime,
+                      exclude_shas: Optional[Set[str]] = None) -> Iterator[CommitData]:
+        """
+        Recorre los commits de la rama principal en lotes de 100.
+        """
+        commits = self._iter_commit_nodes(repo, since_date, exclude_shas or set())
+        
+        if not self.fetch_commit_files or not self._needs('commit.files_changed'):
+            return commits
+        
+        return self._iter_items(
+            commits,
+            lambda commit: self._add_commit_files(repo.full_name, commit),
+            lambda commit: f"commit {commit.sha}"
+        )
+    
+    def _iter_commit_nodes(self, repo: Repository, since_date: datetime,
+                           exclude_shas: Set[str]) -> Iterator[CommitData]:
+        """Recorre las páginas de la historia y produce los commits sin archivos."""
+        owner, name = repo.full_name.split('/')
+        
+        try:
+            cursor = None
+            while True:
+                data = self._graphql(COMMITS_QUERY, {
+                    'owner': owner,
+                    'name': name,
+                    'since': as_utc(since_date).isoformat(),
+                    'cursor': cursor
+                })
+                
+                branch = data['repository']['defaultBranchRef']
+                if not branch:
+                    break
+                
+                history = branch['target']['history']
+                for node in history['nodes']:
+                    if node['oid'] not in exclude_shas:
+                        yield self._commit_from_node(node)
+                
+                if not history['pageInfo']['hasNextPage']:
+                    break
+                cursor = history['pageInfo']['endCursor']
+        
+        except (GraphQLError, GithubException) as e:
+            logger.error(f"❌ Error obteniendo commits: {e}")
+            self._record_collection_error()
+    
+    def _iter_pull_requests(self, repo: Repository, since_date: datetime,
+                            exclude_updated_at: Optional[datetime] = None) -> Iterator[PullRequestData]:
+        """
+        Recorre los PRs actualizados desde una fecha, con comentarios,
+        reviews y archivos anidados en la misma consulta.
+        """
+        owner, name = repo.full_name.split('/')
+        since_date = as_utc(since_date)
+        exclude_updated_at = as_utc(exclude_updated_at)
+        query = self._pull_requests_query()
+        
+        try:
+            cursor = None
+            while True:
+                data = self._graphql(query, {
+                    'owner': owner,
+                    'name': name,
+                    'cursor': cursor
+                })
+                
+                pulls = data['repository']['pullRequests']
+                reached_since = False
+                
+                for node in pulls['nodes']:
+                    updated_at = as_utc(_parse_datetime(node['updatedAt']))
+                    
+                    # La lista viene ordenada por actualización
+                    if updated_at < since_date:
+                        reached_since = True
+                        break
+                    if exclude_updated_at and updated_at == exclude_updated_at:
+                        continue
+                    
+                    try:
+                        pr = self._pull_request_from_node(owner, name, node)
+                    except (GraphQLError, KeyError, TypeError) as e:
+                        logger.warning(f"⚠️  Error procesando PR #{node.get('number')}: {e}")
+                        self._record_collection_error()
+                        continue
+                    
+                    yield pr
+                
+                if reached_since or not pulls['pageInfo']['hasNextPage']:
+                    break
+                cursor = pulls['pageInfo']['endCursor']
+        
+        except (GraphQLError, GithubException) as e:
+            logger.error(f"❌ Error obteniendo pull requests: {e}")
+            self._record_collection_error()
+    
+    def _pull_requests_query(self) -> str:
+        """Construye la consulta de PRs con solo las conexiones necesarias."""
+        fields = [PULL_REQUEST_FIELDS]
+        
+        for connection, field in PULL_REQUEST_CONNECTIONS.items():
+            if self._needs(field):
+                fields.append(CONNECTION_FRAGMENT % {
+                    'connection': connection,
+                    'fields': self._connection_fields(connection)
+                })
+        
+        return PULL_REQUESTS_QUERY % {'fields': ''.join(fields)}
+    
+    def _connection_fields(self, connection: str) -> str:
+        """Campos de los nodos de una conexión anidada de un PR."""
+        fields = NESTED_CONNECTION_FIELDS[connection]
+        
+        if connection in CONNECTIONS_WITH_BODY and self._needs(f"{PULL_REQUEST_CONNECTIONS[connection]}.body"):
+            fields += " body"
+        
+        return fields
+    
+    def _commit_from_node(self, node: Dict[str, Any]) -> CommitData:
+        """Construye CommitData a partir de un nodo Commit de GraphQL."""
+        author = node.get('author') or {}
+        login = (author.get('user') or {}).get('login')
+        
+        return CommitData(
+            sha=node['oid'],
+            author=self._resolve_commit_author(login, author),
+            author_email=author.get('email'),
+            message=node['message'],
+            timestamp=_parse_datetime(author.get('date')),
+            files_changed=[],
+            additions=node.get('additions', 0),
+            deletions=node.get('deletions', 0),
+            committed_at=_parse_datetime(node.get('committedDate'))
+        )
+    
+    def _add_commit_files(self, repo_name: str, commit: CommitData) -> CommitData:
+        """Completa las rutas de archivos de un commit con su detalle REST."""
+        details, _ = self._request_json(f"repos/{repo_name}/commits/{commit.sha}", immutable=True)
+        commit.files_changed = [file['filename'] for file in details.get('files', [])]
+        return commit
+    
+    def _pull_request_from_node(self, owner: str, name: str, node: Dict[str, Any]) -> PullRequestData:
+        """Construye PullRequestData a partir de un nodo PullRequest de GraphQL."""
+        comments = self._complete_connection(owner, name, node, 'comments')
+        reviews = self._complete_connection(owner, name, node, 'reviews')
+        files = self._complete_connection(owner, name, node, 'files')
+        
+        return PullRequestData(
+            number=node['number'],
+            title=node['title'],
+            author=_login(node.get('author')),
+            # REST solo distingue 'open' y 'closed'; un PR fusionado está cerrado
+            state='open' if node['state'] == 'OPEN' else 'closed',
+            created_at=_parse_datetime(node['createdAt']),
+            merged_at=_parse_datetime(node.get('mergedAt')),
+            comments=[{
+                'author': _login(comment.get('author')),
+                'body': comment.get('body'),
+                'created_at': _parse_datetime(comment.get('createdAt'))
+            } for comment in comments],
+            reviews=[{
+                'author': _login(review.get('author')),
+                'state': review.get('state'),
+                'body': review.get('body') or '',
+                'submitted_at': _parse_datetime(review.get('submittedAt'))
+            } for review in reviews],
+            files_changed=[file['path'] for file in files],
+            updated_at=_parse_datetime(node['updatedAt'])
+        )
+    
+    def _complete_connection(self, owner: str, name: str, node: Dict[str, Any],
+                             connection: str) -> List[Dict[str, Any]]:
+        """
+        Devuelve todos los elementos de una conexión anidada de un PR.
+        
+        La consulta principal trae los primeros 100; solo los PRs con más
+        elementos necesitan consultas adicionales. Las conexiones que no se
+        pidieron en la consulta quedan vacías.
+        """
+        if connection not in node:
+            return []
+        
+        items = list(node[connection]['nodes'])
+        page_info = node[connection]['pageInfo']
+        
+        query = NESTED_CONNECTION_QUERY % {
+            'connection': connection,
+            'fields': self._connection_fields(connection)
+        }
+        
+        while page_info['hasNextPage']:
+            data = self._graphql(query, {
+                'owner': owner,
+                'name': name,
+                'number': node['number'],
+                'cursor': page_info['endCursor']
+            })
+            page = data['repository']['pullRequest'][connection]
+            items.extend(page['nodes'])
+            page_info = page['pageInfo']
+        
+        return items
+    
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ejecuta una consulta GraphQL respetando el presupuesto 'graphql'.
+        
+        Returns:
+            El campo 'data' de la respuesta
+        
+        Raises:
+            GraphQLError: Si la API devuelve errores
+        """
+        response = self._send('graphql', lambda: self.session.post(
+            self.graphql_url, json={'query': query, 'variables': variables}, timeout=60))
+        
+        if response.status_code >= 400:
+            raise GraphQLError(f"HTTP {response.status_code}: {response.text[:200]}")
+        
+        payload = response.json()
+        if payload.get('errors'):
+            messages = '; '.join(error.get('message', '') for error in payload['errors'])
+            raise GraphQLError(messages)
+        
+        data = payload['data']
+        self._sync_graphql_budget(data.get('rateLimit'))
+        return data
+    
+    def _sync_graphql_budget(self, rate_limit: Optional[Dict[str, Any]]):
+        """Actualiza el rate limiter con el bloque rateLimit de la respuesta."""
+        if not rate_limit:
+            return
+        
+        reset_time = _parse_datetime(rate_limit['resetAt']).timestamp()
+        self.rate_limiter.update('graphql', rate_limit['limit'], rate_limit['remaining'], reset_time)
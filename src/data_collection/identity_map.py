@@ -0,0 +1,149 @@
+"""
+Mapa persistente de identidades de autores: email de git → login de GitHub.
+
+Los commits solo traen el email y el nombre configurados en git; el login
+de GitHub aparece únicamente cuando el email está vinculado a una cuenta.
+Este mapa se alimenta de:
+
+- Cada commit recopilado con login (REST o GraphQL), en esta y en
+  ejecuciones anteriores (se guarda en disco)
+- Los logins de los contributors del repositorio, obtenidos en bloque
+
+y se consulta antes de dar un autor por desconocido.
+"""
+
+import re
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+IDENTITY_FORMAT_VERSION = 1
+
+# Emails privados de GitHub: 12345+login@users.noreply.github.com
+NOREPLY_EMAIL = re.compile(r'^(?:\d+\+)?(?P<login>[^@]+)@users\.noreply\.github\.com$', re.IGNORECASE)
+
+
+class IdentityMap:
+    """
+    Mapa email → login, seguro entre threads y opcionalmente persistente.
+    """
+    
+    def __init__(self, path: Optional[str] = None, emails: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            path: Archivo JSON donde guardar el mapa (None = solo en memoria)
+            emails: Entradas iniciales email → login
+        """
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._emails: Dict[str, str] = {}
+        self._logins: Dict[str, str] = {}  # login en minúsculas → login
+        self._dirty = False
+        
+        if self.path:
+            self._load()
+        
+        for email, login in (emails or {}).items():
+            self.learn(email, login)
+        self._dirty = False
+    
+    def __len__(self) -> int:
+        return len(self._emails)
+    
+    def learn(self, email: Optional[str], login: Optional[str]):
+        """Registra que un email pertenece a un login."""
+        if not login or login == 'Unknown':
+            return
+        
+        with self._lock:
+            self._logins.setdefault(login.lower(), login)
+            
+            if email:
+                email = email.lower()
+                if self._emails.get(email) != login:
+                    self._emails[email] = login
+                    self._dirty = True
+    
+    def learn_logins(self, logins: Iterable[str]):
+        """Registra logins conocidos (p. ej. los contributors del repositorio)."""
+        with self._lock:
+            for login in logins:
+                if login:
+                    self._logins.setdefault(login.lower(), login)
+    
+    def resolve(self, email: Optional[str], name: Optional[str] = None) -> Optional[str]:
+        """
+        Busca el login de un autor de git.
+        
+        Orden: mapa de emails, email noreply de GitHub y, por último, un
+        nombre de git que coincida con un login conocido. Las coincidencias
+        se memorizan para las siguientes consultas.
+        
+        Returns:
+            El login o None si no hay coincidencia
+        """
+        email = (email or '').lower()
+        
+        with self._lock:
+            if email in self._emails:
+                return self._emails[email]
+            
+            match = NOREPLY_EMAIL.match(email)
+            if match:
+                login = match.group('login')
+            else:
+                login = self._logins.get((name or '').strip().lower())
+            
+            if login and email:
+                self._emails[email] = login
+                self._dirty = True
+            
+            return login
+    
+    def save(self):
+        """Guarda el mapa en disco de forma atómica si ha cambiado."""
+        if not self.path or not self._dirty:
+            return
+        
+        # Los workers del modo por lotes comparten el mapa: una escritura a la vez
+        with self._lock:
+            raw = {
+                'format_version': IDENTITY_FORMAT_VERSION,
+                'emails': dict(sorted(self._emails.items()))
+            }
+            
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(raw, f, ensure_ascii=False, indent=1)
+                tmp_path.replace(self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"⚠️  No se pudo guardar el mapa de identidades: {e}")
+    
+    def _load(self):
+        """Carga el mapa guardado, si existe."""
+        if not self.path.exists():
+            return
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  No se pudo leer el mapa de identidades: {e}")
+            return
+        
+        if raw.get('format_version') != IDENTITY_FORMAT_VERSION:
+            logger.warning("⚠️  Mapa de identidades con formato antiguo, se ignora")
+            return
+        
+        for email, login in raw.get('emails', {}).items():
+            self._emails[email.lower()] = login
+            self._logins.setdefault(login.lower(), login)
+        
+        logger.info(f"🪪 {len(self._emails)} identidades cargadas")
@@ -0,0 +1,190 @@
+"""
+Estado persistente para la recopilación incremental de repositorios.
+
+Por cada repositorio se guarda en disco (JSON) el último dataset recopilado
+y sus marcas de agua:
+
+- SHA y fecha de commit (committer) del último commit visto
+- Fecha `updated_at` más reciente de los pull requests
+
+En la siguiente ejecución solo se piden a la API los commits y PRs
+posteriores a esas marcas, y se fusionan con el dataset guardado.
+"""
+
+import json
+import logging
+from pathlib import Path
+from datetime import datetime, timezone
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any
+
+from .models import CommitData, PullRequestData
+
+logger = logging.getLogger(__name__)
+
+STATE_FORMAT_VERSION = 1
+
+
+@dataclass
+class RepositoryState:
+    """Dataset y marcas de agua guardados de un repositorio."""
+    repository: str
+    coverage_start: datetime  # Fecha más antigua cubierta por el dataset
+    last_commit_sha: Optional[str] = None
+    last_commit_timestamp: Optional[datetime] = None  # Fecha del committer
+    last_pr_updated_at: Optional[datetime] = None
+    repository_info: Dict[str, Any] = field(default_factory=dict)
+    contributors: List[Dict[str, Any]] = field(default_factory=list)
+    commits: List[CommitData] = field(default_factory=list)
+    pull_requests: List[PullRequestData] = field(default_factory=list)
+    fields: Optional[List[str]] = None  # Campos recopilados (None = todos)
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normaliza un datetime a UTC con zona horaria (naive se asume UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def merge_commits(stored: List[CommitData], new: List[CommitData],
+                  since_date: datetime) -> List[CommitData]:
+    """
+    Fusiona commits nuevos con los guardados, sin duplicados por SHA.
+    
+    Descarta los commits anteriores a la ventana de análisis y devuelve el
+    resultado ordenado del más reciente al más antiguo.
+    """
+    by_sha = {commit.sha: commit for commit in stored}
+    by_sha.update((commit.sha, commit) for commit in new)
+    
+    since_date = as_utc(since_date)
+    commits = [commit for commit in by_sha.values()
+               if commit.timestamp is None or as_utc(commit.timestamp) >= since_date]
+    
+    return sorted(commits, key=lambda c: as_utc(c.timestamp) or since_date, reverse=True)
+
+
+def merge_pull_requests(stored: List[PullRequestData], new: List[PullRequestData],
+                        since_date: datetime) -> List[PullRequestData]:
+    """
+    Fusiona PRs nuevos con los guardados; la versión nueva de un PR reemplaza a la anterior.
+    
+    Descarta los PRs sin actividad dentro de la ventana de análisis.
+    """
+    by_number = {pr.number: pr for pr in stored}
+    by_number.update((pr.number, pr) for pr in new)
+    
+    since_date = as_utc(since_date)
+    
+    def last_activity(pr: PullRequestData) -> datetime:
+        return as_utc(pr.updated_at or pr.created_at) or since_date
+    
+    prs = [pr for pr in by_number.values() if last_activity(pr) >= since_date]
+    
+    return sorted(prs, key=last_activity, reverse=True)
+
+
+class RepositoryStateStore:
+    """
+    Almacén en disco del estado incremental, un archivo JSON por repositorio.
+    """
+    
+    def __init__(self, base_dir: str):
+        """
+        Args:
+            base_dir: Directorio donde guardar los estados
+        """
+        self.base_dir = Path(base_dir)
+    
+    def load(self, repository: str) -> Optional[RepositoryState]:
+        """
+        Carga el estado guardado de un repositorio.
+        
+        Returns:
+            El estado o None si no existe o no se puede leer
+        """
+        path = self._state_path(repository)
+        if not path.exists():
+            return None
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+            
+            if raw.get('format_version') != STATE_FORMAT_VERSION:
+                logger.warning(f"⚠️  Estado incremental de {repository} con formato antiguo, se ignora")
+                return None
+            
+            return RepositoryState(
+                repository=raw['repository'],
+                coverage_start=_parse(raw['coverage_start']),
+                last_commit_sha=raw.get('last_commit_sha'),
+                last_commit_timestamp=_parse(raw.get('last_commit_timestamp')),
+                last_pr_updated_at=_parse(raw.get('last_pr_updated_at')),
+                repository_info=raw.get('repository_info', {}),
+                contributors=raw.get('contributors', []),
+                commits=[_commit_from_dict(c) for c in raw.get('commits', [])],
+                pull_requests=[_pull_request_from_dict(pr) for pr in raw.get('pull_requests', [])],
+                fields=raw.get('fields')
+            )
+        
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️  No se pudo leer el estado incremental de {repository}: {e}")
+            return None
+    
+    def save(self, state: RepositoryState):
+        """Guarda el estado de un repositorio de forma atómica."""
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        
+        raw = asdict(state)
+        raw['format_version'] = STATE_FORMAT_VERSION
+        
+        path = self._state_path(state.repository)
+        tmp_path = path.with_suffix('.tmp')
+        
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(raw, f, ensure_ascii=False, default=_serialize)
+        tmp_path.replace(path)
+    
+    def _state_path(self, repository: str) -> Path:
+        """Ruta del archivo de estado de un repositorio ('owner/repo')."""
+        return self.base_dir / f"{repository.replace('/', '__')}.json"
+
+
+def _serialize(value: Any) -> Any:
+    """Serializa los tipos no soportados por JSON (fechas)."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    """Convierte una fecha ISO guardada a datetime."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _commit_from_dict(raw: Dict[str, Any]) -> CommitData:
+    """Reconstruye un CommitData guardado."""
+    raw = dict(raw)
+    raw['timestamp'] = _parse(raw.get('timestamp'))
+    raw['committed_at'] = _parse(raw.get('committed_at'))
+    return CommitData(**raw)
+
+
+def _pull_request_from_dict(raw: Dict[str, Any]) -> PullRequestData:
+    """Reconstruye un PullRequestData guardado, incluidas las fechas anidadas."""
+    raw = dict(raw)
+    for key in ('created_at', 'merged_at', 'updated_at'):
+        raw[key] = _parse(raw.get(key))
+    
+    raw['comments'] = [dict(comment, created_at=_parse(comment.get('created_at')))
+                       for comment in raw.get('comments', [])]
+    raw['reviews'] = [dict(review, submitted_at=_parse(review.get('submitted_at')))
+                      for review in raw.get('reviews', [])]
+    
+    return PullRequestData(**raw)
@@ -0,0 +1,271 @@
+"""
+Recopilador de commits desde un clon local de git.
+
+Toda la información de un commit (autor, email, mensaje, fecha, archivos y
+líneas añadidas/eliminadas) está disponible en `git log --numstat`, sin
+necesidad de una llamada a la API por commit. Este módulo:
+
+- Clona o actualiza un mirror bare del repositorio
+- Recorre `git log` en streaming y produce CommitData
+- Funciona sin red contra mirrors ya sincronizados
+
+Las llamadas a la API quedan reservadas para PRs, reviews y comentarios.
+"""
+
+import logging
+import subprocess
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Iterator, Set, Union
+
+from .models import CommitData
+from .identity_map import IdentityMap
+
+logger = logging.getLogger(__name__)
+
+# Separadores de registro del formato de git log
+COMMIT_START = '\x1e'
+FIELD_SEPARATOR = '\x1f'
+HEADER_END = '\x1d'
+
+# Refspec del mirror: `git clone --bare` no configura ninguno, y sin él
+# `git fetch` solo escribe FETCH_HEAD y las ramas (y HEAD) no avanzan
+MIRROR_REFSPEC = '+refs/heads/*:refs/heads/*'
+
+LOG_FORMAT = (f"{COMMIT_START}%H{FIELD_SEPARATOR}%an{FIELD_SEPARATOR}%ae"
+              f"{FIELD_SEPARATOR}%aI{FIELD_SEPARATOR}%cI{FIELD_SEPARATOR}%B{HEADER_END}")
+
+
+class LocalGitError(Exception):
+    """Error al ejecutar git sobre un clon local."""
+
+
+class LocalGitCollector:
+    """
+    Recopilador de commits basado en `git log` sobre un clon local.
+    """
+    
+    def __init__(self, repo_path: str, identity_map: Union[IdentityMap, Dict[str, str], None] = None,
+                 git_executable: str = 'git'):
+        """
+        Inicializa el recopilador sobre un clon existente.
+        
+        Args:
+            repo_path: Ruta al clon (normal o bare)
+            identity_map: Mapa de identidades (o dict email → login) para los autores
+            git_executable: Ejecutable de git a usar
+        """
+        self.repo_path = Path(repo_path)
+        if not isinstance(identity_map, IdentityMap):
+            identity_map = IdentityMap(emails=identity_map)
+        self.identity_map = identity_map
+        self.git_executable = git_executable
+        
+        if not self.repo_path.exists():
+            raise LocalGitError(f"No existe el clon local: {self.repo_path}")
+    
+    @classmethod
+    def clone_or_update(cls, repo_url: str, destination: str, shallow_since: Optional[datetime] = None,
+                        git_executable: str = 'git', **kwargs) -> 'LocalGitCollector':
+        """
+        Clona un mirror bare del repositorio o lo actualiza si ya existe.
+        
+        Si la actualización falla (por ejemplo, sin red) se usa el mirror tal
+        como está.
+        
+        Args:
+            repo_url: URL clonable del repositorio
+            destination: Ruta del mirror bare
+            shallow_since: Limitar la historia clonada a partir de esta fecha
+            git_executable: Ejecutable de git a usar
+        
+        Returns:
+            Recopilador sobre el mirror
+        """
+        path = Path(destination)
+        
+        if path.exists():
+            command = [git_executable, '--git-dir', str(path), 'fetch', '--prune', 'origin']
+            if shallow_since:
+                command.append(f'--shallow-since={shallow_since.isoformat()}')
+            
+            try:
+                # Los mirrors creados antes de configurar el refspec también se corrigen
+                cls._set_mirror_refspec(path, git_executable)
+                subprocess.run(command, check=True, capture_output=True, text=True)
+                logger.info(f"🔄 Mirror local actualizado: {path}")
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.warning(f"⚠️  No se pudo actualizar el mirror local, se usa tal cual: {e}")
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            command = [git_executable, 'clone', '--bare', '--quiet']
+            if shallow_since:
+                command.append(f'--shallow-since={shallow_since.isoformat()}')
+            command.extend([repo_url, str(path)])
+            
+            try:
+                subprocess.run(command, check=True, capture_output=True, text=True)
+                cls._set_mirror_refspec(path, git_executable)
+                logger.info(f"📥 Mirror local creado: {path}")
+            except (OSError, subprocess.CalledProcessError) as e:
+                raise LocalGitError(f"No se pudo clonar {repo_url}: {e}") from e
+        
+        return cls(str(path), git_executable=git_executable, **kwargs)
+    
+    @staticmethod
+    def _set_mirror_refspec(destination: Path, git_executable: str):
+        """Hace que `fetch origin` actualice las ramas del mirror (y con ellas HEAD)."""
+        subprocess.run([git_executable, '--git-dir', str(destination), 'config',
+                        'remote.origin.fetch', MIRROR_REFSPEC], check=True, capture_output=True, text=True)
+    
+    def iter_commits(self, since: Optional[datetime] = None, revision: str = 'HEAD',
+                     exclude_shas: Optional[Set[str]] = None, with_files: bool = True) -> Iterator[CommitData]:
+        """
+        Recorre los commits en streaming, del más reciente al más antiguo.
+        
+        Args:
+            since: Fecha desde la que recorrer la historia
+            revision: Revisión de inicio (por defecto HEAD)
+            exclude_shas: SHAs ya conocidos que se omiten
+            with_files: Incluir archivos y líneas cambiadas (--numstat)
+        
+        Yields:
+            CommitData de cada commit
+        """
+        command = [
+            self.git_executable, '-c', 'core.quotepath=off',
+            '--git-dir' if self._is_bare() else '-C', str(self.repo_path),
+            'log', revision, f'--format={LOG_FORMAT}'
+        ]
+        if with_files:
+            command.extend(['--numstat', '--no-renames'])
+        if since:
+            command.append(f'--since={since.isoformat()}')
+        
+        exclude_shas = exclude_shas or set()
+        
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       text=True, encoding='utf-8', errors='replace')
+        except OSError as e:
+            raise LocalGitError(f"No se pudo ejecutar git: {e}") from e
+        
+        try:
+            for commit in self._parse_log(process.stdout):
+                if commit.sha not in exclude_shas:
+                    yield commit
+        finally:
+            # Si el consumidor deja de iterar, no dejar el proceso colgado
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            stderr = process.stderr.read()
+            process.stderr.close()
+            return_code = process.wait()
+            if return_code not in (0, -9) and stderr:
+                logger.warning(f"⚠️  git log terminó con errores: {stderr.strip()}")
+    
+    def collect_commits(self, since: Optional[datetime] = None, exclude_shas: Optional[Set[str]] = None,
+                        with_files: bool = True) -> List[CommitData]:
+        """Recopila los commits desde una fecha en una lista."""
+        return list(self.iter_commits(since=since, exclude_shas=exclude_shas, with_files=with_files))
+    
+    def collect_repository_data(self, days_back: int = 30) -> Dict[str, Any]:
+        """
+        Recopila los datos disponibles sin acceso a la API (solo commits).
+        
+        Args:
+            days_back: Días hacia atrás para analizar
+        
+        Returns:
+            Diccionario con la misma estructura que GitHubCollector
+        """
+        since_date = datetime.now(timezone.utc) - timedelta(days=days_back)
+        commits = self.collect_commits(since=since_date)
+        
+        logger.info(f"📊 Datos recopilados del clon local: {len(commits)} commits")
+        
+        return {
+            'repository_info': {'name': self.repo_path.name, 'local_path': str(self.repo_path)},
+            'commits': commits,
+            'pull_requests': [],
+            'contributors': [],
+            'collection_metadata': {
+                'collected_at': datetime.now(timezone.utc),
+                'days_analyzed': days_back,
+                'since_date': since_date,
+                'source': 'local_git'
+            }
+        }
+    
+    def resolve_author(self, name: str, email: str) -> str:
+        """
+        Obtiene el login de GitHub de un autor de git.
+        
+        Usa el mapa de identidades; si no hay coincidencia se usa el nombre
+        del autor en git.
+        """
+        return self.identity_map.resolve(email, name) or name or 'Unknown'
+    
+    def _parse_log(self, lines: Iterator[str]) -> Iterator[CommitData]:
+        """Convierte la salida de `git log --numstat` en CommitData."""
+        header_lines: List[str] = []
+        in_header = False
+        current: Optional[CommitData] = None
+        
+        for line in lines:
+            if line.startswith(COMMIT_START):
+                if current:
+                    yield current
+                current = None
+                header_lines = [line[1:]]
+                in_header = True
+            elif in_header:
+                header_lines.append(line)
+            else:
+                if current and line.strip():
+                    self._add_numstat(current, line)
+                continue
+            
+            if in_header and HEADER_END in line:
+                in_header = False
+                current = self._commit_from_header(''.join(header_lines))
+        
+        if current:
+            yield current
+    
+    def _commit_from_header(self, header: str) -> CommitData:
+        """Construye un CommitData (sin archivos) a partir de la cabecera formateada."""
+        header = header[:header.rindex(HEADER_END)]
+        sha, name, email, date, committed, message = header.split(FIELD_SEPARATOR, 5)
+        
+        return CommitData(
+            sha=sha,
+            author=self.resolve_author(name, email),
+            author_email=email,
+            message=message.rstrip('\n'),
+            timestamp=datetime.fromisoformat(date),
+            files_changed=[],
+            additions=0,
+            deletions=0,
+            committed_at=datetime.fromisoformat(committed)
+        )
+    
+    def _add_numstat(self, commit: CommitData, line: str):
+        """Añade una línea de numstat ('añadidas<TAB>eliminadas<TAB>ruta') al commit."""
+        parts = line.rstrip('\n').split('\t', 2)
+        if len(parts) != 3:
+            return
+        
+        additions, deletions, path = parts
+        commit.files_changed.append(path)
+        
+        # Los archivos binarios aparecen como '-'
+        if additions.isdigit():
+            commit.additions += int(additions)
+        if deletions.isdigit():
+            commit.deletions += int(deletions)
+    
+    def _is_bare(self) -> bool:
+        """Indica si el clon es un repositorio bare."""
+        return not (self.repo_path / '.git').exists() and (self.repo_path / 'HEAD').exists()
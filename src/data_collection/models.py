@@ -0,0 +1,85 @@
+"""
+Estructuras de datos comunes a los recopiladores del Proyecto Empathy.
+"""
+
+from datetime import datetime
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Optional, Set, Any
+from dataclasses import dataclass
+
+# Campos que un analizador puede declarar como necesarios (REQUIRED_FIELDS).
+# Los que implican llamadas adicionales por elemento son los que el
+# recopilador omite cuando ningún analizador los pide:
+# - commit.files_changed: detalle de cada commit (archivos y líneas)
+# - pull_request.comments / .reviews / .files_changed: un listado paginado por PR
+# - *.body: el texto de comentarios y reviews
+COLLECTABLE_FIELDS = frozenset({
+    'commit.author',
+    'commit.message',
+    'commit.timestamp',
+    'commit.files_changed',
+    'pull_request.author',
+    'pull_request.title',
+    'pull_request.comments',
+    'pull_request.comments.body',
+    'pull_request.reviews',
+    'pull_request.reviews.body',
+    'pull_request.files_changed',
+})
+
+
+@dataclass
+class CommitData:
+    """Estructura de datos para información de commits."""
+    sha: str
+    author: str
+    author_email: str
+    message: str
+    timestamp: datetime
+    files_changed: List[str]
+    additions: int
+    deletions: int
+    committed_at: Optional[datetime] = None  # Fecha del committer (la que filtra `since`)
+
+
+@dataclass
+class PullRequestData:
+    """Estructura de datos para información de pull requests."""
+    number: int
+    title: str
+    author: str
+    state: str
+    created_at: datetime
+    merged_at: Optional[datetime]
+    comments: List[Dict[str, Any]]
+    reviews: List[Dict[str, Any]]
+    files_changed: List[str]
+    updated_at: Optional[datetime] = None
+
+
+def merge_required_fields(requirements: Iterable[Optional[AbstractSet[str]]]) -> Optional[FrozenSet[str]]:
+    """
+    Une los campos requeridos por varios analizadores.
+    
+    Returns:
+        Los campos necesarios, o None si alguno necesita todos
+    """
+    merged: Set[str] = set()
+    for fields in requirements:
+        if fields is None:
+            return None
+        merged.update(fields)
+    return frozenset(merged)
+
+
+def needs_field(required: Optional[AbstractSet[str]], field: str) -> bool:
+    """
+    Indica si hay que recopilar un campo.
+    
+    Un campo se necesita si se pide él mismo o alguno de sus subcampos
+    (pedir 'pull_request.comments.body' implica recopilar los comentarios).
+    None significa que se recopila todo.
+    """
+    if required is None:
+        return True
+    prefix = field + '.'
+    return any(name == field or name.startswith(prefix) for name in required)
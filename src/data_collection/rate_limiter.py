@@ -0,0 +1,217 @@
+"""
+Rate limiter compartido para la API de GitHub.
+
+GitHub asigna un presupuesto de llamadas por ventana de tiempo y recurso
+(core, search, graphql) y lo informa en las cabeceras X-RateLimit-*. Este
+módulo mantiene ese presupuesto como un token bucket:
+
+- Cada llamada consume tokens sin esperas mientras quede presupuesto
+- Con el presupuesto agotado se espera exactamente hasta el reset
+- Las cabeceras de cada respuesta corrigen el estado local
+- Un rate limit devuelto por la API (403/429) pausa el recurso para todos
+  los threads hasta el reset o el Retry-After
+
+Un mismo limitador se comparte entre todos los colectores del proceso que
+usan el mismo token, para que varios repositorios analizados a la vez no
+gasten el presupuesto por separado.
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Duración de la ventana de rate limit de GitHub por recurso (segundos)
+RESOURCE_WINDOWS = {
+    'core': 3600,
+    'search': 60,
+    'graphql': 3600,
+}
+
+
+@dataclass
+class RateLimitBudget:
+    """Presupuesto de llamadas de un recurso de la API."""
+    limit: int
+    remaining: int
+    reset_time: float  # Timestamp Unix del próximo reset
+    confirmed: bool = True  # False si el reset se estimó localmente
+
+
+class GitHubRateLimiter:
+    """
+    Token bucket thread-safe alimentado por las cabeceras de rate limit.
+    """
+    
+    def __init__(self, reserve: int = 0):
+        """
+        Inicializa el limitador.
+        
+        Args:
+            reserve: Llamadas que se dejan sin gastar en cada ventana
+        """
+        self.reserve = max(0, reserve)
+        self._budgets: Dict[str, RateLimitBudget] = {}
+        self._paused_until: Dict[str, float] = {}
+        self._condition = threading.Condition()
+    
+    def acquire(self, resource: str = 'core', cost: int = 1) -> float:
+        """
+        Reserva tokens para una o varias llamadas, esperando si es necesario.
+        
+        Args:
+            resource: Recurso de la API ('core', 'search', 'graphql')
+            cost: Número de llamadas que se van a realizar
+        
+        Returns:
+            Segundos esperados hasta obtener los tokens
+        """
+        waited = 0.0
+        
+        with self._condition:
+            while True:
+                now = time.time()
+                
+                # La API rechazó una llamada: nadie llama hasta la fecha indicada
+                paused_seconds = self._paused_until.get(resource, 0.0) - now
+                if paused_seconds > 0:
+                    self._condition.wait(timeout=paused_seconds)
+                    waited += time.time() - now
+                    continue
+                
+                budget = self._budgets.get(resource)
+                
+                # Sin información todavía: la primera respuesta la aportará
+                if budget is None:
+                    return waited
+                
+                if now >= budget.reset_time:
+                    self._refill(resource, budget, now)
+                
+                if budget.remaining - cost >= self.reserve:
+                    budget.remaining -= cost
+                    return waited
+                
+                wait_seconds = budget.reset_time - now
+                logger.warning(f"⏳ Rate limit '{resource}' agotado ({budget.remaining} restantes), "
+                               f"esperando {wait_seconds:.0f}s hasta el reset")
+                self._condition.wait(timeout=wait_seconds + 1)
+                waited += time.time() - now
+    
+    def release(self, resource: str = 'core', cost: int = 1):
+        """
+        Devuelve tokens reservados que finalmente no se consumieron.
+        
+        Se usa, por ejemplo, tras una respuesta 304 a una petición condicional,
+        que GitHub no descuenta del rate limit.
+        """
+        with self._condition:
+            budget = self._budgets.get(resource)
+            if budget is not None:
+                budget.remaining = min(budget.limit, budget.remaining + cost)
+                self._condition.notify_all()
+    
+    def pause(self, resource: str, until: float):
+        """
+        Bloquea las llamadas a un recurso hasta una fecha.
+        
+        Se usa cuando la API rechaza una llamada por rate limit (presupuesto
+        agotado antes de lo que indicaba el estado local o rate limit
+        secundario con Retry-After): las llamadas en curso de otros threads
+        también esperan en acquire().
+        
+        Args:
+            resource: Recurso de la API
+            until: Timestamp Unix hasta el que no se llama
+        """
+        with self._condition:
+            self._paused_until[resource] = max(self._paused_until.get(resource, 0.0), until)
+            self._condition.notify_all()
+    
+    def update(self, resource: str, limit: int, remaining: int, reset_time: float):
+        """
+        Actualiza el presupuesto con los valores informados por GitHub.
+        
+        Dentro de la misma ventana se conserva el valor más bajo, ya que los
+        tokens reservados por llamadas en curso aún no se reflejan en la API.
+        """
+        if limit is None or limit < 0 or remaining is None or remaining < 0:
+            return
+        
+        with self._condition:
+            budget = self._budgets.get(resource)
+            
+            if budget is None or not budget.confirmed or reset_time > budget.reset_time:
+                self._budgets[resource] = RateLimitBudget(limit, remaining, reset_time)
+            else:
+                budget.limit = limit
+                budget.remaining = min(budget.remaining, remaining)
+            
+            self._condition.notify_all()
+    
+    def update_from_headers(self, headers: Mapping[str, str], default_resource: str = 'core'):
+        """
+        Actualiza el presupuesto a partir de las cabeceras X-RateLimit-* de una respuesta.
+        
+        Args:
+            headers: Cabeceras HTTP de la respuesta (sin distinguir mayúsculas)
+            default_resource: Recurso a usar si falta X-RateLimit-Resource
+        """
+        normalized = {key.lower(): value for key, value in headers.items()}
+        
+        try:
+            limit = int(normalized['x-ratelimit-limit'])
+            remaining = int(normalized['x-ratelimit-remaining'])
+            reset_time = float(normalized['x-ratelimit-reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+        
+        resource = normalized.get('x-ratelimit-resource', default_resource)
+        self.update(resource, limit, remaining, reset_time)
+    
+    def get_budget(self, resource: str = 'core') -> Optional[Dict[str, Any]]:
+        """Devuelve una copia del presupuesto actual de un recurso."""
+        with self._condition:
+            budget = self._budgets.get(resource)
+            if budget is None:
+                return None
+            return {
+                'limit': budget.limit,
+                'remaining': budget.remaining,
+                'reset_time': budget.reset_time
+            }
+    
+    def _refill(self, resource: str, budget: RateLimitBudget, now: float):
+        """Rellena el bucket al pasar el reset de la ventana."""
+        budget.remaining = budget.limit
+        budget.reset_time = now + RESOURCE_WINDOWS.get(resource, 3600)
+        budget.confirmed = False
+
+
+_shared_limiters: Dict[str, GitHubRateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(token: str, reserve: int = 0) -> GitHubRateLimiter:
+    """
+    Devuelve el limitador compartido del proceso para un token de GitHub.
+    
+    Args:
+        token: Token de GitHub (el presupuesto es por token)
+        reserve: Reserva de llamadas si el limitador se crea ahora
+    
+    Returns:
+        Instancia única de GitHubRateLimiter para ese token
+    """
+    key = hashlib.sha256((token or '').encode('utf-8')).hexdigest()
+    
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = GitHubRateLimiter(reserve=reserve)
+            _shared_limiters[key] = limiter
+        return limiter
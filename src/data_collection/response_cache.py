@@ -0,0 +1,144 @@
+"""
+Caché persistente de respuestas de la API de GitHub.
+
+Guarda en SQLite el cuerpo de cada respuesta junto con sus cabeceras ETag y
+Last-Modified y la URL de la página siguiente, indexado por URL y parámetros.
+Permite:
+
+- Reutilizar sin ninguna llamada las respuestas inmutables (detalles de un
+  commit: un SHA nunca cambia)
+- Enviar peticiones condicionales (If-None-Match / If-Modified-Since) para el
+  resto; las respuestas 304 no consumen rate limit de GitHub
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """Respuesta almacenada en la caché."""
+    body: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    next_url: Optional[str]
+    immutable: bool
+    fetched_at: float
+
+
+class ResponseCache:
+    """
+    Caché de respuestas HTTP en SQLite, segura entre threads.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Abre (o crea) la caché en disco.
+        
+        Args:
+            path: Ruta del archivo SQLite
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                next_url TEXT,
+                immutable INTEGER NOT NULL DEFAULT 0,
+                fetched_at REAL NOT NULL,
+                body TEXT NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Genera la clave de caché para una URL y sus parámetros."""
+        canonical = json.dumps({'url': url, 'params': params or {}}, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[CachedResponse]:
+        """
+        Busca una respuesta en la caché.
+        
+        Returns:
+            La respuesta almacenada o None si no existe
+        """
+        key = self.make_key(url, params)
+        
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, next_url, immutable, fetched_at "
+                "FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        body, etag, last_modified, next_url, immutable, fetched_at = row
+        return CachedResponse(
+            body=json.loads(body),
+            etag=etag,
+            last_modified=last_modified,
+            next_url=next_url,
+            immutable=bool(immutable),
+            fetched_at=fetched_at
+        )
+    
+    def put(self, url: str, params: Optional[Dict[str, Any]], body: Any,
+            etag: Optional[str] = None, last_modified: Optional[str] = None,
+            next_url: Optional[str] = None, immutable: bool = False):
+        """Guarda (o reemplaza) una respuesta en la caché."""
+        key = self.make_key(url, params)
+        
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, etag, last_modified, next_url, immutable, fetched_at, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, next_url, int(immutable), time.time(), json.dumps(body))
+            )
+            self._connection.commit()
+    
+    def touch(self, url: str, params: Optional[Dict[str, Any]] = None):
+        """Marca una respuesta como revalidada (tras un 304)."""
+        key = self.make_key(url, params)
+        
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET fetched_at = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self._connection.commit()
+    
+    def stats(self) -> Dict[str, int]:
+        """Devuelve el número de entradas almacenadas."""
+        with self._lock:
+            total, immutable = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(immutable), 0) FROM responses"
+            ).fetchone()
+        
+        return {'entries': total, 'immutable_entries': immutable}
+    
+    def close(self):
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            self._connection.close()
@@ -6,18 +6,26 @@ para proporcionar insights sobre la salud y dinámicas de equipos de desarrollo.
 """
 
 import argparse
+import copy
+import json
 import logging
+import threading
 from pathlib import Path
 import sys
+from typing import Any, Dict
 
 # Añadir el directorio src al path para importaciones
 sys.path.append(str(Path(__file__).parent))
 
 from data_collection.github_collector import GitHubCollector
+from data_collection.graphql_collector import GraphQLCollector
+from data_collection.models import merge_required_fields
 from analysis.sentiment_analyzer import SentimentAnalyzer
+from analysis.sentiment_cache import SentimentCache
 from analysis.collaboration_analyzer import CollaborationAnalyzer
-from visualization.dashboard import Dashboard
+from analysis.activity_stream import REPOSITORY_INFO, COMMIT, PULL_REQUEST, analyze_activity
 from config.settings import load_config
+from batch_runner import BatchRunner, read_repos_file, to_json_compatible
 
 # Configurar logging
 logging.basicConfig(
@@ -26,52 +34,121 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Backends de recopilación disponibles (config github.backend)
+COLLECTOR_BACKENDS = {
+    'rest': GitHubCollector,
+    'graphql': GraphQLCollector,
+}
+
+# Análisis disponibles; la recopilación se limita a los campos que necesitan
+ANALYZERS = {
+    'sentiment': SentimentAnalyzer,
+    'collaboration': CollaborationAnalyzer,
+}
+
 
 class EmpathyAnalyzer:
     """
     Clase principal que coordina todo el proceso de análisis de empathy del equipo.
     """
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, analyses: list = None):
         """
         Inicializa el analizador con la configuración especificada.
         
         Args:
             config_path: Ruta al archivo de configuración
+            analyses: Análisis a ejecutar (por defecto, todos los de ANALYZERS)
         """
         self.config = load_config(config_path)
-        self.github_collector = GitHubCollector(self.config)
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.collaboration_analyzer = CollaborationAnalyzer()
-        self.dashboard = Dashboard()
         
-    def analyze_repository(self, repo_url: str, days_back: int = 30):
+        backend = self.config['github'].get('backend', 'rest')
+        if backend not in COLLECTOR_BACKENDS:
+            raise ValueError(f"Backend de recopilación desconocido: {backend}. "
+                             f"Opciones: {', '.join(COLLECTOR_BACKENDS)}")
+        self.github_collector = COLLECTOR_BACKENDS[backend](self.config)
+        
+        self.analyses = list(analyses or ANALYZERS)
+        unknown = [name for name in self.analyses if name not in ANALYZERS]
+        if unknown:
+            raise ValueError(f"Análisis desconocido: {', '.join(unknown)}. "
+                             f"Opciones: {', '.join(ANALYZERS)}")
+        
+        # Solo se recopila lo que usan los análisis elegidos (p. ej. sin
+        # colaboración no hace falta el detalle de cada commit)
+        self.github_collector.set_required_fields(merge_required_fields(
+            ANALYZERS[name].REQUIRED_FIELDS for name in self.analyses
+        ))
+        
+        # Caché de sentimiento compartida por los analizadores de todos los workers
+        self.sentiment_cache = None
+        if 'sentiment' in self.analyses:
+            self.sentiment_cache = SentimentCache(self.config.get('analysis', {}).get('sentiment_cache_path') or None)
+        
+        self._create_analyzers()
+        self._dashboard = None
+        
+        # Analizadores propios de cada worker del modo por lotes
+        self._workers = threading.local()
+        
+    @property
+    def dashboard(self):
+        """Dashboard web, creado al usarlo por primera vez (importa Flask)."""
+        if self._dashboard is None:
+            from visualization.dashboard import Dashboard
+            self._dashboard = Dashboard()
+        return self._dashboard
+        
+    def analyze_repository(self, repo_url: str, days_back: int = 30, incremental: bool = False,
+                           streaming: bool = False):
         """
         Realiza un análisis completo de empathy para un repositorio.
         
         Args:
             repo_url: URL del repositorio de GitHub
             days_back: Número de días hacia atrás para analizar
+            incremental: Recopilar solo la actividad nueva desde la última ejecución
+            streaming: Analizar commits y PRs a medida que se recopilan, sin
+                cargar la historia completa en memoria
             
         Returns:
             Diccionario con resultados del análisis
         """
         logger.info(f"� Iniciando análisis de empathy para: {repo_url}")
         
-        # 1. Recopilar datos del repositorio
-        logger.info("� Recopilando datos del repositorio...")
-        repo_data = self.github_collector.collect_repository_data(repo_url, days_back)
+        if streaming and incremental:
+            logger.warning("⚠️  El modo incremental necesita el dataset completo, se desactiva el streaming")
+            streaming = False
         
-        # 🚨 VALIDACIONES DE LIMITACIONES
-        self._validate_analysis_constraints(repo_data, days_back)
+        sentiment_results, collaboration_results = {}, {}
         
-        # 2. Análisis de sentimientos
-        logger.info("😊 Analizando sentimientos...")
-        sentiment_results = self.sentiment_analyzer.analyze_sentiment_patterns(repo_data)
-        
-        # 3. Análisis de colaboración
-        logger.info("🤝 Analizando patrones de colaboración...")
-        collaboration_results = self.collaboration_analyzer.analyze_collaboration_patterns(repo_data)
+        if streaming:
+            streamed = self._analyze_streaming(repo_url, days_back)
+            if streamed is None:
+                logger.error(f"❌ No se pudieron recopilar datos de {repo_url}")
+                return {}
+            sentiment_results, collaboration_results = streamed
+        else:
+            # 1. Recopilar datos del repositorio
+            logger.info("� Recopilando datos del repositorio...")
+            repo_data = self.github_collector.collect_repository_data(repo_url, days_back,
+                                                                      incremental=incremental)
+            if not repo_data:
+                logger.error(f"❌ No se pudieron recopilar datos de {repo_url}")
+                return {}
+            
+            # 🚨 VALIDACIONES DE LIMITACIONES
+            self._validate_analysis_constraints(repo_data, days_back)
+            
+            # 2. Análisis de sentimientos
+            if self.sentiment_analyzer:
+                logger.info("😊 Analizando sentimientos...")
+                sentiment_results = self.sentiment_analyzer.analyze_sentiment_patterns(repo_data)
+            
+            # 3. Análisis de colaboración
+            if self.collaboration_analyzer:
+                logger.info("🤝 Analizando patrones de colaboración...")
+                collaboration_results = self.collaboration_analyzer.analyze_collaboration_patterns(repo_data)
         
         # 4. Combinar resultados
         results = {
@@ -86,18 +163,145 @@ class EmpathyAnalyzer:
         logger.info("📊 Análisis completado exitosamente")
         return results
     
+    def analyze_repositories(self, repos: list, days_back: int = 30, incremental: bool = False,
+                             streaming: bool = False, max_workers: int = None, run_id: str = None,
+                             resume: bool = True) -> dict:
+        """
+        Analiza varios repositorios con un único cliente autenticado.
+        
+        Todos los workers comparten el recopilador (y con él la sesión HTTP,
+        la caché y el presupuesto de rate limit). Cada repositorio se guarda
+        en un checkpoint al terminar, de modo que una ejecución interrumpida
+        se reanuda sin repetir los repositorios completados.
+        
+        Args:
+            repos: Repositorios en formato owner/repo
+            days_back: Número de días hacia atrás para analizar
+            incremental: Recopilar solo la actividad nueva de cada repositorio
+            streaming: Analizar la actividad a medida que se recopila
+            max_workers: Repositorios en paralelo (por defecto, batch.max_workers)
+            run_id: Identificador de la ejecución a crear o reanudar
+            resume: Omitir los repositorios ya completados en esta ejecución
+            
+        Returns:
+            Resumen de la ejecución con los resultados de cada repositorio
+        """
+        batch_config = self.config.get('batch', {})
+        
+        runner = BatchRunner(
+            lambda repo: self._worker_analyzer().analyze_repository(
+                repo, days_back, incremental=incremental, streaming=streaming
+            ),
+            batch_config.get('checkpoint_dir', '.empathy_cache/batch'),
+            run_id=run_id,
+            max_workers=max_workers or batch_config.get('max_workers', 4)
+        )
+        
+        summary = runner.run(repos, resume=resume)
+        summary['results'] = runner.load_results()
+        return summary
+    
+    def _worker_analyzer(self) -> 'EmpathyAnalyzer':
+        """
+        Devuelve la instancia del worker actual.
+        
+        Los analizadores guardan estado durante un análisis, así que cada
+        thread tiene los suyos; el recopilador se comparte sin volver a
+        autenticar.
+        """
+        worker = getattr(self._workers, 'analyzer', None)
+        if worker is None:
+            worker = copy.copy(self)
+            worker._create_analyzers()
+            self._workers.analyzer = worker
+        return worker
+    
+    def _create_analyzers(self):
+        """Crea los analizadores de los análisis elegidos (None para el resto)."""
+        analysis_config = self.config.get('analysis', {})
+        self.sentiment_analyzer = None
+        if 'sentiment' in self.analyses:
+            self.sentiment_analyzer = SentimentAnalyzer(
+                model=analysis_config.get('sentiment_model', 'vader'),
+                workers=analysis_config.get('sentiment_workers', 1),
+                cache=self.sentiment_cache,
+                language=analysis_config.get('language', 'en'),
+                transformer_model=analysis_config.get('transformer_model') or None,
+                transformer_gate=analysis_config.get('transformer_gate', 0.5),
+                keep_texts=analysis_config.get('keep_texts', False),
+                dedup=analysis_config.get('sentiment_dedup', 'exact'),
+                exclude_bots=analysis_config.get('exclude_bots', False)
+            )
+        self.collaboration_analyzer = None
+        if 'collaboration' in self.analyses:
+            self.collaboration_analyzer = CollaborationAnalyzer(
+                window_days=analysis_config.get('collaboration_window_days') or None,
+                half_life_days=analysis_config.get('collaboration_half_life_days') or None
+            )
+    
+    def _analyze_streaming(self, repo_url: str, days_back: int):
+        """
+        Recopila y analiza el repositorio en una sola pasada.
+        
+        Cada commit o PR se entrega a los analizadores en cuanto llega de
+        la API y se descarta después. Las validaciones de limitaciones se
+        muestran al final, cuando se conocen los totales.
+        
+        Returns:
+            Tupla (resultados de sentimiento, resultados de colaboración), o
+            None si no se pudo acceder al repositorio
+        """
+        logger.info("🌊 Recopilando y analizando en streaming...")
+        
+        stats: Dict[str, Any] = {'repository_found': False, 'contributors': set(), 'commits': 0, 'pull_requests': 0}
+        
+        def tracked(activity):
+            for kind, item in activity:
+                if kind == REPOSITORY_INFO:
+                    stats['repository_found'] = True
+                elif kind == COMMIT:
+                    stats['commits'] += 1
+                    stats['contributors'].add(getattr(item, 'author', 'unknown'))
+                elif kind == PULL_REQUEST:
+                    stats['pull_requests'] += 1
+                yield kind, item
+        
+        analyzers = [analyzer for analyzer in (self.sentiment_analyzer, self.collaboration_analyzer) if analyzer]
+        results = dict(zip(analyzers, analyze_activity(
+            tracked(self.github_collector.stream_repository_data(repo_url, days_back)),
+            analyzers
+        )))
+        
+        if not stats['repository_found']:
+            return None
+        
+        self._warn_analysis_constraints(len(stats['contributors']), stats['commits'],
+                                        stats['pull_requests'], days_back)
+        
+        # Un análisis no elegido (None) queda vacío
+        return results.get(self.sentiment_analyzer, {}), results.get(self.collaboration_analyzer, {})
+    
     def _validate_analysis_constraints(self, repo_data: dict, days_back: int):
         """
         Valida limitaciones y muestra advertencias al usuario.
         """
-        warnings = []
-        
         # Validar número de contributores únicos
         contributors = set()
         for commit in repo_data.get('commits', []):
-            contributors.add(commit.get('author', 'unknown'))
+            author = commit.author if hasattr(commit, 'author') else commit.get('author', 'unknown')
+            contributors.add(author)
         
-        unique_contributors = len(contributors)
+        self._warn_analysis_constraints(len(contributors),
+                                        len(repo_data.get('commits', [])),
+                                        len(repo_data.get('pull_requests', [])),
+                                        days_back)
+    
+    def _warn_analysis_constraints(self, unique_contributors: int, total_commits: int,
+                                   total_prs: int, days_back: int):
+        """
+        Muestra advertencias si los datos no bastan para un análisis fiable.
+        """
+        warnings = []
         
         if unique_contributors < 3:
             warnings.append(
@@ -113,9 +317,6 @@ class EmpathyAnalyzer:
             )
         
         # Validar cantidad de datos
-        total_commits = len(repo_data.get('commits', []))
-        total_prs = len(repo_data.get('pull_requests', []))
-        
         if total_commits < 20:
             warnings.append(
                 f"⚠️  POCOS COMMITS: Solo {total_commits} commits encontrados. "
@@ -139,13 +340,21 @@ class EmpathyAnalyzer:
     def _generate_summary(self, sentiment_results: dict, collaboration_results: dict) -> dict:
         """
         Genera un resumen ejecutivo de los resultados del análisis.
+        
+        La salud general promedia solo las métricas de los análisis ejecutados.
         """
         # Calcular métricas de salud del equipo
         communication_health = sentiment_results.get('overall_sentiment_score', 0)
         collaboration_health = collaboration_results.get('collaboration_score', 0)
         knowledge_distribution = collaboration_results.get('knowledge_distribution_score', 0)
         
-        overall_health = (communication_health + collaboration_health + knowledge_distribution) / 3
+        components = []
+        if sentiment_results:
+            components.append(communication_health)
+        if collaboration_results:
+            components.extend([collaboration_health, knowledge_distribution])
+        
+        overall_health = sum(components) / len(components) if components else 0
         
         return {
             'overall_team_health': overall_health,
@@ -177,7 +386,7 @@ class EmpathyAnalyzer:
         recommendations = []
         
         # Recomendaciones basadas en sentimientos
-        if sentiment_results.get('overall_sentiment_score', 0) < 0.5:
+        if sentiment_results and sentiment_results.get('overall_sentiment_score', 0) < 0.5:
             recommendations.append({
                 'type': 'communication',
                 'priority': 'high',
@@ -192,7 +401,7 @@ class EmpathyAnalyzer:
                 'message': '🔍 Se detectaron silos de conocimiento. Considera implementar pair programming o code reviews cruzados.'
             })
         
-        if collaboration_results.get('collaboration_score', 0) < 0.5:
+        if collaboration_results and collaboration_results.get('collaboration_score', 0) < 0.5:
             recommendations.append({
                 'type': 'collaboration',
                 'priority': 'medium',
@@ -202,25 +411,92 @@ class EmpathyAnalyzer:
         return recommendations
 
 
+def run_batch(analyzer: EmpathyAnalyzer, args: argparse.Namespace):
+    """
+    Ejecuta el análisis por lotes de una organización o lista de repositorios.
+    """
+    if args.org:
+        repos = analyzer.github_collector.list_organization_repositories(
+            args.org, include_archived=args.include_archived
+        )
+    else:
+        repos = read_repos_file(args.repos_file)
+    
+    summary = analyzer.analyze_repositories(
+        repos, args.days,
+        incremental=args.incremental,
+        streaming=args.stream,
+        max_workers=args.batch_workers,
+        run_id=args.run_id,
+        resume=not args.restart
+    )
+    
+    print("\n" + "="*60)
+    print(f"🤝 REPORTE POR LOTES - EMPATHY ({summary['run_id']})")
+    print("="*60)
+    
+    for repo, results in summary['results'].items():
+        repo_summary = results['summary']
+        print(f"   {repo}: {repo_summary['health_status']} ({repo_summary['overall_team_health']:.2f})")
+    
+    if summary['failed']:
+        print("\n❌ REPOSITORIOS CON ERRORES:")
+        for repo, error in summary['failed'].items():
+            print(f"   {repo}: {error}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False, default=to_json_compatible)
+        logger.info(f"📄 Resultados guardados en: {args.output}")
+    
+    print(f"\n✅ {len(summary['results'])}/{len(repos)} repositorios analizados")
+    
+    if summary['failed']:
+        sys.exit(1)
+
+
 def main():
     """
     Función principal del programa.
     """
     parser = argparse.ArgumentParser(description='Empathy - Analizador de salud de equipos')
-    parser.add_argument('--repo', required=True, help='URL del repositorio de GitHub')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--repo', help='URL del repositorio de GitHub')
+    target.add_argument('--org', help='Analizar todos los repositorios de una organización')
+    target.add_argument('--repos-file', help='Archivo con un repositorio (owner/repo) por línea')
     parser.add_argument('--days', type=int, default=30, help='Días hacia atrás para analizar (default: 30)')
     parser.add_argument('--config', help='Ruta al archivo de configuración')
     parser.add_argument('--output', help='Archivo de salida para los resultados (JSON)')
     parser.add_argument('--web', action='store_true', help='Abrir dashboard web')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Recopilar solo la actividad nueva desde la última ejecución')
+    parser.add_argument('--stream', action='store_true',
+                        help='Analizar la actividad a medida que se recopila (memoria acotada)')
+    parser.add_argument('--batch-workers', type=int,
+                        help='Repositorios analizados en paralelo en modo lote (default: 4)')
+    parser.add_argument('--run-id', help='Identificador de la ejecución por lotes a crear o reanudar '
+                                         '(default: fecha de hoy)')
+    parser.add_argument('--restart', action='store_true',
+                        help='Repetir todos los repositorios aunque tengan checkpoint')
+    parser.add_argument('--include-archived', action='store_true',
+                        help='Con --org, incluir repositorios archivados')
+    parser.add_argument('--analyses', nargs='+', choices=list(ANALYZERS), default=list(ANALYZERS),
+                        help='Análisis a ejecutar; solo se recopilan los datos que necesitan '
+                             '(default: todos)')
     
     args = parser.parse_args()
     
     try:
         # Inicializar analizador
-        analyzer = EmpathyAnalyzer(args.config)
+        analyzer = EmpathyAnalyzer(args.config, analyses=args.analyses)
+        
+        if not args.repo:
+            run_batch(analyzer, args)
+            return
         
         # Realizar análisis
-        results = analyzer.analyze_repository(args.repo, args.days)
+        results = analyzer.analyze_repository(args.repo, args.days, incremental=args.incremental,
+                                              streaming=args.stream)
         
         if not results:
             logger.error("❌ El análisis falló")
@@ -244,9 +520,8 @@ def main():
         
         # Guardar resultados si se especifica
         if args.output:
-            import json
             with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+                json.dump(results, f, indent=2, ensure_ascii=False, default=to_json_compatible)
             logger.info(f"📄 Resultados guardados en: {args.output}")
         
         # Abrir dashboard web si se solicita
@@ -0,0 +1,89 @@
+"""
+Import-time benchmark for Empathy's command-line startup.
+
+Each scenario runs in a fresh interpreter (best of --repeat runs) so module
+caches from a previous scenario never hide the real cost. Besides the wall
+time, it reports which heavy optional modules each scenario pulled in:
+constructing a SentimentAnalyzer must not import NLTK/TextBlob, and
+importing the package must not import anything heavy at all.
+
+Usage:
+    python src/performance/import_benchmark.py --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from typing import Any, Dict, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Modules that are expensive to import and should only load when used
+HEAVY_MODULES = ['nltk', 'textblob', 'flask', 'networkx', 'scipy', 'pandas', 'numpy', 'github']
+
+SCENARIOS = {
+    'import src': 'import src',
+    'import sentiment_analyzer': 'import src.analysis.sentiment_analyzer',
+    'SentimentAnalyzer()': 'from src.analysis.sentiment_analyzer import SentimentAnalyzer; SentimentAnalyzer()',
+    'main.py --help': None,
+}
+
+# Runs a scenario and prints the heavy modules it imported as JSON
+PROBE = (
+    "import sys, json\n"
+    "{code}\n"
+    "print(json.dumps([name for name in {heavy!r} if name in sys.modules]))"
+)
+
+
+def run_scenario(name: str) -> Dict[str, Any]:
+    """Run one scenario once; return its wall time and the heavy modules it loaded."""
+    code = SCENARIOS[name]
+    if code is None:
+        command = [sys.executable, os.path.join(ROOT, 'src', 'main.py'), '--help']
+    else:
+        command = [sys.executable, '-c', PROBE.format(code=code, heavy=HEAVY_MODULES)]
+    
+    start = time.perf_counter()
+    output = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    
+    loaded = json.loads(output.stdout.strip().splitlines()[-1]) if code is not None else None
+    return {'seconds': elapsed, 'heavy_modules': loaded}
+
+
+def run_benchmark(repeat: int = 5) -> List[Dict[str, Any]]:
+    """Best-of-repeat wall time of every scenario, including bare interpreter startup."""
+    results = []
+    
+    baseline = min(_time_command([sys.executable, '-c', 'pass']) for _ in range(repeat))
+    results.append({'scenario': 'python -c pass', 'seconds': baseline, 'heavy_modules': []})
+    
+    for name in SCENARIOS:
+        runs = [run_scenario(name) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run['seconds'])
+        results.append({'scenario': name, **best})
+    
+    return results
+
+
+def _time_command(command: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Empathy import-time benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per scenario (best is reported)')
+    
+    args = parser.parse_args()
+    
+    print("⏱️ Startup time (fresh interpreter, best of %d)" % args.repeat)
+    for result in run_benchmark(args.repeat):
+        heavy = result['heavy_modules']
+        modules = '' if heavy is None else f"  heavy: {', '.join(heavy) or '-'}"
+        print(f"  {result['scenario']:<28} {result['seconds'] * 1000:7.0f} ms{modules}")
@@ -0,0 +1,156 @@
+"""
+Micro-benchmark for the dev-pattern sentiment adjustment.
+
+Compares the previous implementation of _get_dev_pattern_adjustment (one
+regex search per pattern of every language) with DevPatternMatcher on a
+synthetic corpus of commit messages, PR titles and review comments, and
+checks that both give the same adjustment for every text. It also times the
+per-language routing (only the packs of the languages detected in each
+text) and the compilation cost of the English pack versus all packs.
+
+Usage:
+    python src/performance/pattern_benchmark.py --texts 100000
+"""
+
+import re
+import os
+import sys
+import time
+import random
+import argparse
+import subprocess
+from typing import Callable, Dict, FrozenSet, List
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from analysis.sentiment_analyzer import SentimentAnalyzer
+from analysis.pattern_packs import available_languages, detect_languages, get_pattern_matcher, load_pattern_pack
+
+PLAIN_MESSAGES = [
+    'Fix typo in README', 'Add retry to the HTTP client', 'Update dependencies',
+    'Refactor user authentication module', 'Bump version to 1.2.0', 'Merge branch main into feature',
+    'Remove unused imports', 'Improve performance of data processing', 'Add tests for API endpoints',
+    'Actualizar documentación de instalación', 'Corregir validación del formulario',
+]
+
+DEV_PHRASES = [
+    'Good job on this one', 'Nice fix, thanks for the quick turnaround', 'Looks good to me',
+    'This is terrible, completely broken', 'What were you thinking here?', 'Still not working on CI',
+    'Keeps failing on Windows', 'This is confusing and unclear', 'Sloppy code, please clean it up',
+    'Muy buen trabajo', 'Gracias por el cambio', 'No funciona en producción', 'Qué desastre de merge',
+    'Está muy bien, me gusta esta solución', 'Es muy confuso', 'blocked by the release branch',
+]
+
+
+def generate_corpus(count: int, seed: int = 42, pattern_ratio: float = 0.3) -> List[str]:
+    """Generate a reproducible corpus where pattern_ratio of the texts contain dev phrases."""
+    rng = random.Random(seed)
+    corpus = []
+    
+    for index in range(count):
+        if rng.random() < pattern_ratio:
+            text = f"{rng.choice(DEV_PHRASES)}. {rng.choice(PLAIN_MESSAGES)}"
+        else:
+            text = rng.choice(PLAIN_MESSAGES)
+        corpus.append(f"{text} (#{index})")
+    
+    return corpus
+
+
+def make_legacy_adjustment() -> Callable[[str], float]:
+    """Rebuild the per-pattern adjustment that DevPatternMatcher replaced (every pack, every text)."""
+    compiled = []
+    for language in available_languages():
+        for category in load_pattern_pack(language)['categories'].values():
+            compiled.append((category['weight'], [re.compile(p, re.IGNORECASE) for p in category['patterns']]))
+    
+    def legacy_adjustment(text: str) -> float:
+        adjustment = 0.0
+        for weight, regexes in compiled:
+            matches = sum(1 for pattern in regexes if pattern.search(text))
+            if matches > 0:
+                adjustment += weight * matches
+        return max(-0.5, min(0.5, adjustment))
+    
+    return legacy_adjustment
+
+
+def time_per_text(function: Callable[[str], float], corpus: List[str], repeat: int) -> float:
+    """Best-of-repeat time per text, in microseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            function(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def run_benchmark(count: int, repeat: int = 3, seed: int = 42) -> Dict[str, float]:
+    """Run the implementations on the same corpus and compare them."""
+    analyzer = SentimentAnalyzer()
+    legacy = make_legacy_adjustment()
+    matcher = get_pattern_matcher(frozenset(available_languages())).adjustment
+    routed = analyzer._get_dev_pattern_adjustment
+    corpus = generate_corpus(count, seed=seed)
+    
+    mismatches = sum(1 for text in corpus if abs(legacy(text) - matcher(text)) > 1e-12)
+    routed_differences = sum(1 for text in corpus if abs(legacy(text) - routed(text)) > 1e-12)
+    legacy_us = time_per_text(legacy, corpus, repeat)
+    matcher_us = time_per_text(matcher, corpus, repeat)
+    routed_us = time_per_text(routed, corpus, repeat)
+    
+    # Monolingual org: only texts in which no other language is detected
+    english = [text for text in corpus if not detect_languages(text, skip={'en'})]
+    english_matcher_us = time_per_text(matcher, english, repeat)
+    english_routed_us = time_per_text(routed, english, repeat)
+    
+    return {
+        'texts': count,
+        'legacy_us_per_text': legacy_us,
+        'matcher_us_per_text': matcher_us,
+        'routed_us_per_text': routed_us,
+        'english_texts': len(english),
+        'english_matcher_us_per_text': english_matcher_us,
+        'english_routed_us_per_text': english_routed_us,
+        'speedup': legacy_us / matcher_us,
+        'mismatches': mismatches,
+        'routed_differences': routed_differences
+    }
+
+
+def time_pack_compilation(languages: FrozenSet[str]) -> float:
+    """Time to compile the packs of some languages in a fresh interpreter, in milliseconds."""
+    code = (
+        "import sys, time; sys.path.insert(0, %r)\n"
+        "from analysis.pattern_packs import get_pattern_matcher\n"
+        "start = time.perf_counter(); get_pattern_matcher(frozenset(%r))\n"
+        "print((time.perf_counter() - start) * 1000)"
+    ) % (os.path.join(os.path.dirname(__file__), '..'), sorted(languages))
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return float(output.stdout.strip())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Dev-pattern adjustment micro-benchmark')
+    parser.add_argument('--texts', type=int, default=100_000, help='Corpus size')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus random seed')
+    
+    args = parser.parse_args()
+    result = run_benchmark(args.texts, repeat=args.repeat, seed=args.seed)
+    
+    print(f"📏 Corpus: {result['texts']:,} texts")
+    print(f"  Per-pattern search: {result['legacy_us_per_text']:.2f} µs/text")
+    print(f"  DevPatternMatcher:  {result['matcher_us_per_text']:.2f} µs/text")
+    print(f"  Speedup: {result['speedup']:.1f}x")
+    print(f"  Mismatched adjustments: {result['mismatches']}")
+    print(f"  Per-language packs: {result['routed_us_per_text']:.2f} µs/text "
+          f"({result['routed_differences']} texts skip packs of undetected languages)")
+    print(f"  English-only subset ({result['english_texts']:,} texts): "
+          f"all packs {result['english_matcher_us_per_text']:.2f} µs/text, "
+          f"per-language {result['english_routed_us_per_text']:.2f} µs/text")
+    
+    for languages in (frozenset({'en'}), frozenset(available_languages())):
+        print(f"  Compile {'+'.join(sorted(languages))}: {time_pack_compilation(languages):.1f} ms")
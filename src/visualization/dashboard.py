@@ -100,6 +100,18 @@ class Dashboard:
             collaboration_data = self.analysis_results.get('collaboration_analysis', {})
             return jsonify(collaboration_data)
         
+        @self.app.route('/api/ownership/')
+        @self.app.route('/api/ownership/<path:directory>')
+        def get_directory_ownership(directory=''):
+            """Ownership precalculado de un directorio y sus subdirectorios."""
+            if not self.analysis_results:
+                return jsonify({'error': 'No data available'})
+            
+            rows = self.analysis_results.get('collaboration_analysis', {}).get('directory_ownership', [])
+            prefix = directory.strip('/')
+            return jsonify([row for row in rows
+                            if not prefix or row['path'] == prefix or row['path'].startswith(prefix + '/')])
+        
         @self.app.route('/api/recommendations')
         def get_recommendations():
             """Obtiene recomendaciones para el equipo."""
@@ -142,7 +154,7 @@ class Dashboard:
         
         Args:
             output_path: Ruta donde guardar el reporte
-            
+        
         Returns:
             True si se exportó exitosamente
         """
@@ -155,7 +167,7 @@ class Dashboard:
             
             logger.info(f"📄 Reporte estático exportado a: {output_path}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"❌ Error exportando reporte: {e}")
             return False
@@ -406,6 +418,28 @@ class Dashboard:
             </div>
             """
         
+        # Ownership por directorio (precalculado por subárbol en el análisis)
+        directories = collaboration_analysis.get('directory_ownership', [])
+        if directories:
+            rows_html = ""
+            top_levels = [directory for directory in directories if directory['depth'] <= 2]
+            for directory in top_levels[:15]:  # Mostrar máximo 15 directorios
+                indent = "&nbsp;" * 4 * (directory['depth'] - 1)
+                warning = " ⚠️" if directory['bus_factor'] == 1 else ""
+                rows_html += (f"<tr><td>{indent}{directory['path']}/</td><td>{directory['files']}</td>"
+                              f"<td>{directory['primary_owner']} ({directory['ownership_percentage']:.1%})</td>"
+                              f"<td>{directory['bus_factor']}{warning}</td></tr>")
+            
+            content += f"""
+            <div class="metric-card">
+                <h3>🌳 Ownership por Directorio</h3>
+                <table>
+                    <tr><th>Directorio</th><th>Archivos</th><th>Autor principal</th><th>Bus factor</th></tr>
+                    {rows_html}
+                </table>
+            </div>
+            """
+        
         return content
     
     def _generate_recommendations_section(self, recommendations: list) -> str:
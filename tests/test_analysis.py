@@ -0,0 +1,847 @@
+"""
+Tests para los analizadores de sentimiento y colaboración.
+Usan datos sintéticos, sin acceso a la API real.
+"""
+
+import re
+import sys
+import json
+import subprocess
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+# Añadir src al path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from src.analysis import sentiment_analyzer
+from src.analysis.sentiment_analyzer import SentimentAnalyzer
+from src.analysis.sentiment_cache import SentimentCache
+from src.analysis.epoch_time import to_epoch_seconds
+from src.analysis.sentiment_trends import SentimentTrends
+from src.analysis.dev_patterns import DevPatternMatcher, required_literals
+from src.analysis.transformer_backend import plan_batches
+from src.analysis.text_dedup import canonicalize, find_near_duplicates, is_bot
+from src.analysis.pattern_packs import available_languages, detect_languages, get_pattern_matcher, parse_languages
+from src.analysis.collaboration_analyzer import CollaborationAnalyzer
+from src.analysis.collaboration_graph import CollaborationGraph
+from src.analysis.ownership_matrix import OwnershipMatrix
+from src.analysis.ownership_tree import OwnershipTree
+from src.analysis.time_slices import DailySlices
+from src.analysis.activity_stream import iter_activity, analyze_activity
+from src.data_collection.models import CommitData, PullRequestData
+
+
+def _repo_data():
+    """Dataset pequeño con commits (dataclass y dict) y PRs con reviews."""
+    now = datetime.now(timezone.utc)
+    
+    commits = [
+        CommitData(sha='a', author='alice', author_email='alice@example.com', message='Add parser',
+                   timestamp=now, files_changed=['src/parser.py'], additions=10, deletions=0),
+        CommitData(sha='b', author='bob', author_email='bob@example.com', message='Merge branch',
+                   timestamp=now, files_changed=[], additions=0, deletions=0),
+        {'author': 'carol', 'message': 'Fix docs', 'files_changed': ['docs/index.md']}
+    ]
+    pull_requests = [
+        PullRequestData(number=1, title='Parser', author='alice', state='closed', created_at=now,
+                        merged_at=now, comments=[{'author': 'carol', 'body': 'Nice'}],
+                        reviews=[{'author': 'bob', 'state': 'APPROVED', 'body': ''}],
+                        files_changed=['src/parser.py'])
+    ]
+    
+    return {'repository_info': {'name': 'repo'}, 'commits': commits, 'pull_requests': pull_requests}
+
+
+def _make_sentiment_analyzer(model='vader', language='en'):
+    """Crea un analizador de sentimiento en el proceso actual y sin caché."""
+    return SentimentAnalyzer(model, language=language)
+
+
+class TestSentimentBatch:
+    """Tests del análisis de sentimiento en lote con columnas NumPy."""
+    
+    TEXTS = ['Great work, thanks for this!', 'This is terrible and broken', '', 'LGTM', 'LGTM',
+             'muy buen trabajo', 'still not working']
+    
+    def test_batch_matches_single_text_analysis(self):
+        """Cada posición del lote coincide con el análisis individual del texto."""
+        for model in ('vader', 'hybrid'):
+            analyzer = _make_sentiment_analyzer(model)
+            batch = analyzer.analyze_batch(self.TEXTS, ['comment'] * len(self.TEXTS))
+            
+            assert len(batch) == len(self.TEXTS)
+            assert batch.label.dtype == np.int8
+            for index, text in enumerate(self.TEXTS):
+                if not text:
+                    assert batch.labels()[index] == 'neutral' and batch.confidence[index] == 0.0
+                    continue
+                single = analyzer._analyze_text(text, 'comment')
+                assert batch.result(index, text) == single
+    
+    def test_repeated_texts_are_scored_once(self):
+        """Los textos repetidos solo pasan una vez por el modelo."""
+        analyzer = _make_sentiment_analyzer()
+        
+        with patch.object(analyzer.vader, 'polarity_scores', wraps=analyzer.vader.polarity_scores) as scores:
+            analyzer.analyze_batch(['LGTM'] * 50 + ['Nice fix'] * 50)
+        
+        assert scores.call_count == 2
+    
+    def test_streaming_flushes_in_batches(self):
+        """El streaming puntúa por lotes y las métricas se calculan sobre las columnas."""
+        analyzer = _make_sentiment_analyzer()
+        
+        with patch.object(sentiment_analyzer, 'STREAM_BATCH_SIZE', 2):
+            streamed = analyzer.analyze(_repo_data())
+        full = _make_sentiment_analyzer().analyze(_repo_data())
+        
+        assert len(streamed['commit_sentiments']) == 3
+        assert len(streamed['pr_sentiments']['comments']) == 1
+        assert len(streamed['pr_sentiments']['reviews']) == 0
+        assert streamed['overall_metrics'] == full['overall_metrics']
+        ratios = full['overall_metrics']
+        assert abs(ratios['positive_ratio'] + ratios['negative_ratio'] + ratios['neutral_ratio'] - 1) < 1e-9
+    
+    def _parallel_texts(self):
+        return [f'Great fix {i}' if i % 3 else f'This is broken {i}'
+                for i in range(sentiment_analyzer.PARALLEL_MIN_TEXTS * 2)]
+    
+    def test_parallel_chunks_keep_order(self):
+        """Los trozos repartidos entre workers se reúnen en el orden original."""
+        analyzer = _make_sentiment_analyzer()
+        analyzer.dedup = 'off'
+        texts = self._parallel_texts()
+        serial = analyzer.analyze_batch(texts)
+        
+        analyzer.workers = 3
+        with ThreadPoolExecutor(max_workers=3) as pool, \
+                patch.object(sentiment_analyzer, 'get_shared_process_pool', return_value=pool), \
+                patch.object(sentiment_analyzer, '_worker_analyzer', analyzer):
+            parallel = analyzer.analyze_batch(texts)
+        
+        np.testing.assert_array_equal(parallel.score, serial.score)
+        np.testing.assert_array_equal(parallel.label, serial.label)
+        np.testing.assert_array_equal(parallel.neutral, serial.neutral)
+    
+    def test_process_pool_matches_serial_scores(self):
+        """El modo multiproceso da los mismos resultados que el proceso actual."""
+        analyzer = _make_sentiment_analyzer()
+        analyzer.dedup = 'off'
+        texts = self._parallel_texts()
+        serial = analyzer.analyze_batch(texts)
+        
+        analyzer.workers = 2
+        parallel = analyzer.analyze_batch(texts)
+        
+        np.testing.assert_array_equal(parallel.score, serial.score)
+        np.testing.assert_array_equal(parallel.confidence, serial.confidence)
+    
+    def test_compact_columns_and_tables(self):
+        """Columnas float32/int32 y autores y textos guardados una vez por lote."""
+        analyzer = _make_sentiment_analyzer()
+        authors = ['alice', 'bob', None, 'alice', 'alice', 'bob', 'carol']
+        batch = analyzer.analyze_batch(self.TEXTS, 'comment', authors=authors)
+        
+        assert batch.score.dtype == batch.emotions.dtype == np.float32
+        assert batch.author_id.dtype == batch.text_id.dtype == np.int32
+        assert batch.authors == ('alice', 'bob', 'carol')
+        assert batch.author.tolist() == authors
+        assert batch.text_id[3] == batch.text_id[4] and batch.text_id[2] == -1
+        assert batch.texts == () and batch.result(0).text is None
+        
+        analyzer.keep_texts = True
+        kept = analyzer.analyze_batch(self.TEXTS, 'comment', authors=authors)
+        assert [kept.text(index) for index in range(len(kept))] == self.TEXTS
+        assert len(kept.texts) == len(set(self.TEXTS) - {''})
+    
+    def test_concatenate_remaps_authors_and_texts(self):
+        """Al unir lotes se combinan las tablas de autores y textos."""
+        analyzer = _make_sentiment_analyzer()
+        analyzer.keep_texts = True
+        first = analyzer.analyze_batch(['LGTM', 'Nice'], authors=['bob', 'alice'])
+        second = analyzer.analyze_batch(['Broken', 'LGTM'], authors=['carol', 'bob'])
+        
+        joined = sentiment_analyzer.SentimentBatch.concatenate([first, second])
+        
+        assert joined.author.tolist() == ['bob', 'alice', 'carol', 'bob']
+        assert [joined.text(index) for index in range(4)] == ['LGTM', 'Nice', 'Broken', 'LGTM']
+    
+    def test_to_dict_round_trip(self):
+        """La serialización por columnas es JSON y se puede volver a cargar."""
+        analyzer = _make_sentiment_analyzer()
+        timestamps = [datetime(2024, 5, 1, 12, tzinfo=timezone.utc)] * 6 + [None]
+        batch = analyzer.analyze_batch(self.TEXTS, 'comment', timestamps, ['alice'] * 7)
+        
+        data = json.loads(json.dumps(batch.to_dict()))
+        restored = sentiment_analyzer.SentimentBatch.from_dict(data)
+        
+        assert data['timestamp'][0] == 1714564800 and data['timestamp'][-1] is None
+        np.testing.assert_allclose(restored.score, batch.score, atol=1e-4)
+        np.testing.assert_allclose(restored.emotions, batch.emotions, atol=1e-4)
+        np.testing.assert_array_equal(restored.label, batch.label)
+        assert restored.author.tolist() == ['alice'] * 7
+        assert restored.result(0).timestamp == batch.result(0).timestamp
+
+
+class TestDevPatternMatcher:
+    """Tests del ajuste por patrones de desarrollo con prefiltro literal."""
+    
+    def test_required_literals_skip_optional_prefixes(self):
+        """Los literales salen del primer elemento obligatorio de cada alternativa."""
+        assert required_literals(r'(?:this\s+is\s+)?(?:terrible|awful)') == {'terrible', 'awful'}
+        assert required_literals(r'thanks?\s+for') == {'thank'}
+        assert required_literals(r'(?:qué\s+)?(?:Desastre|porquería)') == {'desastre', 'porquería'}
+        assert required_literals(r'\w+\s+done') is None
+    
+    def test_counts_match_individual_searches(self):
+        """El prefiltro no pierde coincidencias respecto a buscar cada patrón."""
+        matcher = get_pattern_matcher(frozenset(available_languages()))
+        texts = ['Good job! Thanks for the quick fix', 'THIS IS TERRIBLE, still not working',
+                 'Muy buen trabajo, gracias por el cambio', 'Qué desastre, no funciona', 'Update README', '']
+        
+        for text in texts:
+            expected = {}
+            for name, (_, patterns) in matcher.categories.items():
+                found = sum(1 for pattern in patterns if re.search(pattern, text, re.IGNORECASE))
+                if found:
+                    expected[name] = found
+            assert matcher.count_matches(text) == expected
+    
+    def test_unfiltered_patterns_are_always_searched(self):
+        """Los patrones sin literal obligatorio se buscan en todos los textos."""
+        matcher = DevPatternMatcher({'done': (0.2, [r'\w+\s+done']), 'nice': (0.2, ['nice'])})
+        
+        assert matcher.count_matches('well done') == {'done': 1}
+        assert matcher.adjustment('Nice, well done') == pytest.approx(0.4)
+        assert matcher.adjustment('nothing here') == 0.0
+
+
+class TestPatternPacks:
+    """Tests de los paquetes de patrones por idioma."""
+    
+    def test_packs_and_languages(self):
+        """Hay un paquete por idioma y 'auto' los incluye todos."""
+        assert {'en', 'es'} <= set(available_languages())
+        assert parse_languages('ES, en, xx') == ('es', 'en')
+        assert parse_languages('auto') == available_languages()
+        assert get_pattern_matcher(frozenset({'es'})) is get_pattern_matcher(frozenset({'es'}))
+    
+    def test_detect_languages(self):
+        """La identificación usa stopwords y caracteres propios de cada idioma."""
+        assert detect_languages('Fix the parser for the new API') == {'en'}
+        assert detect_languages('Corregir la validación del formulario') == {'es'}
+        assert detect_languages('Thanks for the fix, muy buen trabajo') == {'en', 'es'}
+        assert detect_languages('LGTM') == frozenset()
+        assert detect_languages('Corregir la validación', skip={'es'}) == frozenset()
+    
+    def test_other_languages_apply_only_when_detected(self):
+        """Los patrones de otro idioma solo se aplican a los textos en ese idioma."""
+        english = _make_sentiment_analyzer()
+        spanish = _make_sentiment_analyzer(language='es')
+        
+        assert english._get_dev_pattern_adjustment('Qué desastre de merge') < 0
+        assert english._get_dev_pattern_adjustment('desastre') == 0.0
+        assert spanish._get_dev_pattern_adjustment('desastre') < 0
+        assert english.patterns_version != spanish.patterns_version
+
+
+class TestLazyStartup:
+    """Tests del arranque rápido: sin red ni dependencias pesadas hasta que se usan."""
+    
+    def test_construction_loads_no_backends(self):
+        """Crear el analizador no importa TextBlob/NLTK ni lee el léxico de VADER."""
+        code = ("import sys\n"
+                "from src.analysis.sentiment_analyzer import SentimentAnalyzer\n"
+                "analyzer = SentimentAnalyzer()\n"
+                "assert analyzer._vader is None\n"
+                "assert 'nltk' not in sys.modules and 'textblob' not in sys.modules\n"
+                "import src\n"
+                "assert 'flask' not in sys.modules and 'networkx' not in sys.modules\n"
+                "from src.analysis import CollaborationAnalyzer\n"
+                "CollaborationAnalyzer()\n"
+                "assert 'scipy' not in sys.modules and 'networkx' not in sys.modules")
+        subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).parent.parent, check=True)
+    
+    def test_vader_lexicon_is_loaded_once(self):
+        """Todos los analizadores del proceso comparten el mismo VADER."""
+        first, second = SentimentAnalyzer(), SentimentAnalyzer(model='hybrid')
+        
+        assert first.vader is second.vader is sentiment_analyzer.get_vader_analyzer()
+
+
+class TestTransformerBackend:
+    """Tests del modelo transformer opcional (con un modelo simulado: torch no es obligatorio)."""
+    
+    class FakeModel:
+        """Modelo que devuelve siempre 'positivo' y recuerda los textos recibidos."""
+        
+        def __init__(self):
+            self.texts = []
+        
+        def predict(self, texts):
+            self.texts.extend(texts)
+            return np.tile([0.1, 0.2, 0.7], (len(texts), 1))
+    
+    def test_plan_batches_groups_similar_lengths(self):
+        """Los lotes agrupan longitudes parecidas y respetan tamaño y presupuesto de tokens."""
+        assert plan_batches([5, 100, 6, 7, 120], max_batch_size=2) == [[0, 2], [3, 1], [4]]
+        assert plan_batches([10, 10, 300, 10], max_batch_tokens=400) == [[0, 1, 3], [2]]
+        assert plan_batches([]) == []
+    
+    def test_vader_gates_the_transformer(self):
+        """Solo los textos en los que VADER duda pasan por el modelo transformer."""
+        texts = ['Great work, thanks for this!', 'This is terrible and broken', 'Update the README']
+        vader = _make_sentiment_analyzer().analyze_batch(texts)
+        
+        analyzer = _make_sentiment_analyzer()
+        analyzer.model = 'transformer'
+        fake = self.FakeModel()
+        with patch.object(sentiment_analyzer, 'get_transformer_model', return_value=fake):
+            batch = analyzer.analyze_batch(texts)
+        
+        assert fake.texts == ['Update the README']
+        np.testing.assert_array_equal(batch.score[:2], vader.score[:2])
+        assert batch.score[2] == pytest.approx(0.6)
+        assert batch.confidence[2] == pytest.approx(0.7)
+        assert batch.labels()[2] == 'positive'
+    
+    def test_falls_back_to_vader_without_torch(self):
+        """Sin torch/transformers instalados se usa VADER."""
+        with patch.object(sentiment_analyzer, 'transformers_available', return_value=False):
+            analyzer = SentimentAnalyzer(model='transformer')
+        
+        assert analyzer.model == 'vader'
+        assert analyzer.model_id == 'vader'
+
+
+class TestTextDedup:
+    """Tests de la agrupación de textos duplicados antes de puntuarlos."""
+    
+    BUMP = ("Bumps {} from 1.2.0 to 1.2.1. Release notes sourced from the releases page. Dependabot "
+            "will resolve any conflicts with this PR as long as you do not alter it yourself.")
+    
+    def test_canonical_form(self):
+        """Números, SHAs y ramas se sustituyen; los números con sentimiento y emoticonos no."""
+        assert canonicalize('Merge pull request #12 from alice/fix-1') == \
+            canonicalize('Merge pull request #345 from bob/feature')
+        assert canonicalize('Reverts 1a2b3c4d') == canonicalize('Reverts 9f8e7d6c5b')
+        assert canonicalize('It is good/great') == 'It is good/great'
+        assert canonicalize('Thanks 8)') == 'Thanks 8)'
+        assert canonicalize('PR 1337', keep=frozenset({'1337'})) == 'PR 1337'
+        assert canonicalize('from bob/fix-terrible_crash', keep=frozenset({'terrible'})) == \
+            'from bob/fix-terrible_crash'
+    
+    def test_near_duplicates_need_same_sentiment_words(self):
+        """Solo se agrupan textos parecidos cuyas diferencias no tienen sentimiento."""
+        texts = [self.BUMP.format('lodash'), self.BUMP.format('requests'),
+                 self.BUMP.format('lodash').replace('resolve', 'not resolve'), 'LGTM']
+        
+        representatives = find_near_duplicates(texts, sentiment_words=frozenset({'not', 'resolve'}))
+        
+        assert representatives.tolist() == [0, 0, 2, 3]
+    
+    def test_dedup_modes_score_each_group_once(self):
+        """Los grupos se puntúan una vez y todos sus textos reciben el mismo resultado."""
+        texts = ['Merge pull request #1 from alice/a', 'Merge pull request #2 from bob/b',
+                 self.BUMP.format('lodash'), self.BUMP.format('requests'), 'This is broken']
+        results = {}
+        for mode in ('off', 'exact', 'near'):
+            analyzer = _make_sentiment_analyzer()
+            analyzer.dedup = mode
+            with patch.object(analyzer.vader, 'polarity_scores', wraps=analyzer.vader.polarity_scores) as scores:
+                results[mode] = analyzer.analyze_batch(texts)
+            results[mode + '_calls'] = scores.call_count
+        
+        assert (results['off_calls'], results['exact_calls'], results['near_calls']) == (5, 4, 3)
+        np.testing.assert_array_equal(results['near'].score, results['off'].score)
+        
+        with pytest.raises(ValueError):
+            SentimentAnalyzer(dedup='fuzzy')
+    
+    def test_exact_dedup_keeps_scores(self):
+        """Agrupar por forma canónica no cambia el score ni las emociones de ningún texto."""
+        texts = ['Merge pull request #12 from alice/add-docs',
+                 'Merge pull request #13 from bob/fix-broken-terrible-crash',
+                 'Merge pull request #14 from carol/great', 'GREAT WORK on #15 from dave/but',
+                 'GREAT WORK on #16 from erin/docs', 'Merge pull request #17 from frank/FIX',
+                 "Merge branch 'alice/feature/deep' into main", "Merge branch 'bob/x' into main",
+                 'Merge pull request #18 from henry/update-readme']
+        results = {}
+        for mode in ('off', 'exact'):
+            analyzer = _make_sentiment_analyzer()
+            analyzer.dedup = mode
+            with patch.object(analyzer.vader, 'polarity_scores', wraps=analyzer.vader.polarity_scores) as scores:
+                results[mode] = analyzer.analyze_batch(texts)
+            results[mode + '_calls'] = scores.call_count
+        
+        np.testing.assert_array_equal(results['exact'].score, results['off'].score)
+        np.testing.assert_array_equal(results['exact'].emotions, results['off'].emotions)
+        assert results['off'].score[1] < 0 < results['off'].score[2]
+        assert results['exact_calls'] < results['off_calls']
+    
+    def test_exclude_bots(self):
+        """Los textos de bots se omiten y se cuentan."""
+        data = _repo_data()
+        data['pull_requests'][0].comments.append({'author': 'dependabot[bot]', 'body': 'Bumps lodash'})
+        
+        analyzer = _make_sentiment_analyzer()
+        analyzer.exclude_bots = True
+        results = analyzer.analyze(data)
+        
+        assert is_bot('github-actions') and not is_bot('robot-fan')
+        assert results['excluded_bot_texts'] == 1
+        assert results['pr_sentiments']['comments'].author.tolist() == ['carol']
+
+
+class TestSentimentCache:
+    """Tests de la caché de resultados de sentimiento."""
+    
+    def test_disk_tier_survives_new_instances(self, tmp_path):
+        """Los resultados guardados en SQLite se recuperan desde otra instancia."""
+        path = str(tmp_path / 'sentiment.sqlite')
+        key = SentimentCache.make_key('lgtm', 'vader', 'v1')
+        
+        first = SentimentCache(path)
+        first.put_many({key: (0.5, 0.5, 0.4, 0.0, 0.6)})
+        first.close()
+        
+        second = SentimentCache(path)
+        assert second.get_many([key, 'otra']) == {key: (0.5, 0.5, 0.4, 0.0, 0.6)}
+        assert second.stats()['hits'] == 1 and second.stats()['misses'] == 1
+        assert key != SentimentCache.make_key('lgtm', 'hybrid', 'v1')
+    
+    def test_memory_tier_evicts_least_recent(self):
+        """El nivel en memoria descarta la entrada usada hace más tiempo."""
+        cache = SentimentCache(memory_size=2)
+        cache.put_many({'a': (0.0,) * 5, 'b': (0.0,) * 5})
+        cache.get_many(['a'])
+        cache.put_many({'c': (0.0,) * 5})
+        
+        assert set(cache.get_many(['a', 'b', 'c'])) == {'a', 'c'}
+    
+    def test_analyzer_only_scores_new_texts(self, tmp_path):
+        """Una segunda ejecución reutiliza la caché y solo puntúa textos nuevos."""
+        texts = ['Great work, thanks!', 'This is broken', 'see @bob Great work, thanks!']
+        cache = SentimentCache(str(tmp_path / 'sentiment.sqlite'))
+        
+        analyzer = _make_sentiment_analyzer()
+        analyzer.cache = cache
+        first = analyzer.analyze_batch(texts)
+        
+        again = _make_sentiment_analyzer()
+        again.cache = SentimentCache(str(tmp_path / 'sentiment.sqlite'))
+        with patch.object(again.vader, 'polarity_scores', wraps=again.vader.polarity_scores) as scores:
+            second = again.analyze_batch(texts + ['Nice fix'])
+        
+        assert scores.call_count == 1
+        np.testing.assert_array_equal(second.score[:3], first.score)
+        np.testing.assert_array_equal(second.neutral[:3], first.neutral)
+
+
+class TestSentimentTrends:
+    """Tests de los agregados diarios y semanales de sentimiento."""
+    
+    DAY = 86400
+    
+    def test_aggregates_match_full_recomputation(self):
+        """Añadir por partes da las mismas medias y desviaciones que calcularlo todo."""
+        rng = np.random.default_rng(0)
+        timestamps = rng.uniform(0, 30 * self.DAY, 500)
+        scores = rng.uniform(-1, 1, 500)
+        
+        trends = SentimentTrends()
+        trends.add(timestamps[:200], scores[:200])
+        trends.add(timestamps[200:], scores[200:])
+        
+        days = np.floor(timestamps / self.DAY)
+        for point in trends.daily():
+            day = (datetime.fromisoformat(point['date']).replace(tzinfo=timezone.utc).timestamp()) // self.DAY
+            assert point['count'] == np.sum(days == day)
+            assert point['mean'] == pytest.approx(scores[days == day].mean())
+            assert point['std'] == pytest.approx(scores[days == day].std())
+        
+        assert len(trends) == 500
+        assert sum(week['count'] for week in trends.weekly()) == 500
+        assert all(datetime.fromisoformat(week['date']).weekday() == 0 for week in trends.weekly())
+    
+    def test_merge_and_serialization(self):
+        """Los agregados se combinan y sobreviven a to_dict()/from_dict()."""
+        first, second = SentimentTrends(), SentimentTrends()
+        first.add(np.array([0.0, self.DAY]), np.array([0.5, -0.5]))
+        second.add(np.array([self.DAY, np.nan]), np.array([0.1, 1.0]))
+        
+        first.merge(second)
+        restored = SentimentTrends.from_dict(first.to_dict())
+        
+        assert restored.daily() == first.daily()
+        assert [point['count'] for point in restored.daily()] == [1, 2]
+    
+    def test_summary_detects_direction(self):
+        """La media de la última semana frente a la anterior da la dirección."""
+        trends = SentimentTrends()
+        days = np.arange(14) * self.DAY
+        trends.add(days, np.where(days < 7 * self.DAY, -0.4, 0.4))
+        
+        summary = trends.summary()
+        
+        assert summary['trend_direction'] == 'improving'
+        assert summary['recent_change'] == pytest.approx(0.8)
+        assert summary['trend_strength'] == 1.0
+        assert SentimentTrends().summary()['trend_direction'] == 'stable'
+    
+    def test_to_epoch_seconds(self):
+        """Fechas datetime (con o sin zona), ISO 8601 y ausentes."""
+        assert to_epoch_seconds(datetime(1970, 1, 2)) == self.DAY
+        assert to_epoch_seconds('1970-01-02T00:00:00Z') == self.DAY
+        assert np.isnan(to_epoch_seconds(None))
+        assert np.isnan(to_epoch_seconds('ayer'))
+    
+    def test_results_carry_timestamp_and_author(self):
+        """Los resultados conservan la fecha y el autor de cada texto y alimentan las tendencias."""
+        results = _make_sentiment_analyzer().analyze(_repo_data())
+        
+        commits = results['commit_sentiments']
+        first = commits.result(0, 'Add parser')
+        assert first.author == 'alice'
+        assert first.timestamp is not None
+        assert commits.author[2] == 'carol' and np.isnan(commits.timestamp[2])
+        assert results['pr_sentiments']['comments'].author.tolist() == ['carol']
+        
+        # Dos commits con fecha y el título del PR (el comentario no tiene fecha)
+        trends = results['sentiment_trends']
+        assert sum(week['count'] for week in trends['weekly']) == 3
+        assert trends['trend_direction'] in ('improving', 'declining', 'stable')
+        
+        # Un recopilador que respete la proyección conserva la fecha y el autor
+        assert {'commit.author', 'commit.timestamp', 'pull_request.author'} <= SentimentAnalyzer.REQUIRED_FIELDS
+
+
+class TestActivityStream:
+    """Tests del análisis incremental sobre un flujo de actividad."""
+    
+    def test_stream_matches_batch_analysis(self):
+        """Consumir el flujo elemento a elemento da el mismo resultado que analyze()."""
+        batch = CollaborationAnalyzer().analyze(_repo_data())
+        streamed = CollaborationAnalyzer().analyze_stream(iter(list(iter_activity(_repo_data()))))
+        
+        assert streamed['collaboration_score'] == batch['collaboration_score']
+        assert streamed['team_health_metrics'] == batch['team_health_metrics']
+        assert streamed['collaboration_network']['network_density'] == \
+            batch['collaboration_network']['network_density']
+    
+    def test_analyze_activity_consumes_stream_once(self):
+        """Un único recorrido del flujo alimenta a todos los analizadores."""
+        consumed = []
+        
+        def activity():
+            for event in iter_activity(_repo_data()):
+                consumed.append(event[0])
+                yield event
+        
+        first, second = analyze_activity(activity(), [CollaborationAnalyzer(), CollaborationAnalyzer()])
+        
+        assert consumed == ['repository_info', 'commit', 'commit', 'commit', 'pull_request']
+        assert first['team_health_metrics']['team_size'] == 3
+        assert second['team_health_metrics'] == first['team_health_metrics']
+
+
+class TestCollaborationGraph:
+    """Tests del grafo de colaboración sobre matriz dispersa."""
+    
+    @staticmethod
+    def _random_interactions(seed, members=40, count=300):
+        rng = np.random.default_rng(seed)
+        pairs = rng.integers(0, members, (count, 2))
+        weights = rng.random(count)
+        return [(f"dev{a}", f"dev{b}", float(w)) for (a, b), w in zip(pairs, weights) if a != b]
+    
+    def test_metrics_match_networkx(self):
+        """Densidad, centralidad y comunidades coinciden con networkx."""
+        import networkx as nx
+        
+        for seed in range(5):
+            graph, reference = CollaborationGraph(), nx.Graph()
+            for first, second, weight in self._random_interactions(seed):
+                graph.add_interaction(first, second, weight)
+                if reference.has_edge(first, second):
+                    reference[first][second]['weight'] += weight
+                else:
+                    reference.add_edge(first, second, weight=weight)
+            
+            assert graph.density() == pytest.approx(nx.density(reference))
+            assert graph.degree_centrality() == pytest.approx(nx.degree_centrality(reference))
+            assert graph.weighted_degree_centrality() == pytest.approx(
+                {node: degree / (len(reference) - 1) for node, degree in reference.degree(weight='weight')})
+            
+            communities = nx.algorithms.community.greedy_modularity_communities(reference, weight='weight')
+            assert sorted(map(sorted, graph.communities(weighted=True))) == sorted(map(sorted, communities))
+    
+    def test_repeated_interactions_are_summed(self):
+        """Las interacciones repetidas suman peso sin duplicar aristas."""
+        graph = CollaborationGraph()
+        graph.add_interaction('alice', 'bob', 1.0)
+        graph.add_interaction('bob', 'alice', 0.5)
+        graph.add_interaction('alice', 'alice', 1.0)
+        assert graph.number_of_edges() == 1
+        
+        graph.add_interaction('alice', 'carol', 0.5)
+        exported = graph.to_networkx()
+        
+        assert exported['alice']['bob']['weight'] == 1.5
+        assert graph.nodes() == ['alice', 'bob', 'carol']
+        assert graph.number_of_edges() == 2
+        assert len(graph._interactions._weights) == 2
+
+
+class TestOwnershipMatrix:
+    """Tests del ownership autores × archivos y la detección de silos."""
+    
+    def test_stats_match_counters(self):
+        """Totales, autor principal y porcentaje coinciden con un Counter por archivo."""
+        rng = np.random.default_rng(0)
+        ownership, reference = OwnershipMatrix(), {}
+        for _ in range(500):
+            author = f"dev{rng.integers(8)}"
+            files = [f"src/file{index}.py" for index in rng.integers(0, 60, rng.integers(1, 4))]
+            ownership.add(author, files)
+            for file_path in files:
+                reference.setdefault(file_path, Counter())[author] += 1
+        
+        stats = ownership.stats()
+        assert len(ownership) == len(reference)
+        for file_index, total, owner, share in zip(stats.files, stats.totals, stats.owners, stats.shares):
+            counter = reference[ownership.files.names[file_index]]
+            top = max(counter.values())
+            assert total == sum(counter.values())
+            assert counter[ownership.authors.names[owner]] == top
+            assert share == pytest.approx(top / total)
+    
+    def test_silos_are_grouped_by_owner(self):
+        """Los archivos del mismo autor principal forman un único silo."""
+        analyzer = CollaborationAnalyzer()
+        analyzer._analyze_commits(
+            [{'author': 'alice', 'files_changed': ['core/a.py', 'core/b.py']}] * 9
+            + [{'author': 'bob', 'files_changed': ['core/a.py']},
+               {'author': 'carol', 'files_changed': ['docs/c.md', 'core/b.py']},
+               {'author': 'bob', 'files_changed': ['docs/c.md']}]
+        )
+        
+        silos = analyzer._detect_knowledge_silos()
+        
+        assert len(silos) == 1
+        assert silos[0].primary_owner == 'alice'
+        assert silos[0].files == ['core/a.py', 'core/b.py']
+        assert silos[0].ownership_percentage == pytest.approx(0.9)
+        assert silos[0].risk_level == 'high'
+        assert sorted(silos[0].collaborators) == ['bob', 'carol']
+        assert analyzer._evaluate_knowledge_distribution() == 'fair'
+
+
+class TestOwnershipTree:
+    """Tests del ownership agregado por directorio."""
+    
+    def test_subtrees_accumulate_contributions(self):
+        """Cada directorio suma las contribuciones de todos sus archivos."""
+        ownership = OwnershipMatrix()
+        ownership.add('alice', ['services/payments/api.py', 'services/payments/db/models.py'])
+        ownership.add('alice', ['services/payments/api.py'])
+        ownership.add('bob', ['services/search/index.py', 'README.md'])
+        ownership.add('carol', ['services/search/index.py'])
+        
+        tree = OwnershipTree(ownership)
+        
+        assert tree.owner('services/payments/**') == ('alice', 1.0)
+        assert tree.summary('services') == {
+            'path': 'services', 'files': 3, 'contributions': 5.0, 'contributors': 3,
+            'primary_owner': 'alice', 'ownership_percentage': 0.6, 'bus_factor': 1
+        }
+        assert tree.bus_factor('services/search') == 1
+        assert tree.summary('')['files'] == 4
+        assert tree.children('services') == ['services/payments', 'services/search']
+        assert [row['path'] for row in tree.to_list()] == ['services', 'services/payments', 'services/search']
+        with pytest.raises(KeyError):
+            tree.owner('docs')
+    
+    def test_bus_factor_counts_authors_for_half_of_contributions(self):
+        """El bus factor es el mínimo de autores con la mitad de las contribuciones."""
+        ownership = OwnershipMatrix()
+        for author, commits in [('alice', 3), ('bob', 3), ('carol', 2), ('dave', 2)]:
+            for _ in range(commits):
+                ownership.add(author, ['lib/core.py'])
+        
+        assert OwnershipTree(ownership).bus_factor('lib') == 2
+    
+    def test_knowledge_areas_use_owned_directories(self):
+        """Las áreas de conocimiento incluyen los directorios propios más amplios."""
+        analyzer = CollaborationAnalyzer()
+        commits = [{'author': 'alice', 'files_changed': [f'services/payments/{name}.py' for name in 'abcd']},
+                   {'author': 'bob', 'files_changed': [f'services/search/{name}.py' for name in 'abc']}]
+        
+        results = analyzer.analyze({'repository_info': {}, 'commits': commits, 'pull_requests': []})
+        metrics = {member.member: member for member in results['member_metrics']}
+        
+        assert metrics['alice'].knowledge_areas == ['py development', 'services module']
+        assert metrics['bob'].knowledge_areas == ['py development', 'services/search module']
+        assert results['directory_ownership'][0]['path'] == 'services'
+
+    def test_ownership_api_serves_every_depth(self):
+        """/api/ownership devuelve directorios de cualquier profundidad."""
+        from src.visualization.dashboard import Dashboard
+        
+        commits = [{'author': 'alice', 'files_changed': ['services/payments/checkout/api/handlers.py']},
+                   {'author': 'bob', 'files_changed': ['services/payments/checkout/api/routes.py']}]
+        results = CollaborationAnalyzer().analyze({'repository_info': {}, 'commits': commits, 'pull_requests': []})
+        
+        dashboard = Dashboard()
+        dashboard.analysis_results = {'collaboration_analysis': results}
+        rows = dashboard.app.test_client().get('/api/ownership/services/payments/checkout/api').get_json()
+        
+        assert [(row['path'], row['depth'], row['files']) for row in rows] == [('services/payments/checkout/api', 4, 2)]
+
+
+class TestIncrementalCollaboration:
+    """Tests de update(): actividad nueva sobre el estado guardado."""
+    
+    @staticmethod
+    def _summary(results):
+        members = {metrics.member: (metrics.commits_count, metrics.pr_count, metrics.reviews_given,
+                                    metrics.reviews_received, metrics.collaboration_score)
+                   for metrics in results['member_metrics']}
+        return (members, results['team_health_metrics'], results['collaboration_score'],
+                results['collaboration_network']['network_density'],
+                [(silo.primary_owner, sorted(silo.files)) for silo in results['knowledge_silos']])
+    
+    def test_update_matches_full_analysis(self):
+        """Añadir actividad por partes da el mismo resultado que analizarla toda."""
+        data = _repo_data()
+        analyzer = CollaborationAnalyzer()
+        analyzer.analyze({'repository_info': {}, 'commits': data['commits'][:2], 'pull_requests': []})
+        updated = analyzer.update(data['commits'][1:], data['pull_requests'])
+        
+        assert self._summary(updated) == self._summary(CollaborationAnalyzer().analyze(data))
+    
+    def test_updated_pull_request_replaces_previous_version(self):
+        """Un PR ya visto se descuenta antes de añadir su nueva versión."""
+        analyzer = CollaborationAnalyzer()
+        first = {'number': 1, 'author': 'alice', 'reviews': [{'author': 'bob'}], 'comments': []}
+        second = dict(first, reviews=[{'author': 'carol'}])
+        
+        analyzer.update([], [first])
+        results = analyzer.update([], [second])
+        members = {metrics.member: metrics for metrics in results['member_metrics']}
+        
+        assert 'bob' not in members
+        assert members['alice'].pr_count == 1 and members['carol'].reviews_given == 1
+        assert analyzer.collaboration_graph.nodes() == ['alice', 'carol']
+    
+    def test_sliding_window_expires_old_activity(self):
+        """La actividad anterior a la ventana deja de contar al actualizar."""
+        now = datetime(2026, 3, 31, tzinfo=timezone.utc)
+        old = {'sha': 'a', 'author': 'alice', 'files_changed': ['src/core.py'], 'timestamp': '2026-01-01T00:00:00Z'}
+        recent = {'sha': 'b', 'author': 'bob', 'files_changed': ['src/core.py'], 'timestamp': '2026-03-30T00:00:00Z'}
+        
+        analyzer = CollaborationAnalyzer(window_days=30)
+        results = analyzer.update([old, recent], now=datetime(2026, 1, 2, tzinfo=timezone.utc))
+        assert results['team_health_metrics']['team_size'] == 2
+        
+        results = analyzer.update([recent], now=now)
+        assert [metrics.member for metrics in results['member_metrics']] == ['bob']
+        assert results['knowledge_silos'][0].primary_owner == 'bob'
+        
+        restored = CollaborationAnalyzer.from_dict(json.loads(json.dumps(analyzer.to_dict())))
+        assert self._summary(restored.finish_stream(now)) == self._summary(results)
+
+    def test_sliding_window_expires_each_interaction(self):
+        """Reviews y comentarios caducan por su propia fecha, no por la del PR."""
+        now = datetime(2026, 3, 31, tzinfo=timezone.utc)
+        prs = [
+            # PR antiguo que se sigue actualizando: su review de enero caduca
+            {'number': 1, 'author': 'alice', 'created_at': '2026-01-01T00:00:00Z', 'updated_at': '2026-03-30T00:00:00Z',
+             'reviews': [{'author': 'bob', 'submitted_at': '2026-01-02T00:00:00Z'}],
+             'comments': [{'author': 'dave', 'created_at': '2026-03-30T00:00:00Z'}]},
+            # PR sin updated_at con un comentario reciente: el comentario sigue contando
+            {'number': 2, 'author': 'erin', 'created_at': '2026-01-05T00:00:00Z', 'reviews': [],
+             'comments': [{'author': 'carol', 'created_at': '2026-03-29T00:00:00Z'}]},
+        ]
+        
+        analyzer = CollaborationAnalyzer(window_days=30)
+        results = analyzer.update([], prs, now=now)
+        members = {metrics.member: metrics for metrics in results['member_metrics']}
+        
+        assert sorted(members) == ['alice', 'carol', 'dave', 'erin']
+        assert members['alice'].pr_count == 1 and members['alice'].reviews_received == 0
+        assert members['erin'].pr_count == 1
+        assert sorted(analyzer.collaboration_graph.nodes()) == ['alice', 'carol', 'dave', 'erin']
+        
+        restored = CollaborationAnalyzer.from_dict(json.loads(json.dumps(analyzer.to_dict())))
+        assert self._summary(restored.finish_stream(now)) == self._summary(results)
+        
+        # Cuando caduca el último comentario, el PR deja de contar
+        results = analyzer.update(now=datetime(2026, 4, 29, tzinfo=timezone.utc))
+        assert [metrics.member for metrics in results['member_metrics']] == ['alice', 'dave']
+
+
+class TestTimeWindows:
+    """Tests de las vistas por ventana temporal (matrices diarias)."""
+    
+    def test_half_life_weights_each_day(self):
+        """Cada día pesa 0.5 ** (antigüedad / semivida) y los días fuera de la ventana no cuentan."""
+        slices = DailySlices()
+        slices.add(100, 0, 1, 4.0)
+        slices.add(90, 0, 1, 4.0)
+        slices.add(90, 1, 0, 2.0)
+        slices.add(90, 1, 0, -2.0)
+        
+        assert slices.window((2, 2), 100, days=7).toarray().tolist() == [[0.0, 4.0], [0.0, 0.0]]
+        assert slices.window((2, 2), 100, days=30).toarray()[0, 1] == 8.0
+        assert slices.window((2, 2), 100, half_life=10).toarray()[0, 1] == pytest.approx(6.0)
+        assert slices.window((2, 2), 99, days=30).toarray()[0, 1] == 4.0
+    
+    def test_windows_match_analysis_of_recent_activity(self):
+        """La vista de 30 días coincide con analizar solo la actividad de esos días."""
+        now = datetime(2026, 3, 31, 12, tzinfo=timezone.utc)
+        commits = [
+            {'sha': 'a', 'author': 'alice', 'files_changed': ['src/core.py'], 'timestamp': '2026-01-05T00:00:00Z'},
+            {'sha': 'b', 'author': 'bob', 'files_changed': ['src/core.py', 'src/api.py'], 'timestamp': '2026-03-20T00:00:00Z'},
+            {'sha': 'c', 'author': 'bob', 'files_changed': ['src/api.py'], 'timestamp': '2026-03-30T00:00:00Z'},
+        ]
+        prs = [
+            {'number': 1, 'author': 'alice', 'reviews': [{'author': 'carol'}], 'comments': [], 'created_at': '2026-01-10T00:00:00Z'},
+            {'number': 2, 'author': 'bob', 'reviews': [{'author': 'alice'}], 'comments': [{'author': 'carol'}],
+             'created_at': '2026-03-25T00:00:00Z'},
+        ]
+        
+        analyzer = CollaborationAnalyzer(half_life_days=14)
+        windows = analyzer.update(commits, prs, now=now)['time_windows']
+        recent = CollaborationAnalyzer().analyze({'repository_info': {}, 'commits': commits[1:], 'pull_requests': prs[1:]})
+        
+        assert set(windows) == {'7d', '30d', '90d', 'half_life_14d'}
+        assert windows['30d']['network_density'] == recent['collaboration_network']['network_density']
+        assert windows['30d']['knowledge_silos'] == len(recent['knowledge_silos']) == 1
+        assert windows['30d']['active_members'] == 3
+        assert windows['7d']['files_touched'] == 1 and windows['30d']['files_touched'] == 2
+        assert windows['30d']['knowledge_distribution'] == 'poor' and windows['90d']['knowledge_distribution'] == 'fair'
+        
+        # Con semivida, el PR de enero casi no pesa frente al de marzo
+        weighted = dict(windows['half_life_14d']['weighted_central_members'])
+        assert weighted['bob'] > weighted['carol']
+    
+    def test_reviews_and_comments_use_their_own_dates(self):
+        """Cada review y comentario cuenta en su día, no en el de la última actualización del PR."""
+        now = datetime(2026, 3, 31, 12, tzinfo=timezone.utc)
+        pr = {'number': 1, 'author': 'alice', 'created_at': '2026-03-01T00:00:00Z', 'updated_at': '2026-03-30T00:00:00Z',
+              'reviews': [{'author': 'bob', 'submitted_at': '2026-03-02T00:00:00Z'}],
+              'comments': [{'author': 'carol', 'created_at': '2026-03-29T00:00:00Z'},
+                           {'author': 'carol', 'created_at': '2026-03-29T08:00:00Z'}]}
+        
+        windows = CollaborationAnalyzer().update([], [pr], now=now)['time_windows']
+        
+        assert windows['7d']['collaboration_edges'] == 1 and windows['7d']['active_members'] == 2
+        assert windows['30d']['collaboration_edges'] == 2 and windows['30d']['active_members'] == 3
+        assert dict(windows['7d']['weighted_central_members'])['carol'] == 0.5
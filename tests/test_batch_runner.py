@@ -0,0 +1,60 @@
+"""
+Tests para la ejecución por lotes con checkpoints.
+"""
+
+import sys
+from pathlib import Path
+
+# Añadir src al path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from src.batch_runner import BatchRunner, read_repos_file
+from src.analysis.collaboration_analyzer import KnowledgeSilo
+
+
+class TestBatchRunner:
+    """Tests del runner por lotes."""
+    
+    def test_resume_skips_completed_and_retries_failed(self, tmp_path):
+        """Tras una ejecución interrumpida solo se repiten los repositorios no completados."""
+        calls = []
+        
+        def flaky(repo):
+            calls.append(repo)
+            if repo == 'org/b':
+                raise RuntimeError("API caída")
+            return {'summary': {'overall_team_health': 0.5}}
+        
+        repos = ['org/a', 'org/b', 'org/c']
+        first = BatchRunner(flaky, str(tmp_path), run_id='noche', max_workers=2).run(repos)
+        
+        assert sorted(first['completed']) == ['org/a', 'org/c']
+        assert first['failed'] == {'org/b': 'API caída'}
+        
+        calls.clear()
+        runner = BatchRunner(lambda repo: calls.append(repo) or {'ok': True}, str(tmp_path), run_id='noche')
+        second = runner.run(repos)
+        
+        assert calls == ['org/b']
+        assert second['skipped'] == ['org/a', 'org/c']
+        assert set(runner.load_results()) == set(repos)
+    
+    def test_checkpoints_serialize_analysis_results(self, tmp_path):
+        """Los resultados con dataclasses y sets se guardan como JSON."""
+        silo = KnowledgeSilo(files=['a.py'], primary_owner='alice', ownership_percentage=1.0,
+                             risk_level='critical', collaborators=[])
+        runner = BatchRunner(lambda repo: {'silos': [silo], 'members': {'bob', 'alice'}},
+                             str(tmp_path), run_id='r1')
+        
+        runner.run(['org/a'])
+        
+        results = runner.load_results()['org/a']
+        assert results['silos'][0]['primary_owner'] == 'alice'
+        assert results['members'] == ['alice', 'bob']
+    
+    def test_read_repos_file(self, tmp_path):
+        """El archivo de repositorios ignora comentarios, líneas vacías y duplicados."""
+        repos_file = tmp_path / 'repos.txt'
+        repos_file.write_text("# nocturno\norg/a\n\norg/b\norg/a\n", encoding='utf-8')
+        
+        assert read_repos_file(str(repos_file)) == ['org/a', 'org/b']
@@ -0,0 +1,617 @@
+"""
+Tests para el recopilador de datos de GitHub.
+Usan objetos simulados, sin acceso a la API real.
+"""
+
+import sys
+import time
+import threading
+import subprocess
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+# Añadir src al path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from src.data_collection.github_collector import COMMIT_SINCE_OVERLAP, RATE_LIMIT_RETRIES, GitHubCollector
+from src.data_collection.rate_limiter import GitHubRateLimiter, get_shared_rate_limiter
+from src.data_collection.response_cache import ResponseCache
+from src.data_collection.graphql_collector import GraphQLCollector
+from src.data_collection.local_git_collector import LocalGitCollector
+from src.data_collection.identity_map import IdentityMap
+from src.data_collection.models import CommitData, PullRequestData, merge_required_fields, needs_field
+from src.data_collection.incremental_store import (RepositoryState, RepositoryStateStore, as_utc,
+                                                   merge_commits, merge_pull_requests)
+
+
+def _make_collector(max_workers=4):
+    """Crea un colector sin autenticar contra GitHub."""
+    collector = GitHubCollector.__new__(GitHubCollector)
+    collector.rate_limit_delay = 0
+    collector.max_workers = max_workers
+    collector.rate_limit_reserve = 10
+    collector.github = Mock(rate_limiting=(5000, 5000), rate_limiting_resettime=0)
+    collector.rate_limiter = GitHubRateLimiter(reserve=10)
+    collector.local_clone_dir = None
+    collector.identity_map = IdentityMap()
+    collector.required_fields = None
+    collector._collection = threading.local()
+    return collector
+
+
+class TestConcurrentCollection:
+    """Tests del modo de recopilación concurrente."""
+    
+    def test_concurrent_collection_preserves_order(self):
+        """Los resultados conservan el orden de la paginación."""
+        collector = _make_collector(max_workers=8)
+        
+        def slow_builder(item):
+            time.sleep(0.01 * (10 - item))
+            return item * 2
+        
+        results = collector._collect_items(range(10), slow_builder, str)
+        
+        assert results == [item * 2 for item in range(10)]
+    
+    def test_concurrent_collection_skips_failed_items(self):
+        """Un elemento con error no interrumpe la recopilación."""
+        collector = _make_collector(max_workers=4)
+        
+        def flaky_builder(item):
+            if item == 3:
+                raise ValueError("boom")
+            return item
+        
+        results = collector._collect_items(range(6), flaky_builder, str)
+        
+        assert results == [0, 1, 2, 4, 5]
+    
+    def test_collection_syncs_budget_from_pygithub(self):
+        """Tras cada elemento se sincroniza el presupuesto con PyGithub."""
+        collector = _make_collector(max_workers=4)
+        collector.github = Mock(rate_limiting=(4200, 5000), rate_limiting_resettime=time.time() + 3600)
+        
+        collector._collect_items(range(3), lambda item: item, str)
+        
+        assert collector.rate_limiter.get_budget('core')['remaining'] == 4200
+    
+    def test_streaming_collection_is_bounded(self):
+        """En streaming la paginación solo avanza unos pocos elementos por delante del consumidor."""
+        collector = _make_collector(max_workers=2)
+        paged = []
+        
+        def pages():
+            for item in range(100):
+                paged.append(item)
+                yield item
+        
+        stream = collector._iter_items(pages(), lambda item: item, str)
+        first = [next(stream) for _ in range(3)]
+        stream.close()
+        
+        assert first == [0, 1, 2]
+        assert len(paged) <= 3 + collector.max_workers * 2
+
+
+class _FakeResponse:
+    """Respuesta HTTP mínima para simular la API REST."""
+    
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+        self.links = {}
+    
+    def json(self):
+        return self._body
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class TestResponseCache:
+    """Tests de la caché HTTP con peticiones condicionales."""
+    
+    def _collector_with_cache(self, tmp_path, responses):
+        collector = _make_collector()
+        collector.api_url = 'https://api.github.com'
+        collector.response_cache = ResponseCache(str(tmp_path / 'http.sqlite'))
+        collector.rate_limiter.update('core', 5000, 100, time.time() + 3600)
+        collector.session = Mock()
+        collector.session.get.side_effect = responses
+        return collector
+    
+    def test_conditional_request_reuses_body_on_304(self, tmp_path):
+        """Un 304 devuelve el cuerpo guardado y no gasta presupuesto."""
+        collector = self._collector_with_cache(tmp_path, [
+            _FakeResponse(200, [{'id': 1}], {'ETag': '"abc"'}),
+            _FakeResponse(304)
+        ])
+        
+        first, _ = collector._request_json('/repos/o/r/issues/1/comments')
+        second, _ = collector._request_json('/repos/o/r/issues/1/comments')
+        
+        assert first == second == [{'id': 1}]
+        assert collector.session.get.call_args.kwargs['headers'] == {'If-None-Match': '"abc"'}
+        assert collector.rate_limiter.get_budget('core')['remaining'] == 99
+    
+    def test_immutable_responses_skip_the_api(self, tmp_path):
+        """Los detalles de commit se sirven desde la caché sin llamadas."""
+        collector = self._collector_with_cache(tmp_path, [
+            _FakeResponse(200, {'sha': 'abc'}, {'ETag': '"v1"'})
+        ])
+        
+        collector._request_json('/repos/o/r/commits/abc', immutable=True)
+        cached, _ = collector._request_json('/repos/o/r/commits/abc', immutable=True)
+        
+        assert cached == {'sha': 'abc'}
+        assert collector.session.get.call_count == 1
+
+
+class TestIdentityMap:
+    """Tests del mapa de identidades email → login."""
+    
+    def _commit_details(self, login, email, name):
+        return {
+            'sha': 'abc',
+            'author': {'login': login} if login else None,
+            'commit': {'author': {'email': email, 'name': name, 'date': '2024-01-01T00:00:00Z'},
+                       'message': 'fix'},
+            'files': [],
+            'stats': {}
+        }
+    
+    def test_learned_emails_resolve_unlinked_commits(self):
+        """Un commit sin cuenta vinculada se resuelve con el email aprendido de otro commit."""
+        collector = _make_collector()
+        collector._request_json = Mock(side_effect=[
+            (self._commit_details('alice', 'Alice@Example.com', 'Alice'), None),
+            (self._commit_details(None, 'alice@example.com', 'Alice'), None),
+            (self._commit_details(None, 'ghost@example.com', 'Ghost Writer'), None)
+        ])
+        
+        authors = [collector._build_commit_data(Mock(url='u')).author for _ in range(3)]
+        
+        # Sin coincidencia se conserva el nombre de git en lugar de 'Unknown'
+        assert authors == ['alice', 'alice', 'Ghost Writer']
+    
+    def test_contributor_logins_and_persistence(self, tmp_path):
+        """Los logins de contributors resuelven nombres de git y el mapa se guarda en disco."""
+        path = tmp_path / 'identities.json'
+        identities = IdentityMap(str(path))
+        identities.learn_logins(['BobDev'])
+        
+        assert identities.resolve('bob@laptop.local', 'bobdev') == 'BobDev'
+        assert identities.resolve('7+carol@users.noreply.github.com') == 'carol'
+        assert identities.resolve('nobody@example.com', 'Nobody') is None
+        
+        identities.save()
+        reloaded = IdentityMap(str(path))
+        
+        assert len(reloaded) == 2
+        assert reloaded.resolve('BOB@laptop.local') == 'BobDev'
+
+
+class TestRateLimiter:
+    """Tests del token bucket de rate limit."""
+    
+    def test_acquire_spends_budget_without_waiting(self):
+        """Mientras quede presupuesto no hay esperas."""
+        limiter = GitHubRateLimiter()
+        limiter.update('core', 5000, 100, time.time() + 3600)
+        
+        waited = sum(limiter.acquire('core') for _ in range(100))
+        
+        assert waited == 0
+        assert limiter.get_budget('core')['remaining'] == 0
+    
+    def test_acquire_waits_until_reset_when_exhausted(self):
+        """Con el presupuesto agotado se espera hasta el reset."""
+        limiter = GitHubRateLimiter()
+        limiter.update('search', 30, 0, time.time() + 0.2)
+        
+        start = time.time()
+        limiter.acquire('search')
+        elapsed = time.time() - start
+        
+        assert elapsed >= 0.2
+        assert limiter.get_budget('search')['remaining'] == 29
+    
+    def test_update_from_headers_tracks_resources(self):
+        """Las cabeceras actualizan el recurso indicado en X-RateLimit-Resource."""
+        limiter = GitHubRateLimiter()
+        reset = int(time.time()) + 60
+        
+        limiter.update_from_headers({
+            'X-RateLimit-Limit': '30',
+            'X-RateLimit-Remaining': '12',
+            'X-RateLimit-Reset': str(reset),
+            'X-RateLimit-Resource': 'search'
+        })
+        
+        assert limiter.get_budget('search') == {'limit': 30, 'remaining': 12, 'reset_time': reset}
+        assert limiter.get_budget('core') is None
+    
+    def _collector_with_responses(self, responses):
+        collector = _make_collector()
+        collector.api_url = 'https://api.github.com'
+        collector.response_cache = None
+        collector.session = Mock()
+        collector.session.get.side_effect = responses
+        return collector
+    
+    def test_rate_limited_request_waits_and_retries(self):
+        """Un 403/429 por rate limit espera al reset o al Retry-After y repite la llamada."""
+        start = time.time()
+        reset = start + 0.2
+        collector = self._collector_with_responses([
+            _FakeResponse(403, {'message': 'API rate limit exceeded'},
+                          {'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)}),
+            _FakeResponse(429, {'message': 'secondary rate limit'}, {'Retry-After': '0.1'}),
+            _FakeResponse(200, {'sha': 'abc'})
+        ])
+        
+        body, _ = collector._request_json('/repos/o/r/commits/abc')
+        
+        assert body == {'sha': 'abc'}
+        assert collector.session.get.call_count == 3
+        assert time.time() - start >= 0.3
+    
+    def test_rate_limit_retries_are_bounded(self):
+        """Tras RATE_LIMIT_RETRIES reintentos se devuelve el error."""
+        collector = self._collector_with_responses(
+            [_FakeResponse(429, {}, {'Retry-After': '0'}) for _ in range(RATE_LIMIT_RETRIES + 1)]
+            + [_FakeResponse(200, {'sha': 'abc'})]
+        )
+        
+        with pytest.raises(RuntimeError, match='429'):
+            collector._request_json('/repos/o/r/commits/abc')
+        assert collector.session.get.call_count == RATE_LIMIT_RETRIES + 1
+    
+    def test_shared_limiter_per_token(self):
+        """Los colectores con el mismo token comparten limitador."""
+        assert get_shared_rate_limiter('token-a') is get_shared_rate_limiter('token-a')
+        assert get_shared_rate_limiter('token-a') is not get_shared_rate_limiter('token-b')
+
+
+def _commit(sha, days_ago, author='alice'):
+    """Crea un CommitData de prueba."""
+    return CommitData(sha=sha, author=author, author_email=f'{author}@example.com',
+                      message=f'commit {sha}', timestamp=datetime.now(timezone.utc) - timedelta(days=days_ago),
+                      files_changed=['src/app.py'], additions=1, deletions=0)
+
+
+def _pull_request(number, days_ago, title='PR'):
+    """Crea un PullRequestData de prueba."""
+    updated = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return PullRequestData(number=number, title=title, author='bob', state='open',
+                           created_at=updated, merged_at=None,
+                           comments=[{'author': 'alice', 'body': 'LGTM', 'created_at': updated}],
+                           reviews=[], files_changed=['src/app.py'], updated_at=updated)
+
+
+class TestIncrementalCollection:
+    """Tests de la recopilación incremental con marcas de agua."""
+    
+    def test_state_store_roundtrip(self, tmp_path):
+        """El estado guardado se recupera con sus tipos originales."""
+        store = RepositoryStateStore(str(tmp_path))
+        state = RepositoryState(
+            repository='owner/repo',
+            coverage_start=datetime.now(timezone.utc) - timedelta(days=30),
+            last_commit_sha='abc',
+            commits=[_commit('abc', 1)],
+            pull_requests=[_pull_request(7, 2)]
+        )
+        
+        store.save(state)
+        loaded = store.load('owner/repo')
+        
+        assert loaded.commits == state.commits
+        assert loaded.pull_requests == state.pull_requests
+        assert loaded.last_commit_sha == 'abc'
+        assert store.load('owner/other') is None
+    
+    def test_merge_deduplicates_and_trims_window(self):
+        """La fusión elimina duplicados y lo que sale de la ventana."""
+        since = datetime.now(timezone.utc) - timedelta(days=30)
+        
+        commits = merge_commits([_commit('old', 40), _commit('a', 5)],
+                                [_commit('a', 5), _commit('b', 1)], since)
+        prs = merge_pull_requests([_pull_request(1, 10, 'antes')],
+                                  [_pull_request(1, 1, 'después'), _pull_request(2, 2)], since)
+        
+        assert [c.sha for c in commits] == ['b', 'a']
+        assert [(pr.number, pr.title) for pr in prs] == [(1, 'después'), (2, 'PR')]
+    
+    def test_incremental_run_fetches_only_delta(self, tmp_path):
+        """Con estado guardado solo se procesa la actividad nueva."""
+        collector = _make_collector()
+        collector.state_store = RepositoryStateStore(str(tmp_path))
+        since = datetime.now(timezone.utc) - timedelta(days=30)
+        state = RepositoryState(repository='owner/repo', coverage_start=since,
+                                last_commit_timestamp=datetime.now(timezone.utc) - timedelta(days=3),
+                                commits=[_commit('a', 3)], pull_requests=[_pull_request(1, 4)])
+        
+        collector._collect_commits = Mock(return_value=[_commit('b', 1)])
+        collector._collect_pull_requests = Mock(return_value=[])
+        collector._get_repository_info = Mock(return_value={})
+        collector._collect_contributors = Mock(return_value=[])
+        
+        data = collector._collect_incremental(Mock(), since, state)
+        
+        commits_since = collector._collect_commits.call_args.args[1]
+        assert commits_since == state.last_commit_timestamp - COMMIT_SINCE_OVERLAP
+        assert collector._collect_commits.call_args.kwargs['exclude_shas'] == {'a'}
+        assert [c.sha for c in data['commits']] == ['b', 'a']
+        assert data['new_activity'] == {'commits': 1, 'pull_requests': 0}
+    
+    def test_commit_mark_uses_committer_date(self, tmp_path):
+        """La marca de commits es la fecha del committer, no la de autor."""
+        collector = _make_collector()
+        collector.state_store = RepositoryStateStore(str(tmp_path))
+        since = datetime.now(timezone.utc) - timedelta(days=30)
+        
+        # Escrito hace 10 días pero rebasado y fusionado hace 1
+        rebased = _commit('rebased', 10)
+        rebased.committed_at = datetime.now(timezone.utc) - timedelta(days=1)
+        recent = _commit('recent', 2)
+        recent.committed_at = recent.timestamp
+        
+        collector._save_incremental_state('owner/repo', since, {
+            'repository_info': {}, 'contributors': [], 'commits': [rebased, recent], 'pull_requests': []
+        }, None)
+        state = collector.state_store.load('owner/repo')
+        
+        assert state.last_commit_sha == 'rebased'
+        assert state.last_commit_timestamp == rebased.committed_at
+        assert state.commits[0].committed_at == rebased.committed_at
+
+    def test_failed_items_are_collected_in_next_run(self, tmp_path):
+        """Si un elemento falla, las marcas no avanzan y la siguiente ejecución lo recupera."""
+        collector = _make_collector(max_workers=1)
+        collector.state_store = RepositoryStateStore(str(tmp_path))
+        now = datetime.now(timezone.utc)
+        mark = now - timedelta(days=10)
+        collector.state_store.save(RepositoryState(repository='owner/repo', coverage_start=now - timedelta(days=31),
+                                                   last_commit_timestamp=mark, commits=[_commit('a', 10)]))
+        
+        listing = [SimpleNamespace(sha=sha, date=now - timedelta(days=days)) for sha, days in (('b', 5), ('c', 1))]
+        repo = Mock(full_name='owner/repo')
+        repo.get_commits.side_effect = lambda since: [commit for commit in listing if commit.date >= since]
+        repo.get_pulls.return_value = []
+        collector.github = Mock(rate_limiting=(5000, 5000), rate_limiting_resettime=0)
+        collector.github.get_repo.return_value = repo
+        collector._get_repository_info = Mock(return_value={})
+        collector._collect_contributors = Mock(return_value=[])
+        
+        failures = {'b'}
+        
+        def build(commit):
+            if commit.sha in failures:
+                failures.discard(commit.sha)
+                raise RuntimeError("HTTP 502")
+            return _commit(commit.sha, (now - commit.date).days)
+        
+        collector._build_commit_data = build
+        
+        first = collector.collect_repository_data('owner/repo', days_back=30, incremental=True)
+        assert [c.sha for c in first['commits']] == ['c', 'a']
+        assert as_utc(collector.state_store.load('owner/repo').last_commit_timestamp) == mark
+        
+        second = collector.collect_repository_data('owner/repo', days_back=30, incremental=True)
+        assert [c.sha for c in second['commits']] == ['c', 'b', 'a']
+        assert second['collection_metadata']['new_commits'] == 1
+
+
+SENTIMENT_FIELDS = frozenset({'commit.message', 'pull_request.title',
+                              'pull_request.comments.body', 'pull_request.reviews.body'})
+
+
+class TestFieldProjection:
+    """Tests de la recopilación limitada a los campos que usan los analizadores."""
+    
+    def test_needs_field_includes_parents_of_requested_subfields(self):
+        """Pedir el texto de los comentarios implica recopilar los comentarios."""
+        assert needs_field(None, 'commit.files_changed')
+        assert needs_field(SENTIMENT_FIELDS, 'pull_request.comments')
+        assert not needs_field(SENTIMENT_FIELDS, 'pull_request.files_changed')
+        assert not needs_field({'pull_request.comments'}, 'pull_request.comments.body')
+        assert merge_required_fields([{'a'}, {'b'}]) == {'a', 'b'}
+        assert merge_required_fields([{'a'}, None]) is None
+    
+    def test_commits_without_files_skip_detail_requests(self):
+        """Sin 'commit.files_changed' los commits se construyen con el listado."""
+        collector = _make_collector()
+        collector.set_required_fields(SENTIMENT_FIELDS)
+        collector._request_json = Mock(side_effect=AssertionError("llamada de detalle"))
+        
+        date = datetime.now(timezone.utc)
+        listed = SimpleNamespace(
+            sha='abc', author=None,
+            commit=SimpleNamespace(message='fix typo',
+                                   author=SimpleNamespace(email='a@example.com', name='Alice', date=date),
+                                   committer=SimpleNamespace(date=date))
+        )
+        repo = Mock(get_commits=Mock(return_value=[listed]))
+        
+        commits = collector._collect_commits(repo, date - timedelta(days=1))
+        
+        assert commits == [CommitData(sha='abc', author='Alice', author_email='a@example.com',
+                                      message='fix typo', timestamp=date, files_changed=[],
+                                      additions=0, deletions=0, committed_at=date)]
+    
+    def test_pull_requests_fetch_only_needed_listings(self):
+        """Solo se piden los listados del PR que usa algún analizador."""
+        collector = _make_collector()
+        collector.set_required_fields({'pull_request.author', 'pull_request.comments'})
+        collector._request_paginated = Mock(return_value=[{'user': {'login': 'bob'}, 'body': 'LGTM'}])
+        pr = Mock(issue_url='issues/1', url='pulls/1', number=1, title='PR', state='open')
+        
+        data = collector._build_pull_request_data(pr)
+        
+        collector._request_paginated.assert_called_once_with('issues/1/comments')
+        assert data.comments[0]['author'] == 'bob'
+        assert data.comments[0]['body'] is None
+        assert data.reviews == [] and data.files_changed == []
+    
+    def test_graphql_query_omits_unneeded_connections(self):
+        """La consulta de PRs solo incluye las conexiones y textos necesarios."""
+        collector = GraphQLCollector.__new__(GraphQLCollector)
+        collector.required_fields = SENTIMENT_FIELDS
+        
+        query = collector._pull_requests_query()
+        
+        assert 'comments(first: 100)' in query and 'reviews(first: 100)' in query
+        assert 'files(' not in query
+        assert 'body' in query
+        
+        collector.set_required_fields({'pull_request.reviews'})
+        query = collector._pull_requests_query()
+        assert 'reviews(first: 100)' in query and 'comments(' not in query
+        assert 'body' not in query
+    
+    def test_incremental_state_must_cover_required_fields(self, tmp_path):
+        """Un dataset guardado con menos campos obliga a una recopilación completa."""
+        collector = _make_collector()
+        collector.state_store = RepositoryStateStore(str(tmp_path))
+        since = datetime.now(timezone.utc) - timedelta(days=30)
+        collector.state_store.save(RepositoryState(repository='owner/repo', coverage_start=since,
+                                                   fields=sorted(SENTIMENT_FIELDS)))
+        
+        collector.set_required_fields(SENTIMENT_FIELDS)
+        assert collector._load_incremental_state('owner/repo', since) is not None
+        
+        collector.set_required_fields(None)
+        assert collector._load_incremental_state('owner/repo', since) is None
+
+
+def _page(nodes, has_next=False, cursor=None):
+    """Conexión GraphQL paginada de prueba."""
+    return {'pageInfo': {'hasNextPage': has_next, 'endCursor': cursor}, 'nodes': nodes}
+
+
+class TestGraphQLCollector:
+    """Tests del backend GraphQL."""
+    
+    def _make_graphql_collector(self, payloads):
+        collector = GraphQLCollector.__new__(GraphQLCollector)
+        collector.__dict__.update(_make_collector().__dict__)
+        collector.graphql_url = 'https://api.github.com/graphql'
+        collector.fetch_commit_files = False
+        collector.session = Mock()
+        collector.session.post.side_effect = [_FakeResponse(200, {'data': data}) for data in payloads]
+        return collector
+    
+    def test_pull_requests_with_nested_connections(self):
+        """Los PRs se construyen con comentarios, reviews y archivos anidados."""
+        recent = datetime.now(timezone.utc).isoformat()
+        old = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
+        
+        pr_node = {
+            'number': 5, 'title': 'Add cache', 'state': 'MERGED',
+            'createdAt': recent, 'mergedAt': recent, 'updatedAt': recent,
+            'author': {'login': 'alice'},
+            'comments': _page([{'author': {'login': 'bob'}, 'body': 'Nice work', 'createdAt': recent}]),
+            'reviews': _page([{'author': None, 'state': 'APPROVED', 'body': None, 'submittedAt': recent}]),
+            'files': _page([{'path': 'src/a.py'}], has_next=True, cursor='c1')
+        }
+        old_node = dict(pr_node, number=1, updatedAt=old)
+        
+        collector = self._make_graphql_collector([
+            {'repository': {'pullRequests': _page([pr_node, old_node], has_next=True, cursor='p1')}},
+            {'repository': {'pullRequest': {'files': _page([{'path': 'src/b.py'}])}}}
+        ])
+        
+        since = datetime.now(timezone.utc) - timedelta(days=30)
+        prs = collector._collect_pull_requests(Mock(full_name='owner/repo'), since)
+        
+        assert len(prs) == 1
+        pr = prs[0]
+        assert pr.state == 'closed'
+        assert pr.files_changed == ['src/a.py', 'src/b.py']
+        assert pr.comments[0]['author'] == 'bob'
+        assert pr.reviews[0] == {'author': 'Unknown', 'state': 'APPROVED', 'body': '',
+                                 'submitted_at': pr.reviews[0]['submitted_at']}
+        # Página de PRs + página adicional de archivos; se corta al salir de la ventana
+        assert collector.session.post.call_count == 2
+    
+    def test_commits_history_pagination(self):
+        """Los commits se recorren por páginas de la historia de la rama principal."""
+        date = datetime.now(timezone.utc).isoformat()
+        
+        def node(oid):
+            return {'oid': oid, 'message': f'fix {oid}', 'additions': 3, 'deletions': 1,
+                    'author': {'email': 'a@example.com', 'date': date, 'user': {'login': 'alice'}}}
+        
+        collector = self._make_graphql_collector([
+            {'repository': {'defaultBranchRef': {'target': {'history': _page([node('a'), node('b')], True, 'x')}}}},
+            {'repository': {'defaultBranchRef': {'target': {'history': _page([node('c')])}}}}
+        ])
+        
+        commits = collector._collect_commits(Mock(full_name='owner/repo'),
+                                             datetime.now(timezone.utc), exclude_shas={'b'})
+        
+        assert [c.sha for c in commits] == ['a', 'c']
+        assert commits[0].author == 'alice'
+        assert commits[0].additions == 3
+
+
+class TestLocalGitCollector:
+    """Tests del recopilador sobre un clon git local."""
+    
+    def _git(self, repo, *args, email='alice@example.com'):
+        env = {'GIT_AUTHOR_NAME': 'Alice', 'GIT_AUTHOR_EMAIL': email,
+               'GIT_COMMITTER_NAME': 'Alice', 'GIT_COMMITTER_EMAIL': email,
+               'HOME': str(repo), 'PATH': '/usr/bin:/bin:/usr/local/bin'}
+        subprocess.run(['git', '-C', str(repo), *args], check=True, capture_output=True, env=env)
+    
+    def test_numstat_parsing_and_identity(self, tmp_path):
+        """Los commits incluyen archivos, líneas y el login resuelto del autor."""
+        self._git(tmp_path, 'init', '-q')
+        (tmp_path / 'a.py').write_text('1\n2\n3\n')
+        self._git(tmp_path, 'add', '.')
+        self._git(tmp_path, 'commit', '-q', '-m', 'Primer commit\n\nCon cuerpo')
+        
+        (tmp_path / 'a.py').write_text('1\n')
+        (tmp_path / 'b.bin').write_bytes(b'\x00\x01')
+        self._git(tmp_path, 'add', '.')
+        self._git(tmp_path, 'commit', '-q', '-m', 'Segundo', email='42+bob@users.noreply.github.com')
+        
+        collector = LocalGitCollector(str(tmp_path))
+        commits = collector.collect_commits()
+        
+        assert [c.message for c in commits] == ['Segundo', 'Primer commit\n\nCon cuerpo']
+        assert commits[0].author == 'bob'
+        assert sorted(commits[0].files_changed) == ['a.py', 'b.bin']
+        assert (commits[0].additions, commits[0].deletions) == (0, 2)
+        assert commits[1].author == 'Alice'
+        assert (commits[1].additions, commits[1].deletions) == (3, 0)
+        
+        remaining = collector.collect_commits(exclude_shas={commits[0].sha})
+        assert [c.sha for c in remaining] == [commits[1].sha]
+    
+    def test_mirror_update_fetches_new_commits(self, tmp_path):
+        """Actualizar el mirror mueve sus ramas y HEAD a la historia nueva."""
+        upstream = tmp_path / 'upstream'
+        upstream.mkdir()
+        self._git(upstream, 'init', '-q')
+        (upstream / 'a.py').write_text('1\n')
+        self._git(upstream, 'add', '.')
+        self._git(upstream, 'commit', '-q', '-m', 'Primero')
+        
+        mirror = str(tmp_path / 'mirror.git')
+        commits = LocalGitCollector.clone_or_update(str(upstream), mirror).collect_commits()
+        assert [c.message for c in commits] == ['Primero']
+        
+        (upstream / 'a.py').write_text('2\n')
+        self._git(upstream, 'commit', '-q', '-am', 'Segundo')
+        
+        commits = LocalGitCollector.clone_or_update(str(upstream), mirror).collect_commits()
+        assert [c.message for c in commits] == ['Segundo', 'Primero']